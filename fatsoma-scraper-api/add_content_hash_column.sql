@@ -0,0 +1,15 @@
+-- Add content_hash column to fatsoma_events
+-- SupabaseSyncer stores a SHA-256 fingerprint of each normalized event + its tickets here
+-- and skips writing events whose fingerprint hasn't changed since the last sync
+-- Run this in Supabase SQL Editor: https://supabase.com/dashboard/project/YOUR_PROJECT/sql/new
+
+ALTER TABLE public.fatsoma_events
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+COMMENT ON COLUMN public.fatsoma_events.content_hash IS 'Fingerprint of event fields + tickets written by the scraper sync';
+
+-- Verify the column was added
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'fatsoma_events'
+AND column_name = 'content_hash';
@@ -2,7 +2,7 @@
 Add Organizer - Manually add or search for a specific organizer
 """
 import asyncio
-import aiohttp
+from api_scraper import FatsomaAPIScraper
 from supabase_syncer import SupabaseSyncer
 from organizer_matcher import OrganizerMatcher
 
@@ -18,13 +18,9 @@ async def search_fatsoma_for_organizer(organizer_name: str):
         "page[size]": 100
     }
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        "Accept": "application/json",
-    }
-
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
+    async with FatsomaAPIScraper() as scraper:
+        session = await scraper.get_session()
+        async with session.get(url, headers=scraper.headers, params=params) as response:
             if response.status != 200:
                 print(f"❌ Error: API returned status {response.status}")
                 return []
@@ -6,121 +6,390 @@ import aiohttp
 import asyncio
 import json
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import AsyncIterator, Callable, List, Dict, Optional, Tuple
 from pathlib import Path
+from page_fetcher import ConcurrentPageFetcher, HostRateLimiter
+from http_cache import HTTPCache, cached_get_json
+from sync_state import SyncState
+
+_USE_ENV_CACHE = object()
 
 class FatsomaAPIScraper:
-    def __init__(self):
+    def __init__(self, page_concurrency: int = 4, requests_per_second: float = 10.0,
+                 ticket_concurrency: int = 8, ticket_retries: int = 3, ticket_timeout: float = 10.0,
+                 http_cache=_USE_ENV_CACHE, connection_limit: int = 32, connection_limit_per_host: int = 16,
+                 keepalive_timeout: float = 30.0, request_timeout: float = 60.0,
+                 manual_concurrency: int = 4, sync_state: Optional[SyncState] = None):
+        """
+        Args:
+            page_concurrency: How many feed pages may be in flight at once
+            requests_per_second: Per-host request budget shared by all scraping paths
+            ticket_concurrency: How many ticket-options requests may be in flight at once
+            ticket_retries: Attempts per ticket-options request before falling back to the price range
+            ticket_timeout: Per-request timeout (seconds) for ticket-options calls
+            http_cache: HTTPCache for conditional requests; defaults to one built from
+                FATSOMA_HTTP_CACHE_* env vars, pass None to disable
+            connection_limit: Total pooled connections on the shared session
+            connection_limit_per_host: Pooled connections per host (api.fatsoma.com gets most of them)
+            keepalive_timeout: Seconds an idle connection stays open for reuse
+            request_timeout: Overall timeout (seconds) for a request on the shared session
+            manual_concurrency: How many manual organizers/event UUIDs are fetched at once
+            sync_state: Persists resolved vanity URL -> page_id lookups between runs;
+                None keeps them in memory for this scraper only
+        """
         self.base_url = "https://api.fatsoma.com/v1"
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
             "Accept": "application/json",
         }
         self.manual_config_path = Path(__file__).parent / "manual_organizers.json"
+        self.page_concurrency = page_concurrency
+        self.rate_limiter = HostRateLimiter(requests_per_second)
+        self.ticket_semaphore = asyncio.Semaphore(ticket_concurrency)
+        self.ticket_retries = ticket_retries
+        self.ticket_timeout = ticket_timeout
+        self.http_cache: Optional[HTTPCache] = HTTPCache.from_env() if http_cache is _USE_ENV_CACHE else http_cache
+        self.manual_concurrency = manual_concurrency
+        self.sync_state = sync_state
+        self._page_ids: Dict[str, str] = {}
+
+        # One pooled, keep-alive session for every request this scraper makes (see get_session)
+        self.connection_limit = connection_limit
+        self.connection_limit_per_host = connection_limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Global catalog snapshot, partitioned by city (see fetch_catalog)
+        self._catalog: Optional[List[Dict]] = None
+        self._catalog_by_city: Dict[str, List[Dict]] = {}
+
+        # Bookkeeping from the most recent stream_catalog() crawl (see update_events delta mode)
+        self.last_crawl: Dict = {}
+        # ...and from the most recent fetch_manual_events() call
+        self.last_manual_fetch: Dict = {}
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """The scraper's shared ClientSession, created on first use
+
+        Connections (and their TLS sessions) are kept alive and reused across
+        the feed crawl, ticket-options calls and organizer lookups instead of
+        handshaking again for every request. A session belongs to the event
+        loop that created it, so a new one is made if the loop has changed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is not None and not self._session.closed and self._session_loop is loop:
+            return self._session
+
+        if self._session is not None and not self._session.closed and not self._session_loop.is_closed():
+            # Left over from another (still open) loop - it can't be closed from here
+            print("⚠️  Scraper session created on another event loop, opening a new one")
+
+        connector = aiohttp.TCPConnector(
+            limit=self.connection_limit,
+            limit_per_host=self.connection_limit_per_host,
+            ttl_dns_cache=300,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True,
+        )
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout, connect=10, sock_read=30)
+        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        self._session_loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the shared session (call from the loop that used it)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def fetch_catalog(self, max_pages: int = 50, refresh: bool = False) -> List[Dict]:
+        """Crawl the global /events feed once and partition it into per-city buckets
+
+        The snapshot is kept on this scraper instance, so every scrape_events()
+        call in the same sync cycle is served from memory instead of
+        re-paginating the whole feed.
+
+        Args:
+            max_pages: Maximum number of 50-event pages to crawl
+            refresh: If True, discard the current snapshot and crawl again
+
+        A crawl that fails partway isn't kept as the snapshot; its events are
+        only returned for this call, and the next call crawls again.
+        """
+        if self._catalog is not None and not refresh:
+            return self._catalog
+
+        events = []
+        async for batch in self.stream_catalog(max_pages):
+            events.extend(batch)
+
+        return self._catalog if self.last_crawl.get('complete') else events
+
+    async def stream_catalog(self, max_pages: int = 50, modified_since: Optional[datetime] = None,
+                             select: Optional[Callable[[Dict], bool]] = None) -> AsyncIterator[List[Dict]]:
+        """Crawl the global /events feed, yielding each page's events once its tickets are in
+
+        Batches are handed over as soon as a page's ticket enrichment finishes
+        (not necessarily in page order), so consumers can start writing while
+        later pages are still downloading. When the crawl completes, the
+        snapshot used by scrape_events() is replaced (a crawl that fails
+        partway leaves it alone).
+
+        Args:
+            max_pages: Maximum number of 50-event pages to crawl
+            modified_since: Delta mode - events whose upstream updated-at is not
+                newer than this are skipped (no ticket requests, not yielded) and
+                the snapshot is left alone, since the crawl is only partial
+            select: Called with each (changed) event, in feed order, before its
+                tickets are fetched - events it rejects get no ticket requests
+                and aren't yielded. The snapshot is left alone here too
+
+        Afterwards self.last_crawl holds the crawl's event_ids, the newest
+        updated-at seen (max_updated_at), whether every page fetched cleanly
+        (complete), whether the real end of the feed was reached (reached_end)
+        and whether the crawl instead stopped at max_pages with every page
+        before it fetched (capped).
+        """
+        all_events = []
+        parsed_count = 0
+        skipped_count = 0
+        pending = set()
+        crawl = {'event_ids': set(), 'max_updated_at': None, 'complete': False, 'reached_end': False,
+                 'capped': False, 'skipped': 0}
+        self.last_crawl = crawl
+
+        async def enrich_page(parsed, session):
+            await self._enrich_tickets(parsed, session)
+            return [event for event, _, _ in parsed]
+
+        session = await self.get_session()
+        try:
+            # Get events WITHOUT location filter (API filter misses some events)
+            # We'll filter by city ourselves after fetching
+            url_template = f"{self.base_url}/events?include=location,page&page[number]={{page}}&page[size]=50"
+            fetcher = self._page_fetcher(session, max_pages)
+
+            async for page, data in fetcher.iter_pages(url_template):
+                event_data_list = data.get('data', [])
+                parsed = self._parse_page(data)
+                parsed_count += len(parsed)
+
+                for event, _, _ in parsed:
+                    crawl['event_ids'].add(event['event_id'])
+                    updated_at = event.get('source_updated_at')
+                    if updated_at and (crawl['max_updated_at'] is None or updated_at > crawl['max_updated_at']):
+                        crawl['max_updated_at'] = updated_at
+
+                if modified_since is not None:
+                    changed = [item for item in parsed if self.is_modified_since(item[0], modified_since)]
+                    skipped_count += len(parsed) - len(changed)
+                    parsed = changed
+
+                if select is not None:
+                    parsed = [item for item in parsed if select(item[0])]
+
+                # Tickets are fetched in the background while the next page is parsed
+                if parsed:
+                    pending.add(asyncio.create_task(enrich_page(parsed, session)))
+
+                print(f"Page {page}: Fetched {len(event_data_list)} events (total: {parsed_count})")
+
+                # Hand over any pages whose tickets are already done
+                for task in [t for t in pending if t.done()]:
+                    pending.discard(task)
+                    batch = task.result()
+                    all_events.extend(batch)
+                    yield batch
+
+            for next_done in asyncio.as_completed(pending):
+                batch = await next_done
+                all_events.extend(batch)
+                yield batch
+            pending.clear()
+
+            crawl['reached_end'] = fetcher.reached_end
+            crawl['capped'] = fetcher.hit_max_pages
+            crawl['complete'] = True
+
+        except Exception as e:
+            print(f"Error fetching catalog: {e}")
+
+        finally:
+            for task in pending:
+                task.cancel()
+
+        crawl['skipped'] = skipped_count
+        if modified_since is None and select is None and crawl['complete']:
+            self._set_catalog(all_events)
+            print(f"Catalog snapshot: {len(all_events)} events across {len(self._catalog_by_city)} cities")
+        elif modified_since is None and select is None:
+            print(f"Catalog crawl incomplete ({len(all_events)} events) - snapshot not updated")
+        elif modified_since is None:
+            print(f"Catalog crawl: {len(all_events)} of {len(crawl['event_ids'])} events selected")
+        else:
+            print(f"Delta crawl: {len(all_events)} changed events since {modified_since.isoformat()} ({skipped_count} unchanged skipped)")
+        if self.http_cache:
+            print(f"HTTP cache: {self.http_cache.get_stats()}")
+
+    @staticmethod
+    def is_active(event: Dict, now: Optional[datetime] = None) -> bool:
+        """True if an event hasn't ended yet (falls back to start date without an end time)"""
+        now = now or datetime.now(timezone.utc)
+
+        # For resale marketplace: include events that haven't ended yet
+        # Check end_datetime first, fallback to start date
+        if event.get('end_datetime'):
+            return event['end_datetime'] > now
+        elif event.get('date'):
+            event_date = event['date']
+            if event_date.tzinfo is None:
+                event_date = event_date.replace(tzinfo=timezone.utc)
+            return event_date > now
+        return False
+
+    @staticmethod
+    def is_modified_since(event: Dict, since: Optional[datetime]) -> bool:
+        """True if the event's upstream updated-at is newer than since (or unknown)"""
+        if since is None or not event.get('source_updated_at'):
+            return True
+        return event['source_updated_at'] > since
+
+    @staticmethod
+    def in_locations(event: Dict, locations: List[str]) -> Optional[str]:
+        """Return the first location whose name appears in the event's city, if any"""
+        event_city = (event.get('city') or '').lower()
+        for location in locations:
+            if location.lower() in event_city:
+                return location
+        return None
+
+    def _page_fetcher(self, session, max_pages: int) -> ConcurrentPageFetcher:
+        """Build a concurrent page fetcher sharing this scraper's rate limiter"""
+        return ConcurrentPageFetcher(
+            session,
+            self.headers,
+            concurrency=self.page_concurrency,
+            rate_limiter=self.rate_limiter,
+            max_pages=max_pages,
+            cache=self.http_cache
+        )
+
+    @staticmethod
+    def _bucket_by_city(events: List[Dict]) -> Dict[str, List[Dict]]:
+        """Group events by lower-cased city"""
+        by_city = {}
+        for e in events:
+            city_key = (e.get('city') or '').lower()
+            by_city.setdefault(city_key, []).append(e)
+        return by_city
+
+    def _set_catalog(self, events: List[Dict]):
+        """Store a catalog snapshot and bucket it by lower-cased city"""
+        self._catalog = events
+        self._catalog_by_city = self._bucket_by_city(events)
+
+    def clear_catalog(self):
+        """Drop the catalog snapshot so the next scrape_events() call re-crawls"""
+        self._catalog = None
+        self._catalog_by_city = {}
+
+    def _catalog_view(self, location: str, catalog: Optional[List[Dict]] = None) -> List[Dict]:
+        """Return copies of the snapshot events (or catalog's) whose city matches location
+
+        Matching keeps the old substring semantics ("london" matches
+        "London" and "East London"). Events are copied so callers that
+        pop fields (e.g. SupabaseSyncer) don't corrupt the shared snapshot.
+        """
+        by_city = self._catalog_by_city
+        if catalog is not None and catalog is not self._catalog:
+            by_city = self._bucket_by_city(catalog)
+
+        if location:
+            location = location.lower()
+            buckets = [events for city, events in by_city.items() if location in city]
+        else:
+            buckets = list(by_city.values())
+
+        return [dict(e, tickets=list(e.get('tickets', []))) for bucket in buckets for e in bucket]
 
     async def scrape_events(self, location: str = "london", limit: int = 500, future_only: bool = True) -> List[Dict]:
-        """Fetch events from Fatsoma API with pagination support
+        """Fetch events for a city from the shared catalog snapshot
+
+        The first call crawls the global feed (see fetch_catalog); later calls
+        on the same scraper are a view over that snapshot. Call
+        clear_catalog() to force a fresh crawl.
 
         Args:
             location: City to filter by (filters after fetching, not via API)
-            limit: Maximum number of events to fetch
+            limit: Maximum number of events to return
             future_only: If True, only fetch upcoming events (default: True)
         """
-        from datetime import datetime, timezone
+        try:
+            catalog = await self.fetch_catalog()
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                all_events = []
-                page = 1
-                max_pages = 50  # Fetch more pages to ensure we get events from all cities
-
-                while len(all_events) < limit * 3 and page <= max_pages:  # Fetch 3x limit to account for filtering
-                    # Get events WITHOUT location filter (API filter misses some events)
-                    # We'll filter by city ourselves after fetching
-                    url = f"{self.base_url}/events?include=location,page&page[number]={page}&page[size]=50"
-                    print(f"Fetching page {page} from: {url}")
-
-                    async with session.get(url, headers=self.headers) as response:
-                        if response.status != 200:
-                            print(f"Error: API returned status {response.status}")
-                            break
-
-                        data = await response.json()
-                        event_data_list = data.get('data', [])
-
-                        # No more events to fetch
-                        if not event_data_list:
-                            print(f"No more events found on page {page}")
-                            break
-
-                        included_data = {item['id']: item for item in data.get('included', [])}
-
-                        # Process events from this page
-                        for event_data in event_data_list:
-                            try:
-                                event = await self._parse_event(event_data, included_data, session)
-                                if event:
-                                    all_events.append(event)
-                            except Exception as e:
-                                print(f"Error parsing event: {e}")
-                                continue
-
-                        print(f"Page {page}: Fetched {len(event_data_list)} events (total: {len(all_events)})")
-
-                        # Check if there are more pages
-                        links = data.get('links', {})
-                        if not links.get('next'):
-                            print(f"Reached last page ({page})")
-                            break
-
-                        page += 1
-
-                # Filter by city (case-insensitive)
-                city_events = []
-                if location:
-                    for e in all_events:
-                        event_city = e.get('city', '').lower()
-                        if location.lower() in event_city:
-                            city_events.append(e)
-                    print(f"Filtered {len(all_events)} total events to {len(city_events)} events in {location}")
-                else:
-                    city_events = all_events
-
-                # Filter for future/ongoing events if requested
-                if future_only:
-                    now = datetime.now(timezone.utc)
-                    active_events = []
-
-                    for e in city_events:
-                        # For resale marketplace: include events that haven't ended yet
-                        # Check end_datetime first, fallback to start date
-                        if e.get('end_datetime'):
-                            # Event has an end time - check if it hasn't ended yet
-                            if e['end_datetime'] > now:
-                                active_events.append(e)
-                        elif e.get('date'):
-                            # No end time - fall back to checking start date
-                            event_date = e['date']
-                            if event_date.tzinfo is None:
-                                event_date = event_date.replace(tzinfo=timezone.utc)
-                            if event_date > now:
-                                active_events.append(e)
-
-                    print(f"Filtered {len(city_events)} city events to {len(active_events)} active/upcoming events")
-
-                    # Sort by date (earliest first) and limit
-                    active_events.sort(key=lambda x: x['date'] if x['date'] else datetime.max.replace(tzinfo=timezone.utc))
-                    return active_events[:limit]
-                else:
-                    print(f"Successfully fetched {len(city_events)} events from {location}")
-                    return city_events[:limit]
+            # Filter by city (case-insensitive)
+            city_events = self._catalog_view(location, catalog)
+            if location:
+                print(f"Filtered {len(catalog)} total events to {len(city_events)} events in {location}")
 
-            except Exception as e:
-                print(f"Error fetching events: {e}")
-                return []
+            # Filter for future/ongoing events if requested
+            if future_only:
+                now = datetime.now(timezone.utc)
+                active_events = [e for e in city_events if self.is_active(e, now)]
+
+                print(f"Filtered {len(city_events)} city events to {len(active_events)} active/upcoming events")
+
+                # Sort by date (earliest first) and limit
+                active_events.sort(key=lambda x: x['date'] if x['date'] else datetime.max.replace(tzinfo=timezone.utc))
+                return active_events[:limit]
+            else:
+                print(f"Successfully fetched {len(city_events)} events from {location}")
+                return city_events[:limit]
+
+        except Exception as e:
+            print(f"Error fetching events: {e}")
+            return []
 
     async def _parse_event(self, event_data: Dict, included_data: Dict, session) -> Optional[Dict]:
-        """Parse event data from API response"""
+        """Parse a single event from an API response and fetch its tickets"""
+        parsed = self._parse_event_data(event_data, included_data)
+        if not parsed:
+            return None
+
+        await self._enrich_tickets([parsed], session)
+        return parsed[0]
+
+    def _parse_page(self, data: Dict) -> List[Tuple[Dict, float, float]]:
+        """Parse every event on a feed page without fetching tickets"""
+        included_data = {item['id']: item for item in data.get('included', [])}
+        parsed = []
+
+        for event_data in data.get('data', []):
+            try:
+                result = self._parse_event_data(event_data, included_data)
+                if result:
+                    parsed.append(result)
+            except Exception as e:
+                print(f"Error parsing event: {e}")
+                continue
+
+        return parsed
+
+    def _parse_event_data(self, event_data: Dict, included_data: Dict) -> Optional[Tuple[Dict, float, float]]:
+        """Parse event data from API response
+
+        Returns (event, price_min, price_max). The event's tickets are left
+        empty; _enrich_tickets fills them in as a separate stage.
+        """
         try:
             attrs = event_data.get('attributes', {})
             relationships = event_data.get('relationships', {})
@@ -169,12 +438,19 @@ class FatsomaAPIScraper:
                 except:
                     pass
 
+            # Upstream last-modified time, used by delta syncs
+            source_updated_at = None
+            if attrs.get('updated-at'):
+                try:
+                    source_updated_at = datetime.fromisoformat(attrs['updated-at'].replace('Z', '+00:00'))
+                    if source_updated_at.tzinfo is None:
+                        source_updated_at = source_updated_at.replace(tzinfo=timezone.utc)
+                except:
+                    pass
+
             # Build event URL
             event_url = f"https://www.fatsoma.com/e/{attrs.get('vanity-name', '')}/{attrs.get('seo-name', '')}"
 
-            # Get tickets info
-            tickets = await self._get_tickets(event_data['id'], price_min, price_max, session)
-
             event = {
                 'event_id': event_data['id'],
                 'name': attrs.get('name', ''),
@@ -188,71 +464,40 @@ class FatsomaAPIScraper:
                 'age_restriction': attrs.get('age-restrictions', ''),
                 'url': event_url,
                 'image_url': attrs.get('asset-url', ''),
-                'tickets': tickets,
-                'end_datetime': end_datetime  # For filtering ongoing events
+                'tickets': [],  # Filled in by _enrich_tickets
+                'end_datetime': end_datetime,  # For filtering ongoing events
+                'source_updated_at': source_updated_at
             }
 
-            return event
+            return event, price_min, price_max
 
         except Exception as e:
-            print(f"Error in _parse_event: {e}")
+            print(f"Error in _parse_event_data: {e}")
             return None
 
+    async def _enrich_tickets(self, parsed: List[Tuple[Dict, float, float]], session):
+        """Fetch ticket options for a batch of parsed events with bounded concurrency
+
+        Results are attached to each event's 'tickets' in place.
+        """
+        async def enrich(event, price_min, price_max):
+            async with self.ticket_semaphore:
+                event['tickets'] = await self._get_tickets(event['event_id'], price_min, price_max, session)
+
+        await asyncio.gather(*(enrich(*item) for item in parsed))
+
     async def _get_tickets(self, event_id: str, price_min: float, price_max: float, session) -> List[Dict]:
         """Get ticket information for an event"""
-        try:
-            # Try to get detailed ticket info from ticket-options endpoint
-            url = f"{self.base_url}/events/{event_id}/ticket-options"
-
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    tickets = []
-
-                    for ticket_data in data.get('data', []):
-                        attrs = ticket_data.get('attributes', {})
-
-                        # Get ticket type name
-                        ticket_name = attrs.get('name', 'General Admission')
-
-                        # Get price (may be None for sold out tickets)
-                        price_pence = attrs.get('price')
-                        # Use price_min/max as fallback if API doesn't provide price
-                        if price_pence is None or price_pence == 0:
-                            price = price_min if price_min > 0 else (price_max if price_max > 0 else 0)
-                        else:
-                            price = price_pence / 100
-
-                        # Determine availability
-                        available = attrs.get('on-sale', False)
-                        sold_out = attrs.get('sold-out', False)
-                        availability = "Sold Out" if sold_out else ("Available" if available else "Unavailable")
-
-                        tickets.append({
-                            'ticket_type': ticket_name,
-                            'price': price,
-                            'currency': 'GBP',
-                            'availability': availability
-                        })
-
-                    # Return all ticket types (even if unavailable) for resale marketplace
-                    if tickets:
-                        # Sort tickets by phase/tier number if present in name
-                        def extract_sort_key(ticket):
-                            import re
-                            ticket_name = ticket['ticket_type']
-                            # Look for numbers in ticket name (e.g., "PHASE 1", "TIER 2", "Early Bird 1")
-                            match = re.search(r'\b(\d+)\b', ticket_name)
-                            if match:
-                                return (0, int(match.group(1)))  # Sort by number
-                            else:
-                                return (1, ticket_name)  # Put tickets without numbers at the end
-
-                        tickets.sort(key=extract_sort_key)
-                        return tickets
+        # Try to get detailed ticket info from ticket-options endpoint
+        data = await self._fetch_ticket_options(event_id, session)
 
-        except Exception as e:
-            print(f"Could not fetch detailed tickets for {event_id}: {e}")
+        if data is not None:
+            try:
+                tickets = self._parse_ticket_options(data, price_min, price_max)
+                if tickets:
+                    return tickets
+            except Exception as e:
+                print(f"Could not parse detailed tickets for {event_id}: {e}")
 
         # Fallback: create basic ticket from price range
         if price_min > 0 or price_max > 0:
@@ -265,153 +510,351 @@ class FatsomaAPIScraper:
 
         return []
 
-    async def fetch_event_by_uuid(self, event_id: str, session) -> Optional[Dict]:
-        """Fetch a single event by its UUID"""
-        try:
-            url = f"{self.base_url}/events/{event_id}?include=location,page"
+    async def _fetch_ticket_options(self, event_id: str, session) -> Optional[Dict]:
+        """GET /events/{id}/ticket-options with retries; None if every attempt failed"""
+        url = f"{self.base_url}/events/{event_id}/ticket-options"
+        data = None
+
+        for attempt in range(self.ticket_retries):
+            try:
+                await self.rate_limiter.acquire(url)
+                timeout = aiohttp.ClientTimeout(total=self.ticket_timeout)
 
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    event_data = data.get('data', {})
-                    included_data = {item['id']: item for item in data.get('included', [])}
+                status, data = await cached_get_json(session, url, self.headers, self.http_cache, timeout)
+                if status == 200:
+                    self.rate_limiter.on_success(url)
+                    break
+                if status == 429:
+                    self.rate_limiter.on_rate_limited(url)
 
-                    event = await self._parse_event(event_data, included_data, session)
-                    return event
+                # Only rate limits and server errors are worth retrying
+                if status != 429 and status < 500:
+                    break
+                print(f"Ticket options for {event_id}: HTTP {status} (attempt {attempt + 1}/{self.ticket_retries})")
+
+            except Exception as e:
+                print(f"Could not fetch detailed tickets for {event_id} (attempt {attempt + 1}/{self.ticket_retries}): {e}")
+
+            if attempt < self.ticket_retries - 1:
+                await asyncio.sleep(0.5 * (2 ** attempt))
+
+        return data
+
+    def _parse_ticket_options(self, data: Dict, price_min: float, price_max: float) -> List[Dict]:
+        """Turn a ticket-options API response into sorted ticket dicts"""
+        tickets = []
+
+        for ticket_data in data.get('data', []):
+            attrs = ticket_data.get('attributes', {})
+
+            # Get ticket type name
+            ticket_name = attrs.get('name', 'General Admission')
+
+            # Get price (may be None for sold out tickets)
+            price_pence = attrs.get('price')
+            # Use price_min/max as fallback if API doesn't provide price
+            if price_pence is None or price_pence == 0:
+                price = price_min if price_min > 0 else (price_max if price_max > 0 else 0)
+            else:
+                price = price_pence / 100
+
+            # Determine availability
+            available = attrs.get('on-sale', False)
+            sold_out = attrs.get('sold-out', False)
+            availability = "Sold Out" if sold_out else ("Available" if available else "Unavailable")
+
+            tickets.append({
+                'ticket_type': ticket_name,
+                'price': price,
+                'currency': 'GBP',
+                'availability': availability
+            })
+
+        # Return all ticket types (even if unavailable) for resale marketplace
+        if tickets:
+            # Sort tickets by phase/tier number if present in name
+            def extract_sort_key(ticket):
+                import re
+                ticket_name = ticket['ticket_type']
+                # Look for numbers in ticket name (e.g., "PHASE 1", "TIER 2", "Early Bird 1")
+                match = re.search(r'\b(\d+)\b', ticket_name)
+                if match:
+                    return (0, int(match.group(1)))  # Sort by number
                 else:
-                    print(f"Failed to fetch event {event_id}: HTTP {response.status}")
-                    return None
+                    return (1, ticket_name)  # Put tickets without numbers at the end
+
+            tickets.sort(key=extract_sort_key)
+
+        return tickets
+
+    async def fetch_event_by_uuid(self, event_id: str, session=None, raise_errors: bool = False) -> Optional[Dict]:
+        """Fetch a single event by its UUID
+
+        None if it doesn't exist (404) or the request failed - with
+        raise_errors, a failed request raises instead.
+        """
+        session = session or await self.get_session()
+        try:
+            url = f"{self.base_url}/events/{event_id}?include=location,page"
+
+            await self.rate_limiter.acquire(url)
+            status, data = await cached_get_json(session, url, self.headers, self.http_cache)
+            if status == 200:
+                event_data = data.get('data', {})
+                included_data = {item['id']: item for item in data.get('included', [])}
+
+                event = await self._parse_event(event_data, included_data, session)
+                return event
+            else:
+                print(f"Failed to fetch event {event_id}: HTTP {status}")
+                if raise_errors and status != 404:
+                    raise RuntimeError(f"HTTP {status} fetching event {event_id}")
+                return None
         except Exception as e:
             print(f"Error fetching event {event_id}: {e}")
+            if raise_errors:
+                raise
             return None
 
-    async def get_organizer_page_id(self, vanity_url: str, session) -> Optional[str]:
-        """Get the page ID from a vanity URL like 'fnd_wrld'"""
+    async def get_organizer_page_id(self, vanity_url: str, session=None, raise_errors: bool = False) -> Optional[str]:
+        """Get the page ID from a vanity URL like 'fnd_wrld'
+
+        Page IDs never change, so resolved lookups are remembered (and kept
+        in sync_state if the scraper has one) instead of asked for every sync.
+        None if there's no such page (404) or the request failed - with
+        raise_errors, a failed request raises instead.
+        """
+        page_id = self._page_ids.get(vanity_url)
+        if page_id is None and self.sync_state is not None:
+            page_id = self.sync_state.get_page_id(vanity_url)
+        if page_id:
+            self._page_ids[vanity_url] = page_id
+            return page_id
+
+        session = session or await self.get_session()
         try:
             url = f"{self.base_url}/pages/{vanity_url}"
 
-            async with session.get(url, headers=self.headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    page_id = data.get('data', {}).get('id')
-                    return page_id
-                else:
-                    print(f"Failed to fetch page {vanity_url}: HTTP {response.status}")
-                    return None
+            await self.rate_limiter.acquire(url)
+            status, data = await cached_get_json(session, url, self.headers, self.http_cache)
+            if status == 200:
+                page_id = data.get('data', {}).get('id')
+                if page_id:
+                    self._page_ids[vanity_url] = page_id
+                    if self.sync_state is not None:
+                        self.sync_state.set_page_id(vanity_url, page_id)
+                return page_id
+            else:
+                print(f"Failed to fetch page {vanity_url}: HTTP {status}")
+                if raise_errors and status != 404:
+                    raise RuntimeError(f"HTTP {status} fetching page {vanity_url}")
+                return None
         except Exception as e:
             print(f"Error fetching page {vanity_url}: {e}")
+            if raise_errors:
+                raise
             return None
 
-    async def get_organizer_upcoming_events(self, page_id: str, days_ahead: int = 7) -> List[Dict]:
-        """Get upcoming events for an organizer/page within the next X days"""
-        async with aiohttp.ClientSession() as session:
-            try:
-                all_events = []
-                page = 1
-                max_pages = 5
-                now = datetime.now(timezone.utc)
-                cutoff_date = now + timedelta(days=days_ahead)
-
-                while page <= max_pages:
-                    # Get events for this organizer
-                    url = f"{self.base_url}/pages/{page_id}/events?include=location,page&page[number]={page}&page[size]=50"
-
-                    async with session.get(url, headers=self.headers) as response:
-                        if response.status != 200:
-                            break
-
-                        data = await response.json()
-                        event_data_list = data.get('data', [])
-
-                        if not event_data_list:
-                            break
-
-                        included_data = {item['id']: item for item in data.get('included', [])}
-
-                        # Parse events
-                        for event_data in event_data_list:
-                            try:
-                                event = await self._parse_event(event_data, included_data, session)
-                                if event:
-                                    # Filter for upcoming events within date range
-                                    if event.get('end_datetime'):
-                                        if now < event['end_datetime'] <= cutoff_date:
-                                            all_events.append(event)
-                                    elif event.get('date'):
-                                        event_date = event['date']
-                                        if event_date.tzinfo is None:
-                                            event_date = event_date.replace(tzinfo=timezone.utc)
-                                        if now < event_date <= cutoff_date:
-                                            all_events.append(event)
-                            except Exception as e:
-                                print(f"Error parsing organizer event: {e}")
-                                continue
-
-                        # Check if there are more pages
-                        links = data.get('links', {})
-                        if not links.get('next'):
-                            break
-
-                        page += 1
-
-                return all_events
+    async def get_organizer_upcoming_events(self, page_id: str, days_ahead: int = 7,
+                                            skip_event_ids: Optional[set] = None,
+                                            raise_errors: bool = False) -> List[Dict]:
+        """Get upcoming events for an organizer/page within the next X days
 
-            except Exception as e:
-                print(f"Error fetching organizer events: {e}")
-                return []
+        Events in skip_event_ids (already fetched elsewhere) are left out
+        before any ticket requests are made. If the organizer's feed fails
+        partway, the events fetched so far are returned - with raise_errors,
+        it raises instead.
+        """
+        session = await self.get_session()
+        try:
+            all_events = []
+            enrichment_tasks = []
+            now = datetime.now(timezone.utc)
+            cutoff_date = now + timedelta(days=days_ahead)
+
+            # Get events for this organizer
+            url_template = f"{self.base_url}/pages/{page_id}/events?include=location,page&page[number]={{page}}&page[size]=50"
+
+            fetcher = self._page_fetcher(session, max_pages=5)
+            async for page, data in fetcher.iter_pages(url_template):
+                # Filter for upcoming events within date range before fetching tickets
+                upcoming = []
+                for parsed in self._parse_page(data):
+                    event = parsed[0]
+                    if skip_event_ids and event['event_id'] in skip_event_ids:
+                        continue
+                    if event.get('end_datetime'):
+                        if now < event['end_datetime'] <= cutoff_date:
+                            upcoming.append(parsed)
+                    elif event.get('date'):
+                        event_date = event['date']
+                        if event_date.tzinfo is None:
+                            event_date = event_date.replace(tzinfo=timezone.utc)
+                        if now < event_date <= cutoff_date:
+                            upcoming.append(parsed)
+
+                enrichment_tasks.append(asyncio.create_task(self._enrich_tickets(upcoming, session)))
+                all_events.extend(event for event, _, _ in upcoming)
+
+            await asyncio.gather(*enrichment_tasks)
+
+            if raise_errors and not (fetcher.reached_end or fetcher.hit_max_pages):
+                raise RuntimeError(f"Events feed for page {page_id} failed partway")
+            return all_events
+
+        except Exception as e:
+            print(f"Error fetching organizer events: {e}")
+            if raise_errors:
+                raise
+            return []
+
+    async def fetch_manual_events(self, skip_event_ids: Optional[set] = None) -> List[Dict]:
+        """Fetch events from manual_organizers.json config
+
+        Event UUIDs and organizers are fetched concurrently, at most
+        manual_concurrency at a time. Each event is returned once, however
+        many entries point at it.
+
+        Args:
+            skip_event_ids: event_ids already fetched by the catalog crawl -
+                these are neither requested again nor returned
+
+        Afterwards self.last_manual_fetch says whether every UUID and
+        organizer was fetched (complete) and how many weren't (failed). A
+        failed entry's events are simply missing from the result, so don't
+        treat an incomplete fetch as the full list.
+        """
+        fetch = {'complete': False, 'failed': 0}
+        self.last_manual_fetch = fetch
 
-    async def fetch_manual_events(self) -> List[Dict]:
-        """Fetch events from manual_organizers.json config"""
         if not self.manual_config_path.exists():
             print("No manual_organizers.json file found")
+            fetch['complete'] = True
             return []
 
         try:
-            with open(self.manual_config_path, 'r') as f:
-                config = json.load(f)
+            config = self.load_manual_config()
+            skip_event_ids = set(skip_event_ids or ())
+            session = await self.get_session()
+            semaphore = asyncio.Semaphore(self.manual_concurrency)
+
+            async def fetch_uuid(event_id):
+                async with semaphore:
+                    print(f"Fetching manual event UUID: {event_id}")
+                    event = await self.fetch_event_by_uuid(event_id, session, raise_errors=True)
+                    return [event] if event else []
+
+            async def fetch_organizer(organizer):
+                async with semaphore:
+                    return await self.fetch_organizer_events(organizer, session, skip_event_ids=skip_event_ids,
+                                                             raise_errors=True)
+
+            # Fetch manual UUIDs directly, and events from tracked organizers
+            event_ids = [e.get('event_id') for e in config.get('manual_event_uuids', [])]
+            tasks = [fetch_uuid(event_id) for event_id in event_ids if event_id and event_id not in skip_event_ids]
+            tasks += [fetch_organizer(organizer) for organizer in config.get('organizers', [])]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
             all_events = []
-
-            async with aiohttp.ClientSession() as session:
-                # Fetch manual UUIDs directly
-                for manual_event in config.get('manual_event_uuids', []):
-                    event_id = manual_event.get('event_id')
-                    if event_id:
-                        print(f"Fetching manual event UUID: {event_id}")
-                        event = await self.fetch_event_by_uuid(event_id, session)
-                        if event:
-                            all_events.append(event)
-
-                # Fetch events from tracked organizers
-                for organizer in config.get('organizers', []):
-                    organizer_name = organizer.get('name', 'Unknown')
-                    page_id = organizer.get('page_id')  # Try direct page_id first
-
-                    # If no page_id, try to get it from vanity_url
-                    if not page_id:
-                        vanity_url = organizer.get('vanity_url')
-                        if vanity_url:
-                            print(f"Fetching events for organizer: {vanity_url}")
-                            page_id = await self.get_organizer_page_id(vanity_url, session)
-                    else:
-                        print(f"Fetching events for organizer: {organizer_name} (page_id: {page_id})")
-
-                    if page_id:
-                        organizer_events = await self.get_organizer_upcoming_events(page_id, days_ahead=7)
-                        print(f"  Found {len(organizer_events)} upcoming events in next 7 days")
-                        all_events.extend(organizer_events)
-
+            seen = set(skip_event_ids)
+            for result in results:
+                if isinstance(result, Exception):
+                    print(f"Error fetching manual events: {result}")
+                    fetch['failed'] += 1
+                    continue
+                for event in result:
+                    if event['event_id'] not in seen:
+                        seen.add(event['event_id'])
+                        all_events.append(event)
+
+            fetch['complete'] = fetch['failed'] == 0
             return all_events
 
         except Exception as e:
             print(f"Error loading manual events: {e}")
             return []
 
+    def load_manual_config(self) -> Dict:
+        """Read manual_organizers.json ({} if missing)"""
+        if not self.manual_config_path.exists():
+            return {}
+        with open(self.manual_config_path, 'r') as f:
+            return json.load(f)
+
+    async def fetch_organizer_events(self, organizer: Dict, session=None, days_ahead: int = 7,
+                                     skip_event_ids: Optional[set] = None, raise_errors: bool = False) -> List[Dict]:
+        """Fetch upcoming events for one manual_organizers.json entry
+
+        With raise_errors, a failed request raises instead of leaving events out.
+        """
+        session = session or await self.get_session()
+        organizer_name = organizer.get('name', 'Unknown')
+        page_id = organizer.get('page_id')  # Try direct page_id first
+
+        # If no page_id, try to get it from vanity_url
+        if not page_id:
+            vanity_url = organizer.get('vanity_url')
+            if vanity_url:
+                print(f"Fetching events for organizer: {vanity_url}")
+                page_id = await self.get_organizer_page_id(vanity_url, session, raise_errors=raise_errors)
+        else:
+            print(f"Fetching events for organizer: {organizer_name} (page_id: {page_id})")
+
+        if not page_id:
+            return []
+
+        organizer_events = await self.get_organizer_upcoming_events(page_id, days_ahead=days_ahead,
+                                                                    skip_event_ids=skip_event_ids,
+                                                                    raise_errors=raise_errors)
+        print(f"  Found {len(organizer_events)} upcoming events in next {days_ahead} days")
+        return organizer_events
+
+    async def fetch_current_tickets(self, event_id: str, known_tickets: List[Dict], session=None) -> Optional[List[Dict]]:
+        """Current ticket options for an event we already have tickets for
+
+        The known tickets' prices fill in missing ticket prices. None if the
+        request failed or returned no tickets - unlike a catalog crawl, there
+        is no fallback to a made-up ticket from the price range, which would
+        overwrite the real ticket rows.
+        """
+        session = session or await self.get_session()
+        prices = [float(ticket['price']) for ticket in known_tickets if ticket.get('price')]
+
+        async with self.ticket_semaphore:
+            data = await self._fetch_ticket_options(event_id, session)
+
+        if data is None:
+            return None
+        return self._parse_ticket_options(data, min(prices, default=0), max(prices, default=0)) or None
+
+    async def refresh_tickets(self, events: List[Dict]) -> List[Dict]:
+        """Re-fetch ticket options for already-known events (e.g. from the local mirror)
+
+        Tickets are replaced in place. Returns only the events that were
+        refreshed - events whose ticket-options call failed keep their
+        tickets and are left out, so nothing is written for them.
+        """
+        session = await self.get_session()
+
+        async def refresh(event):
+            try:
+                tickets = await self.fetch_current_tickets(event['event_id'], event.get('tickets', []), session)
+            except Exception as e:
+                print(f"Could not refresh tickets for {event['event_id']}: {e}")
+                return None
+            if tickets is None:
+                return None
+            event['tickets'] = tickets
+            return event
+
+        refreshed = await asyncio.gather(*(refresh(event) for event in events))
+        return [event for event in refreshed if event is not None]
+
 
 # Test the scraper
 async def test_scraper():
-    scraper = FatsomaAPIScraper()
-    events = await scraper.scrape_events(location="london", limit=5)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location="london", limit=5)
 
     print(f"\n{'='*60}")
     print(f"Found {len(events)} events")
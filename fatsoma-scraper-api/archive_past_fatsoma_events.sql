@@ -0,0 +1,52 @@
+-- Set-based cleanup of past fatsoma_events
+-- EventCleanup.archive_past_events() calls archive_past_fatsoma_events() instead of
+-- downloading the whole table and deleting past events one request at a time
+-- create_fatsoma_events_archive.sql replaces archive_past_fatsoma_events() with a version that
+-- moves rows into the archive tier instead of deleting them (fatsoma_event_end stays as is)
+-- Run this in Supabase SQL Editor: https://supabase.com/dashboard/project/YOUR_PROJECT/sql/new
+
+-- When an event is over (UTC), matching the rules EventCleanup used client-side:
+--   * last_entry "HH:MM" -> that time on the event day (00:00-05:59 counts as the next day)
+--   * anything else (missing, TBA, full timestamps) -> 23:59 on the event day
+CREATE OR REPLACE FUNCTION fatsoma_event_end(event_date TIMESTAMPTZ, last_entry TEXT)
+RETURNS TIMESTAMP AS $$
+    SELECT CASE
+        WHEN last_entry ~ '^\d{1,2}:\d{2}$' AND split_part(last_entry, ':', 1)::INTEGER < 24
+            AND split_part(last_entry, ':', 2)::INTEGER < 60 THEN
+            date_trunc('day', event_date AT TIME ZONE 'UTC')
+                + last_entry::TIME
+                + CASE WHEN split_part(last_entry, ':', 1)::INTEGER < 6 THEN INTERVAL '1 day' ELSE INTERVAL '0' END
+        ELSE
+            date_trunc('day', event_date AT TIME ZONE 'UTC') + INTERVAL '23 hours 59 minutes'
+    END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Delete (or with dry_run, just list) every event whose end has passed, in one statement.
+-- An event can't end more than ~1.25 days after event_date, so the event_date < now()
+-- prefilter lets idx_fatsoma_events_event_date limit the scan to old rows.
+-- Tickets go with their events via ON DELETE CASCADE.
+CREATE OR REPLACE FUNCTION archive_past_fatsoma_events(dry_run BOOLEAN DEFAULT FALSE)
+RETURNS TABLE (id UUID, event_id TEXT, name TEXT, event_date TIMESTAMPTZ, last_entry TEXT, event_end TIMESTAMP) AS $$
+BEGIN
+    IF dry_run THEN
+        RETURN QUERY
+        SELECT e.id, e.event_id, e.name, e.event_date, e.last_entry, fatsoma_event_end(e.event_date, e.last_entry)
+        FROM fatsoma_events e
+        WHERE e.event_date < NOW()
+        AND fatsoma_event_end(e.event_date, e.last_entry) < (NOW() AT TIME ZONE 'UTC');
+    ELSE
+        RETURN QUERY
+        DELETE FROM fatsoma_events e
+        WHERE e.event_date < NOW()
+        AND fatsoma_event_end(e.event_date, e.last_entry) < (NOW() AT TIME ZONE 'UTC')
+        RETURNING e.id, e.event_id, e.name, e.event_date, e.last_entry, fatsoma_event_end(e.event_date, e.last_entry);
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the backend (service role) should call this
+REVOKE EXECUTE ON FUNCTION archive_past_fatsoma_events(BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION archive_past_fatsoma_events(BOOLEAN) TO service_role;
+
+-- Preview what the next cleanup would remove
+SELECT * FROM archive_past_fatsoma_events(dry_run => TRUE);
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parsing hot paths: BeautifulSoup(html, 'html.parser') vs html_parsing
+Usage: python benchmark_html_parsing.py [page.html] [--runs N]
+
+Without a file, a synthetic ~300KB organizer/event page is generated (event links,
+UUIDs and a __NEXT_DATA__ blob), which is roughly what the scrapers see.
+"""
+import argparse
+import json
+import re
+import timeit
+import uuid
+
+from bs4 import BeautifulSoup
+
+from html_parsing import PARSER, extract_next_data, find_links, find_uuids, make_soup, strainer
+
+
+def synthetic_page(cards: int = 400) -> str:
+    """A listing page with `cards` event cards and a Next.js data blob"""
+    next_data = {
+        "props": {"pageProps": {"events": [
+            {"id": str(uuid.uuid4()), "name": f"Event {i}", "description": "x" * 200}
+            for i in range(cards)
+        ]}},
+        "buildId": "benchmark",
+    }
+    body = []
+    for i in range(cards):
+        event_id = uuid.uuid4()
+        body.append(
+            f'<div class="event-card" data-event-id="{event_id}">'
+            f'<a href="/e/{event_id}-event-{i}"><h3>Event {i}</h3></a>'
+            f'<span class="date">Sat {i % 28 + 1} Nov</span>'
+            f'<img src="https://media.example.com/{event_id}.jpg" alt="Event {i}">'
+            f'</div>'
+            f'<div class="filler"><p>{"lorem ipsum " * 20}</p><a href="/about">About</a></div>'
+        )
+    return (
+        '<html><head><meta property="og:url" content="https://www.fatsoma.com/e/'
+        f'{uuid.uuid4()}"><title>Events</title></head><body>'
+        + ''.join(body)
+        + '<script id="__NEXT_DATA__" type="application/json">'
+        + json.dumps(next_data)
+        + '</script></body></html>'
+    )
+
+
+def bench(label: str, func, runs: int, baseline: float = None) -> float:
+    seconds = min(timeit.repeat(func, number=1, repeat=runs))
+    speedup = f"  ({baseline / seconds:5.1f}x)" if baseline else ""
+    print(f"   {label:<48} {seconds * 1000:8.2f} ms{speedup}")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('html_file', nargs='?', help="HTML page to parse (default: synthetic page)")
+    parser.add_argument('--runs', type=int, default=5, help="Best of N runs (default: 5)")
+    args = parser.parse_args()
+
+    if args.html_file:
+        with open(args.html_file, encoding='utf-8') as f:
+            html = f.read()
+    else:
+        html = synthetic_page()
+
+    card_class = re.compile(r'event-card|EventCard')
+    print(f"📄 {len(html) / 1024:.0f}KB of HTML, best of {args.runs} runs, parser={PARSER}")
+    if PARSER != 'lxml':
+        print("⚠️  lxml is not installed: make_soup runs on html.parser, so the parse timings"
+              " below show no parser speedup - only what strainers and the no-DOM paths skip")
+
+    print("\n🔗 Event links")
+    base = bench("BeautifulSoup html.parser + find_all('a')", lambda: [
+        a['href'] for a in BeautifulSoup(html, 'html.parser').find_all('a', href=True)
+        if a['href'].startswith('/e/')
+    ], args.runs)
+    bench("make_soup + strainer('a')", lambda: [
+        a['href'] for a in make_soup(html, parse_only=strainer('a', href=True)).find_all('a', href=True)
+        if a['href'].startswith('/e/')
+    ], args.runs, base)
+    bench("find_links (no DOM)", lambda: find_links(html, r'^/e/'), args.runs, base)
+
+    print("\n🃏 Event cards")
+    base = bench("BeautifulSoup html.parser + find_all('div')", lambda: (
+        BeautifulSoup(html, 'html.parser').find_all('div', class_=card_class)
+    ), args.runs)
+    bench("make_soup (full)", lambda: make_soup(html).find_all('div', class_=card_class), args.runs, base)
+    bench("make_soup + strainer('div', class_=...)", lambda: (
+        make_soup(html, parse_only=strainer('div', class_=card_class)).find_all('div', class_=card_class)
+    ), args.runs, base)
+
+    print("\n📦 __NEXT_DATA__")
+    base = bench("BeautifulSoup html.parser + find('script')", lambda: json.loads(
+        BeautifulSoup(html, 'html.parser').find('script', id='__NEXT_DATA__').string
+    ), args.runs)
+    bench("make_soup + strainer('script')", lambda: json.loads(
+        make_soup(html, parse_only=strainer('script', id='__NEXT_DATA__')).find('script').string
+    ), args.runs, base)
+    bench("extract_next_data (no DOM)", lambda: extract_next_data(html), args.runs, base)
+
+    print("\n🆔 UUIDs")
+    base = bench("BeautifulSoup html.parser + str() + regex", lambda: find_uuids(
+        str(BeautifulSoup(html, 'html.parser'))
+    ), args.runs)
+    bench("find_uuids (no DOM)", lambda: find_uuids(html), args.runs, base)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Browser Pool - Long-lived headless Chromium shared by requests that need a real browser
+(Fixr transfer links). Contexts are reused and recycled instead of launching a browser per request
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional
+
+from playwright.async_api import async_playwright
+
+
+class BrowserPoolTimeout(Exception):
+    """Every browser context stayed busy for longer than the queue timeout"""
+
+
+class BrowserPool:
+    """
+    One headless Chromium with up to max_contexts browser contexts in use at once
+
+    page() hands out a fresh page in an idle context, waiting up to
+    acquire_timeout seconds for one to free up. A context is closed and
+    replaced after max_uses pages (or after an error) so cookies, cache and
+    leaked memory don't build up. The browser is launched on first use (or
+    by start() at app startup) and relaunched if it crashes.
+    """
+
+    def __init__(self, max_contexts: int = 2, max_uses: int = 50, acquire_timeout: float = 20.0,
+                 headless: bool = True):
+        self.max_contexts = max_contexts
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+        self.headless = headless
+        self._playwright = None
+        self._browser = None
+        self._idle: List[list] = []  # [context, uses] pairs ready for reuse
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self.stats = {"pages": 0, "contexts_created": 0, "contexts_recycled": 0, "timeouts": 0, "launches": 0}
+
+    @classmethod
+    def from_env(cls) -> "BrowserPool":
+        """Build a pool from FIXR_BROWSER_* env vars"""
+        return cls(
+            max_contexts=int(os.getenv('FIXR_BROWSER_POOL_SIZE', '2')),
+            max_uses=int(os.getenv('FIXR_BROWSER_MAX_USES', '50')),
+            acquire_timeout=float(os.getenv('FIXR_BROWSER_QUEUE_TIMEOUT', '20')),
+        )
+
+    def _ensure_primitives(self):
+        # Created lazily so they belong to the loop that serves requests
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_contexts)
+            self._launch_lock = asyncio.Lock()
+
+    async def start(self):
+        """Launch the browser now instead of on the first request"""
+        self._ensure_primitives()
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+
+            # A crashed browser takes its contexts with it
+            self._idle.clear()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.stats["launches"] += 1
+
+    async def close(self):
+        """Close every context, the browser and Playwright"""
+        for context, _ in self._idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._idle.clear()
+
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception:
+                pass
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator:
+        """A new page in a pooled context; raises BrowserPoolTimeout if the pool stays saturated"""
+        self._ensure_primitives()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise BrowserPoolTimeout(f"No browser free after {self.acquire_timeout:.0f}s")
+
+        slot = None
+        page = None
+        healthy = False
+        try:
+            await self.start()
+            if self._idle:
+                slot = self._idle.pop()
+            else:
+                slot = [await self._browser.new_context(), 0]
+                self.stats["contexts_created"] += 1
+
+            page = await slot[0].new_page()
+            slot[1] += 1
+            self.stats["pages"] += 1
+            yield page
+            healthy = True
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    healthy = False
+
+            if slot is not None:
+                if healthy and slot[1] < self.max_uses:
+                    self._idle.append(slot)
+                else:
+                    self.stats["contexts_recycled"] += 1
+                    try:
+                        await slot[0].close()
+                    except Exception:
+                        pass
+
+            self._semaphore.release()
+
+    def get_status(self) -> dict:
+        return dict(
+            self.stats,
+            running=self._browser is not None and self._browser.is_connected(),
+            idle_contexts=len(self._idle),
+            max_contexts=self.max_contexts,
+        )
@@ -0,0 +1,105 @@
+-- Archive tier for past Fatsoma events
+-- EventCleanup.archive_past_events() moves finished events (and their tickets) out of the
+-- hot fatsoma_events / fatsoma_tickets tables into these archive tables instead of deleting
+-- them, so history is kept for analytics while app queries only scan upcoming events
+-- Requires archive_past_fatsoma_events.sql (for fatsoma_event_end) to have been run first
+-- Run this in Supabase SQL Editor: https://supabase.com/dashboard/project/YOUR_PROJECT/sql/new
+
+-- Same columns (in the same order) as the hot tables, plus archived_at.
+-- If a column is added to fatsoma_events / fatsoma_tickets later, add it here too,
+-- before archived_at, or the INSERT ... SELECT below will no longer line up.
+CREATE TABLE IF NOT EXISTS fatsoma_events_archive (
+    LIKE fatsoma_events INCLUDING DEFAULTS,
+    archived_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id)
+);
+
+CREATE TABLE IF NOT EXISTS fatsoma_tickets_archive (
+    LIKE fatsoma_tickets INCLUDING DEFAULTS,
+    archived_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id),
+    FOREIGN KEY (event_id) REFERENCES fatsoma_events_archive(id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS idx_fatsoma_events_archive_event_id ON fatsoma_events_archive(event_id);
+CREATE INDEX IF NOT EXISTS idx_fatsoma_events_archive_event_date ON fatsoma_events_archive(event_date);
+CREATE INDEX IF NOT EXISTS idx_fatsoma_tickets_archive_event_id ON fatsoma_tickets_archive(event_id);
+
+-- Same read/write rules as the hot tables
+ALTER TABLE fatsoma_events_archive ENABLE ROW LEVEL SECURITY;
+ALTER TABLE fatsoma_tickets_archive ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Archived fatsoma events are viewable by everyone"
+    ON fatsoma_events_archive FOR SELECT
+    USING (true);
+
+CREATE POLICY "Archived fatsoma tickets are viewable by everyone"
+    ON fatsoma_tickets_archive FOR SELECT
+    USING (true);
+
+CREATE POLICY "Service role can manage archived fatsoma events"
+    ON fatsoma_events_archive FOR ALL
+    USING (auth.role() = 'service_role');
+
+CREATE POLICY "Service role can manage archived fatsoma tickets"
+    ON fatsoma_tickets_archive FOR ALL
+    USING (auth.role() = 'service_role');
+
+-- Replaces the delete-only version from archive_past_fatsoma_events.sql.
+-- Each call moves at most batch_size past events: INSERT ... SELECT into the archive,
+-- then DELETE from the hot table (tickets follow via ON DELETE CASCADE). The caller
+-- repeats until fewer than batch_size rows come back, so every batch commits on its own.
+DROP FUNCTION IF EXISTS archive_past_fatsoma_events(BOOLEAN);
+
+CREATE OR REPLACE FUNCTION archive_past_fatsoma_events(dry_run BOOLEAN DEFAULT FALSE, batch_size INTEGER DEFAULT 500)
+RETURNS TABLE (id UUID, event_id TEXT, name TEXT, event_date TIMESTAMPTZ, last_entry TEXT, event_end TIMESTAMP) AS $$
+DECLARE
+    batch_ids UUID[];
+BEGIN
+    IF dry_run THEN
+        RETURN QUERY
+        SELECT e.id, e.event_id, e.name, e.event_date, e.last_entry, fatsoma_event_end(e.event_date, e.last_entry)
+        FROM fatsoma_events e
+        WHERE e.event_date < NOW()
+        AND fatsoma_event_end(e.event_date, e.last_entry) < (NOW() AT TIME ZONE 'UTC');
+        RETURN;
+    END IF;
+
+    SELECT array_agg(past.id) INTO batch_ids
+    FROM (
+        SELECT e.id
+        FROM fatsoma_events e
+        WHERE e.event_date < NOW()
+        AND fatsoma_event_end(e.event_date, e.last_entry) < (NOW() AT TIME ZONE 'UTC')
+        ORDER BY e.event_date
+        LIMIT batch_size
+        FOR UPDATE SKIP LOCKED
+    ) past;
+
+    IF batch_ids IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO fatsoma_events_archive
+    SELECT e.*, NOW() FROM fatsoma_events e WHERE e.id = ANY(batch_ids)
+    ON CONFLICT (id) DO NOTHING;
+
+    INSERT INTO fatsoma_tickets_archive
+    SELECT t.*, NOW() FROM fatsoma_tickets t WHERE t.event_id = ANY(batch_ids)
+    ON CONFLICT (id) DO NOTHING;
+
+    RETURN QUERY
+    DELETE FROM fatsoma_events e
+    WHERE e.id = ANY(batch_ids)
+    RETURNING e.id, e.event_id, e.name, e.event_date, e.last_entry, fatsoma_event_end(e.event_date, e.last_entry);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the backend (service role) should call this
+REVOKE EXECUTE ON FUNCTION archive_past_fatsoma_events(BOOLEAN, INTEGER) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION archive_past_fatsoma_events(BOOLEAN, INTEGER) TO service_role;
+
+-- Verify the archive tables exist
+SELECT table_name
+FROM information_schema.tables
+WHERE table_name IN ('fatsoma_events_archive', 'fatsoma_tickets_archive');
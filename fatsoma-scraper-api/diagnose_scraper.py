@@ -5,14 +5,14 @@ Diagnostic script to investigate scraper issues:
 3. Identify patterns in failures
 """
 import asyncio
-import aiohttp
 from api_scraper import FatsomaAPIScraper
 
 async def diagnose():
     """Run diagnostics on the scraper"""
+    async with FatsomaAPIScraper() as scraper:
+        await run_diagnostics(scraper)
 
-    scraper = FatsomaAPIScraper()
-
+async def run_diagnostics(scraper: FatsomaAPIScraper):
     print("=" * 80)
     print("FATSOMA SCRAPER DIAGNOSTICS")
     print("=" * 80)
@@ -64,32 +64,32 @@ async def diagnose():
     print("\n\n🔍 TESTING TICKET ENDPOINT DIRECTLY:")
     print("-" * 80)
 
-    async with aiohttp.ClientSession() as session:
-        for event in nottingham_events[:5]:
-            event_id = event['event_id']
-            url = f"https://api.fatsoma.com/v1/events/{event_id}/ticket-options"
-
-            print(f"\nEvent: {event['name']}")
-            print(f"URL: {url}")
-
-            try:
-                async with session.get(url, headers=scraper.headers) as response:
-                    print(f"Status: {response.status}")
-
-                    if response.status == 200:
-                        data = await response.json()
-                        tickets_data = data.get('data', [])
-                        print(f"✅ Found {len(tickets_data)} tickets from API")
-
-                        for ticket_data in tickets_data[:3]:  # Show first 3
-                            attrs = ticket_data.get('attributes', {})
-                            print(f"   - {attrs.get('name', 'Unknown')}: £{attrs.get('price', 0)/100}")
-                    else:
-                        print(f"❌ API returned {response.status}")
-                        error_text = await response.text()
-                        print(f"   Error: {error_text[:200]}")
-            except Exception as e:
-                print(f"❌ Error: {e}")
+    session = await scraper.get_session()
+    for event in nottingham_events[:5]:
+        event_id = event['event_id']
+        url = f"https://api.fatsoma.com/v1/events/{event_id}/ticket-options"
+
+        print(f"\nEvent: {event['name']}")
+        print(f"URL: {url}")
+
+        try:
+            async with session.get(url, headers=scraper.headers) as response:
+                print(f"Status: {response.status}")
+
+                if response.status == 200:
+                    data = await response.json()
+                    tickets_data = data.get('data', [])
+                    print(f"✅ Found {len(tickets_data)} tickets from API")
+
+                    for ticket_data in tickets_data[:3]:  # Show first 3
+                        attrs = ticket_data.get('attributes', {})
+                        print(f"   - {attrs.get('name', 'Unknown')}: £{attrs.get('price', 0)/100}")
+                else:
+                    print(f"❌ API returned {response.status}")
+                    error_text = await response.text()
+                    print(f"   Error: {error_text[:200]}")
+        except Exception as e:
+            print(f"❌ Error: {e}")
 
     # Search for Function Next Door specifically
     print("\n\n🔎 SEARCHING FOR FUNCTION NEXT DOOR:")
@@ -110,22 +110,21 @@ async def diagnose():
         print("❌ No events with 'FUNCTION' found in Nottingham results")
         print("\nLet's check if the API supports searching by name...")
 
-        async with aiohttp.ClientSession() as session:
-            search_url = f"https://api.fatsoma.com/v1/events?filter[name]=FUNCTION NEXT DOOR"
-            print(f"\nTrying search URL: {search_url}")
-
-            try:
-                async with session.get(search_url, headers=scraper.headers) as response:
-                    print(f"Status: {response.status}")
-                    if response.status == 200:
-                        data = await response.json()
-                        events = data.get('data', [])
-                        print(f"Found {len(events)} events by name search")
-                        for event in events[:3]:
-                            attrs = event.get('attributes', {})
-                            print(f"   - {attrs.get('name')}")
-            except Exception as e:
-                print(f"Error: {e}")
+        search_url = f"https://api.fatsoma.com/v1/events?filter[name]=FUNCTION NEXT DOOR"
+        print(f"\nTrying search URL: {search_url}")
+
+        try:
+            async with session.get(search_url, headers=scraper.headers) as response:
+                print(f"Status: {response.status}")
+                if response.status == 200:
+                    data = await response.json()
+                    events = data.get('data', [])
+                    print(f"Found {len(events)} events by name search")
+                    for event in events[:3]:
+                        attrs = event.get('attributes', {})
+                        print(f"   - {attrs.get('name')}")
+        except Exception as e:
+            print(f"Error: {e}")
 
 if __name__ == "__main__":
     asyncio.run(diagnose())
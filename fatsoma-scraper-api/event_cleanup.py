@@ -1,116 +1,189 @@
 """
-Event Cleanup - Automatically archive/delete past events based on last entry time
+Event Cleanup - Automatically move past events into the archive tier based on last entry time
 """
 from datetime import datetime, timedelta
+from typing import Optional
 from supabase_syncer import SupabaseSyncer
 
 class EventCleanup:
-    def __init__(self):
-        self.syncer = SupabaseSyncer()
-
-    def archive_past_events(self, dry_run=False):
+    def __init__(self, syncer: Optional[SupabaseSyncer] = None):
         """
-        Archive events that have already happened based on event_date and last_entry time
-
         Args:
-            dry_run: If True, only show what would be archived without actually doing it
+            syncer: Syncer whose Supabase client to use (a new one is created if None)
         """
-        print("🗑️  Checking for past events to archive...")
-
-        # Get all events
-        response = self.syncer.client.table('fatsoma_events').select('*').execute()
-        events = response.data
-
+        self.syncer = syncer or SupabaseSyncer()
+
+    @staticmethod
+    def _event_end(event_date_str, last_entry):
+        """When an event is over (naive UTC) - mirrors fatsoma_event_end() in archive_past_fatsoma_events.sql"""
+        # Parse event date (format: 2025-10-30T00:00:00+00:00)
+        if 'T' in event_date_str:
+            event_date = datetime.fromisoformat(event_date_str.replace('+00:00', ''))
+        else:
+            event_date = datetime.strptime(event_date_str, '%Y-%m-%d')
+
+        # Parse last entry time (format: "23:00" or "01:00")
+        if last_entry and last_entry != 'TBA':
+            try:
+                last_entry_time = datetime.strptime(last_entry, '%H:%M').time()
+                # Combine event date with last entry time
+                event_end = datetime.combine(event_date.date(), last_entry_time)
+
+                # If last entry is in early morning (00:00-06:00), it's next day
+                if last_entry_time.hour < 6:
+                    event_end += timedelta(days=1)
+                return event_end
+            except:
+                pass
+
+        # No (parseable) last entry, use end of event day
+        return event_date.replace(hour=23, minute=59)
+
+    def _find_past_events(self, page_size=1000):
+        """Client-side fallback: scan only events dated before now, fetching just the needed columns"""
         now = datetime.utcnow()
         past_events = []
+        start = 0
 
-        for event in events:
-            event_date_str = event.get('event_date')
-            last_entry = event.get('last_entry', '23:59')
+        while True:
+            response = self.syncer.client.table('fatsoma_events').select(
+                'id, event_id, name, event_date, last_entry'
+            ).lt('event_date', now.isoformat()).order('event_date').range(start, start + page_size - 1).execute()
 
-            if not event_date_str:
-                continue
+            for event in response.data:
+                event_date_str = event.get('event_date')
+                if not event_date_str:
+                    continue
 
-            try:
-                # Parse event date (format: 2025-10-30T00:00:00+00:00)
-                if 'T' in event_date_str:
-                    event_date = datetime.fromisoformat(event_date_str.replace('+00:00', ''))
-                else:
-                    event_date = datetime.strptime(event_date_str, '%Y-%m-%d')
-
-                # Parse last entry time (format: "23:00" or "01:00")
-                if last_entry and last_entry != 'TBA':
-                    try:
-                        last_entry_time = datetime.strptime(last_entry, '%H:%M').time()
-                        # Combine event date with last entry time
-                        event_end = datetime.combine(event_date.date(), last_entry_time)
-
-                        # If last entry is in early morning (00:00-06:00), it's next day
-                        if last_entry_time.hour < 6:
-                            event_end += timedelta(days=1)
-                    except:
-                        # If can't parse last entry, use end of event day
-                        event_end = event_date.replace(hour=23, minute=59)
-                else:
-                    # No last entry, use end of event day
-                    event_end = event_date.replace(hour=23, minute=59)
+                try:
+                    event_end = self._event_end(event_date_str, event.get('last_entry'))
+                except Exception as e:
+                    print(f"  ⚠️  Error parsing event {event.get('name', 'Unknown')}: {e}")
+                    continue
 
                 # Check if event has passed
                 if event_end < now:
-                    past_events.append({
-                        'id': event['id'],
-                        'event_id': event['event_id'],
-                        'name': event['name'],
-                        'event_date': event_date_str,
-                        'last_entry': last_entry,
-                        'event_end': event_end
-                    })
+                    past_events.append(dict(event, event_end=event_end))
+
+            if len(response.data) < page_size:
+                break
+            start += page_size
 
+        return past_events
+
+    def _move_events(self, past_events, chunk_size=200):
+        """Copy events and their tickets into the archive tables, then delete them in chunks"""
+        client = self.syncer.client
+        archived_count = 0
+        error_count = 0
+
+        for i in range(0, len(past_events), chunk_size):
+            chunk = past_events[i:i + chunk_size]
+            ids = [event['id'] for event in chunk]
+            try:
+                rows = client.table('fatsoma_events').select('*, fatsoma_tickets(*)').in_('id', ids).execute().data
+                tickets = [ticket for row in rows for ticket in row.pop('fatsoma_tickets', None) or []]
+
+                client.table('fatsoma_events_archive').upsert(rows, on_conflict='id').execute()
+                if tickets:
+                    client.table('fatsoma_tickets_archive').upsert(tickets, on_conflict='id').execute()
             except Exception as e:
-                print(f"  ⚠️  Error parsing event {event.get('name', 'Unknown')}: {e}")
+                # Never delete what couldn't be archived
+                print(f"  ❌ Error copying {len(chunk)} events to archive (run create_fatsoma_events_archive.sql?): {e}")
+                error_count += len(chunk)
                 continue
 
+            try:
+                # Delete the events (cascades to tickets due to foreign key)
+                client.table('fatsoma_events').delete().in_('id', ids).execute()
+                archived_count += len(chunk)
+            except Exception as e:
+                print(f"  ❌ Error removing {len(chunk)} archived events from fatsoma_events: {e}")
+                error_count += len(chunk)
+
+        return archived_count, error_count
+
+    def archive_past_events(self, dry_run=False, batch_size=500):
+        """
+        Move events that have already happened into fatsoma_events_archive
+
+        Past events are decided by event_date and last_entry time. Uses the
+        archive_past_fatsoma_events() database function, which moves up to
+        batch_size events per call with INSERT ... SELECT + DELETE; it is
+        called until the backlog is drained. If the function isn't installed
+        (see create_fatsoma_events_archive.sql), falls back to scanning only
+        rows dated before now and moving them in chunked requests.
+
+        Args:
+            dry_run: If True, only show what would be archived without actually doing it
+            batch_size: Events moved per database call
+
+        Returns: List of past events (archived, or that would be with dry_run)
+        """
+        print("🗑️  Checking for past events to archive...")
+
+        past_events = []
+        try:
+            while True:
+                response = self.syncer.client.rpc(
+                    'archive_past_fatsoma_events', {'dry_run': dry_run, 'batch_size': batch_size}
+                ).execute()
+                batch = response.data or []
+                past_events.extend(batch)
+                if dry_run or len(batch) < batch_size:
+                    break
+
+            print(f"\n📊 {'Found' if dry_run else 'Archived'} {len(past_events)} past events")
+            self._print_sample(past_events)
+            if dry_run and past_events:
+                print(f"\n🔍 DRY RUN - No events will be archived")
+            return past_events
+        except Exception as e:
+            if past_events:
+                # Some batches already moved - report those, the rest goes next run
+                print(f"  ⚠️  Archiving stopped after {len(past_events)} events: {e}")
+                return past_events
+            print(f"  ⚠️  archive_past_fatsoma_events unavailable ({e}), archiving client-side")
+
+        past_events = self._find_past_events()
+
         print(f"\n📊 Found {len(past_events)} past events")
 
         if not past_events:
             print("✅ No past events to archive")
-            return
+            return []
 
-        # Show sample of events to be archived
-        print(f"\nSample of events to archive:")
-        for event in past_events[:5]:
-            print(f"  - {event['name'][:60]}")
-            print(f"    Date: {event['event_date']}")
-            print(f"    Last Entry: {event['last_entry']}")
-            print(f"    Event End: {event['event_end']}")
-
-        if len(past_events) > 5:
-            print(f"  ... and {len(past_events) - 5} more")
+        self._print_sample(past_events)
 
         if dry_run:
             print(f"\n🔍 DRY RUN - No events will be archived")
             return past_events
 
-        # Archive events by moving to archive table or deleting
+        # Archive events by moving them to the archive tables
         print(f"\n🗑️  Archiving {len(past_events)} events...")
 
-        archived_count = 0
-        error_count = 0
-
-        for event in past_events:
-            try:
-                # Delete the event (cascades to tickets due to foreign key)
-                self.syncer.client.table('fatsoma_events').delete().eq('id', event['id']).execute()
-                archived_count += 1
-            except Exception as e:
-                print(f"  ❌ Error archiving {event['name'][:40]}: {e}")
-                error_count += 1
+        archived_count, error_count = self._move_events(past_events)
 
         print(f"\n✅ Archived: {archived_count}")
         print(f"❌ Errors: {error_count}")
 
         return past_events
 
+    def _print_sample(self, past_events):
+        """Show sample of events to be archived"""
+        if not past_events:
+            return
+
+        print(f"\nSample of events to archive:")
+        for event in past_events[:5]:
+            print(f"  - {(event.get('name') or '')[:60]}")
+            print(f"    Date: {event['event_date']}")
+            print(f"    Last Entry: {event.get('last_entry')}")
+            print(f"    Event End: {event['event_end']}")
+
+        if len(past_events) > 5:
+            print(f"  ... and {len(past_events) - 5} more")
+
     def get_upcoming_events_by_location(self, location, days_ahead=7):
         """
         Get upcoming events in a specific location for the next N days
@@ -3,10 +3,10 @@ Extract event UUID from Fatsoma event URL
 Usage: python extract_event_uuid.py <event_url>
 """
 import asyncio
-import aiohttp
 import sys
 import re
 from bs4 import BeautifulSoup
+from api_scraper import FatsomaAPIScraper
 
 
 async def extract_uuid_from_event_url(event_url: str) -> str:
@@ -15,7 +15,8 @@ async def extract_uuid_from_event_url(event_url: str) -> str:
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
     }
 
-    async with aiohttp.ClientSession() as session:
+    async with FatsomaAPIScraper() as scraper:
+        session = await scraper.get_session()
         async with session.get(event_url, headers=headers) as response:
             if response.status != 200:
                 print(f"❌ Failed to fetch event page: HTTP {response.status}")
@@ -15,11 +15,11 @@ async def find_organizer_by_brand(brand_name: str, location: str = "nottingham")
     """
     print(f"\n🔍 Searching for '{brand_name}' in {location} events...")
 
-    scraper = FatsomaAPIScraper()
     syncer = SupabaseSyncer()
 
     # Scrape events from the location
-    events = await scraper.scrape_events(location=location, limit=200)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location=location, limit=200)
 
     # Look for events from this brand
     matching_events = []
@@ -20,11 +20,11 @@ async def find_club_by_location_and_name(club_name: str, location: str = "nottin
     print(f"\n🔍 Searching for '{club_name}' in {location}...")
     print(f"   Looking in: event locations, event names, and organizers")
 
-    scraper = FatsomaAPIScraper()
     syncer = SupabaseSyncer()
 
     # Scrape events from the location
-    events = await scraper.scrape_events(location=location, limit=200)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location=location, limit=200)
 
     # Look for events at this venue or mentioning this club
     matching_events = []
@@ -43,8 +43,8 @@ async def fix_function_event():
 
     # Step 2: Fetch real event from Fatsoma API
     print("\n🔍 Step 2: Fetching event from Fatsoma API (Nottingham)...")
-    scraper = FatsomaAPIScraper()
-    events = await scraper.scrape_events(location="nottingham", limit=100)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location="nottingham", limit=100)
 
     # Find FUNCTION NEXT DOOR event
     function_event = None
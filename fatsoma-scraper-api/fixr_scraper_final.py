@@ -1,5 +1,5 @@
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import asyncio
 from datetime import datetime
 from typing import List, Dict
@@ -143,7 +143,7 @@ class FixrScraper:
                 self.logger.info(f"📸 Screenshot saved")
 
                 content = await page.content()
-                soup = BeautifulSoup(content, 'html.parser')
+                soup = make_soup(content)
 
                 # Save HTML for debugging
                 with open(f'fixr_search_{search_query}.html', 'w', encoding='utf-8') as f:
@@ -304,7 +304,7 @@ class FixrScraper:
             await asyncio.sleep(random.uniform(2, 4))
 
             content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = make_soup(content)
 
             event_data = {
                 'name': '',
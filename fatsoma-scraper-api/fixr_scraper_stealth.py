@@ -1,5 +1,5 @@
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from html_parsing import make_soup
 import asyncio
 from datetime import datetime
 from typing import List, Dict
@@ -174,7 +174,7 @@ class FixrScraperStealth:
                     f.write(content)
                 self.logger.info("💾 HTML saved to fixr_page.html")
 
-                soup = BeautifulSoup(content, 'html.parser')
+                soup = make_soup(content)
 
                 # Find all event links - try multiple selectors
                 event_links = []
@@ -321,7 +321,7 @@ class FixrScraperStealth:
             await asyncio.sleep(1)
 
             content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
+            soup = make_soup(content)
 
             event_data = {
                 'name': '',
@@ -2,29 +2,73 @@
 Fixr Transfer Ticket Link Extractor
 Extracts event information from Fixr transfer ticket links
 """
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import aiohttp
 import asyncio
 import json
 import re
+import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
 import logging
 
+from browser_pool import BrowserPool, BrowserPoolTimeout
+from html_parsing import extract_next_data, make_soup, strainer
+from ttl_cache import TTLCache
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+# How long to wait for the page's __NEXT_DATA__ script after DOMContentLoaded
+NEXT_DATA_TIMEOUT_MS = 10000
+# Timeout for the browserless fast paths before falling back to the browser
+HTTP_TIMEOUT_SECONDS = 8
+# Extraction results per transfer code, and parsed event fields per Fixr event
+TRANSFER_CACHE_TTL_SECONDS = 15 * 60
+EVENT_CACHE_TTL_SECONDS = 6 * 3600
+
 class FixrTransferExtractor:
-    def __init__(self):
+    def __init__(self, browser_pool: Optional[BrowserPool] = None):
+        """
+        Args:
+            browser_pool: Shared warm browser (the API server's); without one,
+                each extraction launches and closes its own headless browser
+        """
         self.base_url = "https://fixr.co"
         self.logger = logging.getLogger(__name__)
+        self.browser_pool = browser_pool
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-GB,en;q=0.9",
+        }
+        self.build_id: Optional[str] = None  # Fixr's current Next.js build, learnt from any page
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.tier_stats = {tier: {"attempts": 0, "hits": 0} for tier in ("http", "next_data_route", "browser")}
+        self.transfer_cache = TTLCache(TRANSFER_CACHE_TTL_SECONDS)
+        self.event_cache = TTLCache(EVENT_CACHE_TTL_SECONDS)
+
+    @staticmethod
+    def transfer_code(transfer_url: str) -> str:
+        """Cache key for a transfer link: its code (/transfer-ticket/<code>), or the URL without query"""
+        path = urlparse(transfer_url.strip()).path.rstrip('/')
+        if '/transfer-ticket/' in path:
+            return path.rsplit('/', 1)[-1].lower()
+        return transfer_url.strip().split('?')[0]
 
     async def extract_from_transfer_link(self, transfer_url: str) -> Optional[Dict]:
         """
         Extract event information from a Fixr transfer ticket link
 
+        Results are cached per transfer code for TRANSFER_CACHE_TTL_SECONDS,
+        and concurrent calls for the same code share one extraction. A miss
+        tries the cheapest source first: a plain GET of the page, then the
+        Next.js data route, and only then a real browser. Per-tier hit rates
+        are in get_stats().
+
         Args:
             transfer_url: URL like https://fixr.co/transfer-ticket/2156d6630b191850eb92a326
 
@@ -41,139 +85,262 @@ class FixrTransferExtractor:
             - url: Event page URL
             - transferUrl: Original transfer link
         """
+        return await self.transfer_cache.get_or_create(
+            self.transfer_code(transfer_url), lambda: self._extract(transfer_url)
+        )
+
+    async def _extract(self, transfer_url: str) -> Optional[Dict]:
         try:
             self.logger.info(f"🎫 Extracting from: {transfer_url}")
 
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=False)
-                page = await browser.new_page()
+            for tier, fetch in (
+                ("http", self._extract_via_http),
+                ("next_data_route", self._extract_via_data_route),
+                ("browser", self._extract_via_browser),
+            ):
+                if tier == "next_data_route" and not self.build_id:
+                    continue  # No buildId seen yet - there is no request to make
+                self.tier_stats[tier]["attempts"] += 1
+                started = time.perf_counter()
+                try:
+                    event_data = await fetch(transfer_url)
+                except BrowserPoolTimeout:
+                    raise
+                except Exception as e:
+                    self.logger.warning(f"{tier} tier failed for {transfer_url}: {e}")
+                    event_data = None
+
+                if event_data:
+                    self.tier_stats[tier]["hits"] += 1
+                    self.logger.info(f"⚡ Resolved via {tier} in {(time.perf_counter() - started) * 1000:.0f}ms")
+                    return event_data
 
-                # Navigate to transfer link
-                await page.goto(transfer_url, wait_until="domcontentloaded", timeout=30000)
-                await asyncio.sleep(5)  # Wait longer for JS to load
+            return None
 
-                # Get page content
-                content = await page.content()
+        except BrowserPoolTimeout:
+            raise
+        except Exception as e:
+            self.logger.error(f"❌ Error extracting from {transfer_url}: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return None
 
-                # Save HTML for debugging
-                with open('debug_transfer.html', 'w', encoding='utf-8') as f:
-                    f.write(content)
-                self.logger.info("Saved debug HTML")
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS))
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session used by the fast paths"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _extract_via_http(self, transfer_url: str) -> Optional[Dict]:
+        """Tier 1: plain GET of the transfer page - Next.js server-renders __NEXT_DATA__ into it"""
+        session = await self._get_session()
+        async with session.get(transfer_url, headers=self.headers) as response:
+            if response.status != 200:
+                self.logger.info(f"Transfer page returned HTTP {response.status}")
+                return None
+            content = await response.text()
+        return self._parse_transfer_html(content, transfer_url)
+
+    async def _extract_via_data_route(self, transfer_url: str) -> Optional[Dict]:
+        """Tier 2: the Next.js data route (/_next/data/<buildId>/<path>.json), once a buildId has been seen"""
+        if not self.build_id:
+            return None
 
+        path = urlparse(transfer_url).path.rstrip('/')
+        data_url = f"{self.base_url}/_next/data/{self.build_id}{path}.json"
+        session = await self._get_session()
+        async with session.get(data_url, headers=dict(self.headers, Accept="application/json")) as response:
+            if response.status == 404:
+                # Fixr deployed since - the next page fetch picks up the new buildId
+                self.build_id = None
+                return None
+            if response.status != 200:
+                return None
+            page_data = await response.json(content_type=None)
+        return self._parse_next_data({'props': page_data}, transfer_url)
+
+    async def _extract_via_browser(self, transfer_url: str) -> Optional[Dict]:
+        """Tier 3: render the page in a browser (pooled if the server gave us a pool)"""
+        content = await self._fetch_rendered_html(transfer_url)
+
+        # Save HTML for debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            with open('debug_transfer.html', 'w', encoding='utf-8') as f:
+                f.write(content)
+            self.logger.debug("Saved debug HTML")
+
+        return self._parse_transfer_html(content, transfer_url)
+
+    def get_stats(self) -> Dict:
+        """Attempts, hits and hit rate per extraction tier, plus the result caches"""
+        return {
+            "tiers": {
+                tier: dict(stats, hit_rate=round(stats["hits"] / stats["attempts"], 3) if stats["attempts"] else None)
+                for tier, stats in self.tier_stats.items()
+            },
+            "transfer_cache": self.transfer_cache.get_stats(),
+            "event_cache": self.event_cache.get_stats(),
+        }
+
+    async def _fetch_rendered_html(self, transfer_url: str) -> str:
+        """Load the transfer page in a browser and return its HTML once __NEXT_DATA__ is in the DOM"""
+        if self.browser_pool is not None:
+            async with self.browser_pool.page() as page:
+                return await self._load_page(page, transfer_url)
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                return await self._load_page(await browser.new_page(), transfer_url)
+            finally:
                 await browser.close()
 
-                # Parse HTML
-                soup = BeautifulSoup(content, 'html.parser')
-
-                # Find the JSON data embedded in the page
-                # Fixr embeds data in <script id="__NEXT_DATA__" type="application/json">
-                json_script = soup.find('script', {'id': '__NEXT_DATA__', 'type': 'application/json'})
-
-                # If not found, try to find any script with JSON data
-                if not json_script:
-                    all_scripts = soup.find_all('script')
-                    self.logger.info(f"Found {len(all_scripts)} script tags, searching for JSON...")
-                    for script in all_scripts:
-                        if script.string and '"props"' in script.string and '"ticketReference"' in script.string:
-                            json_script = script
-                            self.logger.info("Found JSON data in script tag")
-                            break
-
-                if not json_script:
-                    self.logger.error("Could not find embedded JSON data")
-                    return None
-
-                # Parse the JSON
-                data = json.loads(json_script.string)
-
-                # Navigate to the ticket reference data
-                props = data.get('props', {})
-                page_props = props.get('pageProps', {})
-                data_obj = page_props.get('data', {})
-                inner_data = data_obj.get('data', {})
-
-                transfer_code = inner_data.get('transferCode', {})
-                ticket_ref = inner_data.get('ticketReference', {})
-
-                if not ticket_ref:
-                    self.logger.error("Could not find ticket reference data")
-                    return None
-
-                # Extract event data
-                event_info = ticket_ref.get('event', {})
-                venue_info = event_info.get('venue', {})
-                ticket_type_info = ticket_ref.get('ticketType', {})
-
-                # Convert timestamps to readable format
-                last_entry_timestamp = event_info.get('lastEntry')
-                close_time_timestamp = event_info.get('closeTime')
-                open_time_timestamp = event_info.get('openTime')
-
-                event_date = self._format_timestamp(open_time_timestamp) if open_time_timestamp else "TBA"
-
-                # Parse ticket last entry using smart logic
-                ticket_name = ticket_type_info.get('name', '')
-                entry_type, ticket_last_entry, display_label = self._parse_ticket_last_entry(
-                    ticket_name,
-                    open_time_timestamp if open_time_timestamp else 0,
-                    last_entry_timestamp if last_entry_timestamp else 0
-                )
-
-                # Extract city from venue - try city field first, then parse from address
-                city = venue_info.get('city', '')
-                address = venue_info.get('address', '')
-
-                if not city and address:
-                    # Try to extract city from address (e.g., "Masonic Place, Nottingham, United Kingdom")
-                    address_parts = [part.strip() for part in address.split(',')]
-                    if len(address_parts) >= 2:
-                        # Second to last part is usually the city
-                        city = address_parts[-2] if len(address_parts) >= 2 else ''
-                        self.logger.info(f"📍 Extracted city from address: {city}")
-
-                # Build event data object
-                event_data = {
-                    'name': event_info.get('name', ''),
-                    'date': event_date,
-                    'lastEntry': ticket_last_entry,  # Use parsed ticket last entry
-                    'lastEntryType': entry_type,  # "before" or "after"
-                    'lastEntryLabel': display_label,  # "Last Entry" or "Arrive After"
-                    'venue': venue_info.get('name', ''),
-                    'location': city,
-                    'address': address,
-                    'postcode': venue_info.get('postcode', ''),
-                    'description': '',  # Not available in transfer link
-                    'imageUrl': event_info.get('eventImage', ''),
-                    'url': event_info.get('shareUrl', ''),
-                    'company': ticket_ref.get('salesAccount', {}).get('name', ''),
-                    'transferer': transfer_code.get('senderFullName', ''),
-                    'ticketType': ticket_type_info.get('name', ''),
-                    'ticketDescription': ticket_type_info.get('description', ''),
-                    'transferUrl': transfer_url,
-                    'transferCode': transfer_code.get('transferCode', ''),
-                    'source': 'fixr',
-                    'tickets': [{
-                        'ticketType': ticket_type_info.get('name', 'General Admission'),
-                        'price': 0.0,  # Price not shown in transfer link
-                        'available': True,
-                        'lastEntry': ticket_last_entry
-                    }]
-                }
-
-                self.logger.info(f"✅ Extracted: {event_data['name']}")
-                self.logger.info(f"   📍 Venue: {event_data['venue']} - {event_data['location']}")
-                self.logger.info(f"   🎫 Ticket: {event_data['ticketType']}")
-                self.logger.info(f"   👤 Transferer: {event_data['transferer']}")
-                self.logger.info(f"   ⏰ {display_label}: {ticket_last_entry}")
-
-                return event_data
+    async def _load_page(self, page, transfer_url: str) -> str:
+        # Navigate to transfer link
+        await page.goto(transfer_url, wait_until="domcontentloaded", timeout=30000)
+        try:
+            # Next.js embeds the page data in this script - it's all we need
+            await page.wait_for_selector('script#__NEXT_DATA__', state='attached', timeout=NEXT_DATA_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            self.logger.warning("__NEXT_DATA__ not found, falling back to other script tags")
+
+        # Get page content
+        return await page.content()
+
+    def _parse_transfer_html(self, content: str, transfer_url: str) -> Optional[Dict]:
+        """Build the event dict from a transfer page's HTML (None if the embedded data is missing)"""
+        data = self._find_next_data(content)
+        if data is None:
+            return None
+        return self._parse_next_data(data, transfer_url)
+
+    def _find_next_data(self, content: str) -> Optional[Dict]:
+        """The page's embedded Next.js data (None if it isn't in the HTML)"""
+        # Fixr embeds data in <script id="__NEXT_DATA__" type="application/json"> - read it
+        # straight out of the HTML, no DOM needed
+        data = extract_next_data(content)
+
+        # If not found, try to find any script with JSON data
+        if data is None:
+            all_scripts = make_soup(content, parse_only=strainer('script')).find_all('script')
+            self.logger.info(f"Found {len(all_scripts)} script tags, searching for JSON...")
+            for script in all_scripts:
+                if script.string and '"props"' in script.string and '"ticketReference"' in script.string:
+                    data = json.loads(script.string)
+                    self.logger.info("Found JSON data in script tag")
+                    break
+
+        if data is None:
+            self.logger.error("Could not find embedded JSON data")
+            return None
 
-        except Exception as e:
-            self.logger.error(f"❌ Error extracting from {transfer_url}: {str(e)}")
-            import traceback
-            traceback.print_exc()
+        if data.get('buildId'):
+            self.build_id = data['buildId']
+        return data
+
+    def _parse_next_data(self, data: Dict, transfer_url: str) -> Optional[Dict]:
+        """Build the event dict from __NEXT_DATA__ (None if it has no ticket reference)"""
+        # Navigate to the ticket reference data
+        props = data.get('props', {})
+        page_props = props.get('pageProps', {})
+        data_obj = page_props.get('data', {})
+        inner_data = data_obj.get('data', {})
+
+        transfer_code = inner_data.get('transferCode', {})
+        ticket_ref = inner_data.get('ticketReference', {})
+
+        if not ticket_ref:
+            self.logger.error("Could not find ticket reference data")
             return None
 
+        # Extract event data
+        event_info = ticket_ref.get('event', {})
+        ticket_type_info = ticket_ref.get('ticketType', {})
+
+        # Convert timestamps to readable format
+        last_entry_timestamp = event_info.get('lastEntry')
+        open_time_timestamp = event_info.get('openTime')
+
+        # Event-level fields are shared by every transfer link for the event
+        event_key = str(event_info.get('id') or event_info.get('shareUrl') or '')
+        event_fields = self.event_cache.get(event_key) if event_key else None
+        if event_fields is None:
+            event_fields = self._parse_event_fields(ticket_ref)
+            if event_key:
+                self.event_cache.put(event_key, event_fields)
+
+        # Parse ticket last entry using smart logic
+        ticket_name = ticket_type_info.get('name', '')
+        entry_type, ticket_last_entry, display_label = self._parse_ticket_last_entry(
+            ticket_name,
+            open_time_timestamp if open_time_timestamp else 0,
+            last_entry_timestamp if last_entry_timestamp else 0
+        )
+
+        # Build event data object
+        event_data = {
+            **event_fields,
+            'lastEntry': ticket_last_entry,  # Use parsed ticket last entry
+            'lastEntryType': entry_type,  # "before" or "after"
+            'lastEntryLabel': display_label,  # "Last Entry" or "Arrive After"
+            'transferer': transfer_code.get('senderFullName', ''),
+            'ticketType': ticket_type_info.get('name', ''),
+            'ticketDescription': ticket_type_info.get('description', ''),
+            'transferUrl': transfer_url,
+            'transferCode': transfer_code.get('transferCode', ''),
+            'source': 'fixr',
+            'tickets': [{
+                'ticketType': ticket_type_info.get('name', 'General Admission'),
+                'price': 0.0,  # Price not shown in transfer link
+                'available': True,
+                'lastEntry': ticket_last_entry
+            }]
+        }
+
+        self.logger.info(f"✅ Extracted: {event_data['name']}")
+        self.logger.info(f"   📍 Venue: {event_data['venue']} - {event_data['location']}")
+        self.logger.info(f"   🎫 Ticket: {event_data['ticketType']}")
+        self.logger.info(f"   👤 Transferer: {event_data['transferer']}")
+        self.logger.info(f"   ⏰ {display_label}: {ticket_last_entry}")
+
+        return event_data
+
+    def _parse_event_fields(self, ticket_ref: Dict) -> Dict:
+        """Fields that describe the event itself (not the transferred ticket)"""
+        event_info = ticket_ref.get('event', {})
+        venue_info = event_info.get('venue', {})
+        open_time_timestamp = event_info.get('openTime')
+
+        # Extract city from venue - try city field first, then parse from address
+        city = venue_info.get('city', '')
+        address = venue_info.get('address', '')
+
+        if not city and address:
+            # Try to extract city from address (e.g., "Masonic Place, Nottingham, United Kingdom")
+            address_parts = [part.strip() for part in address.split(',')]
+            if len(address_parts) >= 2:
+                # Second to last part is usually the city
+                city = address_parts[-2] if len(address_parts) >= 2 else ''
+                self.logger.info(f"📍 Extracted city from address: {city}")
+
+        return {
+            'name': event_info.get('name', ''),
+            'date': self._format_timestamp(open_time_timestamp) if open_time_timestamp else "TBA",
+            'venue': venue_info.get('name', ''),
+            'location': city,
+            'address': address,
+            'postcode': venue_info.get('postcode', ''),
+            'description': '',  # Not available in transfer link
+            'imageUrl': event_info.get('eventImage', ''),
+            'url': event_info.get('shareUrl', ''),
+            'company': ticket_ref.get('salesAccount', {}).get('name', ''),
+        }
+
     def _parse_ticket_last_entry(self, ticket_name: str, event_start_timestamp: int, venue_last_entry_timestamp: int) -> Tuple[str, str, str]:
         """
         Parse ticket name for last entry time and determine entry type.
@@ -330,6 +497,8 @@ async def main():
             print(f"🔗 Transfer URL: {event_data['transferUrl']}")
             print(f"{'='*60}\n")
 
+    await extractor.close()
+
     # Save to JSON file
     if all_events:
         with open('fixr_transfer_events.json', 'w', encoding='utf-8') as f:
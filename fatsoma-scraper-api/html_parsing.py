@@ -0,0 +1,77 @@
+"""
+HTML Parsing - Shared helpers for the scrapers' HTML hot paths
+
+Three levels, cheapest first:
+- zero-DOM extractors (extract_next_data, find_uuids, find_links) that pull what
+  we need out of the raw HTML with precompiled regexes
+- partial parses (make_soup with parse_only=strainer(...)) that only build the
+  tags a caller is going to search
+- full parses (make_soup) on the fastest installed parser: lxml if available,
+  else the stdlib html.parser (with a warning)
+
+Parsing itself is only faster with lxml: on html.parser, make_soup does the
+same work as before and strained parses save little on card-heavy pages. See
+benchmark_html_parsing.py for timings against BeautifulSoup(html, 'html.parser').
+"""
+import json
+import logging
+import re
+from typing import Dict, List, Optional, Pattern, Union
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 - only needed as BeautifulSoup's tree builder
+    PARSER = 'lxml'
+except ImportError:
+    PARSER = 'html.parser'
+    logging.getLogger(__name__).warning(
+        "lxml is not installed - HTML parses fall back to html.parser and get no faster "
+        "(pip install -r requirements.txt)"
+    )
+
+UUID_RE = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
+)
+_HREF_RE = re.compile(r'<a\b[^>]*?\bhref=["\']([^"\']+)["\']', re.IGNORECASE)
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """BeautifulSoup on the fastest available parser, optionally building only parse_only's tags"""
+    return BeautifulSoup(html, PARSER, parse_only=parse_only)
+
+
+def strainer(name=None, attrs: Optional[Dict] = None, **kwargs) -> SoupStrainer:
+    """
+    Tags to keep in a partial parse, same filters as find_all()
+
+    e.g. make_soup(html, strainer('div', class_=re.compile('event-card'))) builds
+    only the matching divs (and what's inside them) instead of the whole page.
+    """
+    return SoupStrainer(name, attrs or {}, **kwargs)
+
+
+def extract_next_data(html: str) -> Optional[Dict]:
+    """The page's <script id="__NEXT_DATA__"> JSON, without building a DOM (None if absent or invalid)"""
+    match = _NEXT_DATA_RE.search(html)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def find_uuids(text: str) -> List[str]:
+    """Every distinct UUID in text, in order of appearance"""
+    return list(dict.fromkeys(UUID_RE.findall(text)))
+
+
+def find_links(html: str, pattern: Union[str, Pattern, None] = None) -> List[str]:
+    """Distinct <a href> values (in page order), optionally only those matching pattern"""
+    if isinstance(pattern, str):
+        pattern = re.compile(pattern)
+    hrefs = dict.fromkeys(_HREF_RE.findall(html))
+    return [href for href in hrefs if pattern is None or pattern.search(href)]
@@ -0,0 +1,178 @@
+"""
+On-disk HTTP cache for Fatsoma API responses
+Stores ETag/Last-Modified per URL and revalidates with conditional requests
+"""
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+
+
+class HTTPCache:
+    """
+    URL-keyed cache of JSON response bodies plus their validators
+
+    Every lookup is revalidated upstream with If-None-Match /
+    If-Modified-Since; a 304 reply is served from disk. Entries older than
+    the TTL are evicted, and the oldest entries are dropped once the cache
+    grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, ttl_seconds: float = 72 * 3600,
+                 max_bytes: int = 200 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path(__file__).parent / ".http_cache"
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._stores_since_prune = 0
+        self.prune()
+
+    @classmethod
+    def from_env(cls) -> Optional["HTTPCache"]:
+        """Build a cache from FATSOMA_HTTP_CACHE_* env vars (None if disabled)"""
+        if os.getenv('FATSOMA_HTTP_CACHE', 'true').lower() != 'true':
+            return None
+
+        try:
+            return cls(
+                cache_dir=os.getenv('FATSOMA_HTTP_CACHE_DIR'),
+                ttl_seconds=float(os.getenv('FATSOMA_HTTP_CACHE_TTL_HOURS', '72')) * 3600,
+                max_bytes=int(float(os.getenv('FATSOMA_HTTP_CACHE_MAX_MB', '200')) * 1024 * 1024)
+            )
+        except Exception as e:
+            print(f"⚠️  HTTP cache disabled: {e}")
+            return None
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached entry for a URL, evicting it if past its TTL"""
+        path = self._path(url)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Validator headers to send for a cached entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], body: str):
+        """Save a response body; responses without validators aren't cached"""
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'body': body
+        }
+
+        path = self._path(url)
+        tmp_path = path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not write HTTP cache entry for {url}: {e}")
+            return
+
+        self._stores_since_prune += 1
+        if self._stores_since_prune >= 500:
+            self.prune()
+
+    def touch(self, url: str):
+        """Mark an entry as freshly validated (after a 304)"""
+        try:
+            os.utime(self._path(url))
+        except OSError:
+            pass
+
+    def prune(self):
+        """Evict expired entries, then the oldest ones until under max_bytes"""
+        self._stores_since_prune = 0
+        now = time.time()
+        entries = []
+
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            if now - stat.st_mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def get_stats(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': f"{(self.hits / total * 100):.1f}%" if total > 0 else "0%"
+        }
+
+
+async def cached_get_json(session, url: str, headers: Dict, cache: Optional[HTTPCache] = None,
+                          timeout: Optional[aiohttp.ClientTimeout] = None) -> Tuple[int, Optional[Dict]]:
+    """
+    GET a JSON URL, revalidating against the cache when one is given
+
+    Returns (status, data). A 304 is reported as 200 with the cached body,
+    so callers only ever need to handle "200 with data" or "failed".
+    """
+    entry = cache.get(url) if cache else None
+    request_headers = dict(headers)
+    if cache:
+        request_headers.update(cache.conditional_headers(entry))
+
+    kwargs = {'headers': request_headers}
+    if timeout is not None:
+        kwargs['timeout'] = timeout
+
+    async with session.get(url, **kwargs) as response:
+        if response.status == 304 and entry:
+            cache.hits += 1
+            cache.touch(url)
+            return 200, json.loads(entry['body'])
+
+        if response.status != 200:
+            return response.status, None
+
+        body = await response.text()
+        if cache:
+            cache.misses += 1
+            cache.store(url, response.headers.get('ETag'), response.headers.get('Last-Modified'), body)
+        return 200, json.loads(body)
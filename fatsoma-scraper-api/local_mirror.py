@@ -0,0 +1,159 @@
+"""
+Local SQLite mirror - Keeps the FastAPI read model in step with synced events
+"""
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy.orm import selectinload
+
+from models import SessionLocal, Event, Ticket
+
+# Scraped event keys that map onto Event columns (end_datetime etc. are scraper-only)
+EVENT_COLUMNS = {column.name for column in Event.__table__.columns} - {'id', 'created_at', 'updated_at', 'city_key'}
+TICKET_COLUMNS = {column.name for column in Ticket.__table__.columns} - {'id', 'event_id'}
+
+
+class LocalMirror:
+    """Writes scraped event batches into the local SQLite database"""
+
+    def __init__(self):
+        # SQLite allows a single writer - serialize batches from concurrent sync workers
+        self._lock = threading.Lock()
+
+    def save_events(self, events: List[Dict]) -> int:
+        """
+        Upsert a batch of scraped events and replace their tickets
+
+        Blocking (SQLAlchemy) - call via asyncio.to_thread from async code.
+        The input dicts are not modified.
+
+        Returns: Number of events written
+        """
+        if not events:
+            return 0
+
+        with self._lock:
+            db = SessionLocal()
+            try:
+                event_ids = [e['event_id'] for e in events if e.get('event_id')]
+                existing_events = {
+                    event.event_id: event
+                    for event in db.query(Event).filter(Event.event_id.in_(event_ids)).all()
+                }
+
+                for event_data in events:
+                    values = {key: value for key, value in event_data.items() if key in EVENT_COLUMNS}
+                    values['city_key'] = (values.get('city') or '').strip().lower() or None
+                    existing_event = existing_events.get(values.get('event_id'))
+
+                    if existing_event:
+                        # Update existing event
+                        for key, value in values.items():
+                            setattr(existing_event, key, value)
+                        existing_event.updated_at = datetime.utcnow()
+
+                        # Delete old tickets
+                        db.query(Ticket).filter(Ticket.event_id == existing_event.id).delete()
+                    else:
+                        # Create new event
+                        existing_event = Event(**values)
+                        db.add(existing_event)
+                        existing_events[existing_event.event_id] = existing_event
+
+                    db.flush()
+
+                    # Add tickets
+                    for ticket_data in event_data.get('tickets', []):
+                        ticket_values = {key: value for key, value in ticket_data.items() if key in TICKET_COLUMNS}
+                        db.add(Ticket(event_id=existing_event.id, **ticket_values))
+
+                db.commit()
+                return len(events)
+
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    def replace_tickets(self, event_id: str, tickets: List[Dict]) -> bool:
+        """
+        Replace one event's tickets (e.g. after a ticket poll)
+
+        Blocking (SQLAlchemy) - call via asyncio.to_thread from async code.
+
+        Returns: False if the event isn't in the mirror
+        """
+        with self._lock:
+            db = SessionLocal()
+            try:
+                event = db.query(Event).filter(Event.event_id == event_id).first()
+                if not event:
+                    return False
+
+                db.query(Ticket).filter(Ticket.event_id == event.id).delete()
+                for ticket_data in tickets:
+                    ticket_values = {key: value for key, value in ticket_data.items() if key in TICKET_COLUMNS}
+                    db.add(Ticket(event_id=event.id, **ticket_values))
+                event.updated_at = datetime.utcnow()
+
+                db.commit()
+                return True
+
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+
+    def get_upcoming_events(self, city: str, limit: int = 100) -> List[Dict]:
+        """
+        Upcoming events in a city as scraper-style dicts (tickets included)
+
+        Blocking (SQLAlchemy) - call via asyncio.to_thread from async code.
+        """
+        with self._lock:
+            db = SessionLocal()
+            try:
+                today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+                events = db.query(Event).options(selectinload(Event.tickets)).filter(
+                    Event.city_key == city.strip().lower(), Event.date >= today
+                ).order_by(Event.date).limit(limit).all()
+
+                return [
+                    dict(
+                        {column: getattr(event, column) for column in EVENT_COLUMNS},
+                        tickets=[{column: getattr(ticket, column) for column in TICKET_COLUMNS} for ticket in event.tickets]
+                    )
+                    for event in events
+                ]
+            finally:
+                db.close()
+
+    def delete_events(self, event_ids: List[str]) -> int:
+        """
+        Remove events (and their tickets) by Fatsoma event_id
+
+        Blocking (SQLAlchemy) - call via asyncio.to_thread from async code.
+
+        Returns: Number of events deleted
+        """
+        if not event_ids:
+            return 0
+
+        with self._lock:
+            db = SessionLocal()
+            try:
+                ids = [row.id for row in db.query(Event.id).filter(Event.event_id.in_(event_ids)).all()]
+                if ids:
+                    db.query(Ticket).filter(Ticket.event_id.in_(ids)).delete(synchronize_session=False)
+                    db.query(Event).filter(Event.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                return len(ids)
+
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
@@ -1,21 +1,73 @@
-from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
+from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, text
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 import uvicorn
 import asyncio
+import base64
+import os
+from functools import partial
 
-from models import SessionLocal, Event, Ticket
+import models
+from models import SessionLocal, Event, Ticket, FTS_WEIGHTS, fts_query
 from api_scraper import FatsomaAPIScraper
 from supabase_syncer import SupabaseSyncer
 from event_cleanup import EventCleanup
-from fixr_transfer_extractor import FixrTransferExtractor
+from local_mirror import LocalMirror
+from sync_state import SyncState
+from sync_coordinator import SyncCoordinator
+from sync_tiers import SyncTiers
+from response_cache import ResponseCache
+from ticket_poller import TicketPoller
+from fixr_transfer_extractor import FixrTransferExtractor, EVENT_CACHE_TTL_SECONDS
+from ttl_cache import TTLCache
+from browser_pool import BrowserPool, BrowserPoolTimeout
 from pydantic import BaseModel
 
 app = FastAPI(title="Fatsoma Scraper API")
 
+# Serialized /events responses, invalidated whenever a sync writes to the local database
+response_cache = ResponseCache.from_env()
+CACHED_HEADERS = ("content-type", "x-next-cursor")
+
+def invalidate_read_cache():
+    """Call after a sync job has written to the local database"""
+    if response_cache:
+        response_cache.bump()
+
+# Registered before CORS so CORS headers are added to cached replies too
+@app.middleware("http")
+async def cache_read_responses(request: Request, call_next):
+    """Serve GET /events* from the response cache, answering If-None-Match with 304"""
+    if response_cache is None or request.method != "GET" or not request.url.path.startswith("/events"):
+        return await call_next(request)
+
+    key = request.url.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    entry = response_cache.get(key)
+    cache_status = "HIT"
+    if entry is None:
+        cache_status = "MISS"
+        generation = response_cache.generation
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        entry = {
+            "body": body,
+            "etag": ResponseCache.make_etag(body),
+            "headers": {k: v for k, v in response.headers.items() if k.lower() in CACHED_HEADERS},
+        }
+        response_cache.put(key, entry, generation)
+
+    headers = {"ETag": entry["etag"], "X-Cache": cache_status}
+    if ResponseCache.etag_matches(entry["etag"], request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], headers=dict(entry["headers"], **headers))
+
 # CORS for iOS app
 app.add_middleware(
     CORSMiddleware,
@@ -23,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Cache"],
 )
 
 # Pydantic models for API responses
@@ -61,99 +114,324 @@ def get_db():
     finally:
         db.close()
 
-# Background scraping function
-async def update_events():
-    """Background task to update events"""
-    print(f"Starting event update at {datetime.now()}")
-    server_status["is_syncing"] = True
-    scraper = FatsomaAPIScraper()
+def encode_cursor(event: Event) -> str:
+    """Opaque keyset cursor pointing just after event in (date, id) order"""
+    date = event.date.isoformat() if event.date else ""
+    return base64.urlsafe_b64encode(f"{date}|{event.id}".encode()).decode()
 
+def after_cursor(cursor: str):
+    """Filter selecting the events after a cursor from encode_cursor()"""
     try:
-        # Scrape events from multiple UK student cities
-        all_events = []
-        locations = ["london", "manchester", "nottingham", "birmingham", "leeds"]
-
-        for location in locations:
-            print(f"\n📍 Scraping {location.title()}...")
-            location_events = await scraper.scrape_events(location=location, limit=100)
-            all_events.extend(location_events)
-            print(f"   Found {len(location_events)} events in {location.title()}")
-
-        # Fetch manual events (UUIDs and organizer profiles)
-        print(f"\n🎯 Fetching manual events...")
-        manual_events = await scraper.fetch_manual_events()
-        if manual_events:
-            print(f"   Found {len(manual_events)} manual events")
-            all_events.extend(manual_events)
-
-        events = all_events
-        print(f"\n✅ Total events scraped: {len(events)}")
-
-        # Sync to Supabase
-        try:
-            supabase_syncer = SupabaseSyncer()
-            supabase_results = await supabase_syncer.sync_events(events)
-            print(f"Supabase sync: {supabase_results['success']} events synced ({supabase_results['created']} created, {supabase_results['updated']} updated)")
-
-            # After sync, clean up past events
-            print(f"\n🗑️  Cleaning up past events...")
-            cleanup = EventCleanup()
-            past_events = cleanup.archive_past_events(dry_run=False)
-            print(f"✅ Archived {len(past_events)} past events")
-        except Exception as e:
-            print(f"⚠️ Supabase sync failed (continuing with local DB): {e}")
+        date, event_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        event_id = int(event_id)
+        date = datetime.fromisoformat(date) if date else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if date is None:
+        # SQLite sorts undated events first
+        return or_(and_(Event.date.is_(None), Event.id > event_id), Event.date.isnot(None))
+    return or_(Event.date > date, and_(Event.date == date, Event.id > event_id))
+
+# Cities synced on every run
+SYNC_LOCATIONS = ["london", "manchester", "nottingham", "birmingham", "leeds"]
+SYNC_LIMIT_PER_CITY = 100
+SYNC_QUEUE_SIZE = 8     # Batches buffered between scraper and writers (backpressure)
+SYNC_WORKERS = 2        # Concurrent batch writers
+
+# Refresh intervals and priorities per catalog / city / organizer / manual event
+# come from sync_tiers.json. A full catalog reconcile (which also removes events
+# that vanished upstream) runs at most every FULL_RECONCILE_HOURS
+# Scheduled runs start up to this many seconds late, so several servers don't hit Fatsoma in lockstep
+SYNC_JITTER_SECONDS = int(os.getenv('SYNC_JITTER_SECONDS', '60'))
+FULL_RECONCILE_HOURS = float(os.getenv('FULL_RECONCILE_HOURS', '6'))
+# Re-read this much before the high-water mark, for events edited mid-crawl
+DELTA_OVERLAP = timedelta(minutes=10)
+SYNC_MODES = ("auto", "delta", "full")
+# The global /events feed and the whole manual_organizers.json list
+SYNC_SOURCES = ("catalog", "manual")
+
+local_mirror = LocalMirror()
+sync_state = SyncState()
+sync_tiers = SyncTiers()
+# Long-lived scraper for every sync job - they all run on the coordinator's event loop,
+# so its pooled keep-alive session is reused from one run to the next
+scraper = FatsomaAPIScraper(sync_state=sync_state)
+# Long-lived Supabase syncer shared by every sync job (created on first use, see get_syncer),
+# so its async client's connection pool is reused instead of opened again each run
+syncer: Optional[SupabaseSyncer] = None
+
+def choose_sync_mode(mode: str = "auto") -> str:
+    """Resolve "auto" to "full" when no high-water mark exists or a reconcile is due"""
+    high_water_mark = sync_state.get_high_water_mark("catalog")
+    if mode == "full" or high_water_mark is None:
+        return "full"
+    if mode == "delta":
+        return mode
+
+    last_full = sync_state.get_last_full_reconcile()
+    if last_full is None:
+        return "full"
+    if datetime.now(timezone.utc) - last_full >= timedelta(hours=FULL_RECONCILE_HOURS):
+        return "full"
+    return "delta"
 
-        # Also save to local SQLite database
-        try:
-            db = SessionLocal()
-
-            for event_data in events:
-                tickets_data = event_data.pop('tickets', [])
-
-                # Check if event exists
-                existing_event = db.query(Event).filter(Event.event_id == event_data['event_id']).first()
+# Background scraping function
+async def write_batch(batch: List[dict], supabase_syncer: Optional[SupabaseSyncer]) -> dict:
+    """Write one batch to Supabase (changed rows only) and the local SQLite mirror"""
+    totals = {"success": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": 0, "local": 0}
 
-                if existing_event:
-                    # Update existing event
-                    for key, value in event_data.items():
-                        setattr(existing_event, key, value)
-                    existing_event.updated_at = datetime.utcnow()
+    # Sync to Supabase
+    if supabase_syncer:
+        try:
+            results = await supabase_syncer.sync_events(batch, refresh_organizer_counts=False)
+            for key in ("success", "created", "updated", "unchanged", "errors"):
+                totals[key] += results[key]
+        except Exception as e:
+            print(f"⚠️ Supabase sync failed for batch (continuing with local DB): {e}")
 
-                    # Delete old tickets
-                    db.query(Ticket).filter(Ticket.event_id == existing_event.id).delete()
-                else:
-                    # Create new event
-                    existing_event = Event(**event_data)
-                    db.add(existing_event)
+    # Also save to local SQLite database
+    try:
+        totals["local"] += await asyncio.to_thread(local_mirror.save_events, batch)
+        # Readers see each batch as soon as it lands, not only once the whole sync is over
+        invalidate_read_cache()
+    except Exception as db_error:
+        print(f"⚠️ Local SQLite update failed for batch: {db_error}")
 
-                db.flush()
+    return totals
 
-                # Add tickets
-                for ticket_data in tickets_data:
-                    ticket = Ticket(event_id=existing_event.id, **ticket_data)
-                    db.add(ticket)
+async def update_events(mode: str = "auto", sources=SYNC_SOURCES):
+    """
+    Background task to update events
+
+    Runs as a producer/consumer pipeline: the scraper streams event batches
+    (one feed page at a time, tickets attached) into a bounded queue, and
+    sync workers write each batch to Supabase and the local SQLite mirror as
+    it arrives. The city and per-city limit filters are applied in feed order,
+    before any ticket requests are made.
+
+    Args:
+        mode: "delta" only fetches tickets for and writes events whose upstream
+            updated-at is past the stored high-water mark; "full" re-crawls
+            everything and deletes upcoming events missing from the feed;
+            "auto" picks one (see choose_sync_mode)
+        sources: Which of SYNC_SOURCES to sync (mode only applies to "catalog")
+
+    Don't call this directly from request handlers or schedulers - go
+    through sync_coordinator.trigger() so syncs never overlap.
+    """
+    sources = set(sources)
+    mode = choose_sync_mode(mode)
+    if mode == "full" and "catalog" in sources:
+        # Pruning needs the manual events too, or it would delete them
+        sources.add("manual")
+    started_at = datetime.now(timezone.utc)
+    modified_since = None
+    if mode == "delta":
+        modified_since = sync_state.get_high_water_mark("catalog") - DELTA_OVERLAP
+
+    print(f"Starting {mode} event update ({', '.join(sorted(sources))}) at {datetime.now()}")
+    server_status["is_syncing"] = True
+    started = datetime.now()
 
-            db.commit()
-            print(f"Successfully updated {len(events)} events in local database")
-        except Exception as db_error:
-            print(f"⚠️ Local SQLite update failed (Supabase sync succeeded): {db_error}")
-        finally:
-            db.close()
+    try:
+        supabase_syncer = get_syncer()
+        if supabase_syncer:
+            # Pick up organizers renamed or removed since the last run
+            supabase_syncer.clear_organizer_cache()
+
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SYNC_QUEUE_SIZE)
+        totals = {"scraped": 0, "success": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": 0, "local": 0}
+        seen_event_ids = set()
+        manual_event_ids = set()
+        city_counts = {location: 0 for location in SYNC_LOCATIONS}
+        # Don't let a previous run's crawl stand in for this one (e.g. a manual-only run)
+        scraper.last_crawl = {}
+        scraper.last_manual_fetch = {}
+
+        async def produce():
+            try:
+                if "catalog" in sources:
+                    # Scrape events from multiple UK student cities in one global crawl. Events are
+                    # picked before their tickets are fetched, so nothing is enriched only to be dropped
+                    def select(event):
+                        location = scraper.in_locations(event, SYNC_LOCATIONS)
+                        if not location or not scraper.is_active(event):
+                            return False
+                        if city_counts[location] >= SYNC_LIMIT_PER_CITY or event['event_id'] in seen_event_ids:
+                            return False
+                        city_counts[location] += 1
+                        seen_event_ids.add(event['event_id'])
+                        return True
+
+                    async for batch in scraper.stream_catalog(modified_since=modified_since, select=select):
+                        await queue.put(batch)
+
+                    for location, count in city_counts.items():
+                        print(f"   Found {count} events in {location.title()}")
+
+                if "manual" in sources:
+                    # Fetch manual events (UUIDs and organizer profiles)
+                    print(f"\n🎯 Fetching manual events...")
+                    # (always fetched in full - the set is small and its 7-day window moves
+                    # without updated-at changing; unchanged rows are skipped by content hash)
+                    # Events the catalog crawl already selected aren't fetched twice
+                    manual_events = await scraper.fetch_manual_events(skip_event_ids=seen_event_ids)
+                    manual_event_ids.update(e['event_id'] for e in manual_events)
+                    if manual_events:
+                        print(f"   Found {len(manual_events)} manual events")
+                        seen_event_ids.update(e['event_id'] for e in manual_events)
+                        await queue.put(manual_events)
+            finally:
+                for _ in range(SYNC_WORKERS):
+                    await queue.put(None)
+
+        async def consume():
+            while True:
+                batch = await queue.get()
+                if batch is None:
+                    break
+
+                if totals["scraped"] == 0:
+                    print(f"⏱️  First batch ready after {(datetime.now() - started).total_seconds():.1f}s")
+                totals["scraped"] += len(batch)
+
+                for key, value in (await write_batch(batch, supabase_syncer)).items():
+                    totals[key] += value
+
+        await asyncio.gather(produce(), *(consume() for _ in range(SYNC_WORKERS)))
+
+        crawl = scraper.last_crawl if "catalog" in sources else {}
+        print(f"\n✅ Total events scraped: {totals['scraped']}")
+        print(f"Successfully updated {totals['local']} events in local database")
+
+        # Only advance the high-water mark once everything up to it is written
+        crawl_ok = crawl.get('complete') and totals["errors"] == 0
+        # A full reconcile needs this run to have crawled the whole catalog (or every page up to
+        # the cap - events past it are never synced) and every manual event, or pruning would
+        # delete events that are only missing because a request failed
+        manual_ok = scraper.last_manual_fetch.get('complete', False)
+        full_reconcile = mode == "full" and crawl_ok and (crawl.get('reached_end') or crawl.get('capped')) and manual_ok
+        if mode == "full" and crawl_ok and not manual_ok:
+            print(f"⚠️ {scraper.last_manual_fetch.get('failed', 0)} manual organizers/events failed to fetch - not pruning")
+        if crawl_ok and crawl.get('max_updated_at'):
+            sync_state.set_high_water_mark("catalog", crawl['max_updated_at'])
+
+        if supabase_syncer:
+            print(f"Supabase sync: {totals['success']} events synced ({totals['created']} created, {totals['updated']} updated, {totals['unchanged']} unchanged)")
+            try:
+                if full_reconcile and "manual" in sources:
+                    removed = await supabase_syncer.prune_missing(crawl['event_ids'] | manual_event_ids)
+                    await asyncio.to_thread(local_mirror.delete_events, removed)
+
+                await supabase_syncer.flush_organizer_counts()
+
+                # After sync, clean up past events
+                print(f"\n🗑️  Cleaning up past events...")
+                cleanup = EventCleanup(supabase_syncer)
+                past_events = await asyncio.to_thread(cleanup.archive_past_events, dry_run=False)
+                print(f"✅ Archived {len(past_events or [])} past events")
+                # The local mirror only serves the hot tier
+                await asyncio.to_thread(local_mirror.delete_events, [e['event_id'] for e in past_events or []])
+            except Exception as e:
+                print(f"⚠️ Post-sync cleanup failed: {e}")
+
+        if full_reconcile:
+            sync_state.mark_full_reconcile(started_at)
 
         # Update status
         server_status["is_syncing"] = False
         server_status["last_sync"] = datetime.now().isoformat()
+        server_status["last_sync_mode"] = mode
         server_status["ready"] = True
 
     except Exception as e:
         print(f"Error updating events: {e}")
         server_status["is_syncing"] = False
 
+    finally:
+        invalidate_read_cache()
+
+def get_syncer() -> Optional[SupabaseSyncer]:
+    """Shared syncer for sync jobs, created on first use (None while Supabase is unavailable)"""
+    global syncer
+    if syncer is None:
+        try:
+            syncer = SupabaseSyncer()
+        except Exception as e:
+            print(f"⚠️ Supabase unavailable (continuing with local DB): {e}")
+    return syncer
+
+async def write_tier_batch(job: str, events: List[dict]):
+    """Write the events refreshed by a tier job with the shared syncer"""
+    supabase_syncer = get_syncer()
+    totals = await write_batch(events, supabase_syncer)
+    if supabase_syncer:
+        await supabase_syncer.flush_organizer_counts()
+    print(f"🔁 {job}: {len(events)} events refreshed ({totals['unchanged']} unchanged, {totals['errors']} errors)")
+
+async def refresh_city(city: str):
+    """Tier job: re-fetch tickets for a city's upcoming events already in the local mirror"""
+    events = await asyncio.to_thread(local_mirror.get_upcoming_events, city, SYNC_LIMIT_PER_CITY)
+    if not events:
+        return
+    # Only events whose ticket options came back - the rest keep their stored tickets
+    refreshed = await scraper.refresh_tickets(events)
+    if refreshed:
+        await write_tier_batch(f"city:{city}", refreshed)
+    if len(refreshed) < len(events):
+        print(f"⚠️ city:{city}: tickets for {len(events) - len(refreshed)} events could not be refreshed")
+
+async def refresh_organizer(organizer: dict):
+    """Tier job: re-fetch one tracked organizer's upcoming events"""
+    events = await scraper.fetch_organizer_events(organizer)
+    if events:
+        await write_tier_batch(f"organizer:{organizer.get('name')}", events)
+
+async def refresh_manual_event(event_id: str):
+    """Tier job: re-fetch one manual_event_uuids entry"""
+    event = await scraper.fetch_event_by_uuid(event_id)
+    if event:
+        await write_tier_batch(f"event:{event_id}", [event])
+
+async def poll_tickets():
+    """Ticket poll job: refresh availability for events about to start"""
+    settings = sync_tiers.ticket_poll
+    poller = TicketPoller(scraper, get_syncer(), local_mirror,
+                          window_hours=settings['window_hours'], grace_hours=settings['grace_hours'])
+    results = await poller.poll()
+    if results["changed_events"]:
+        invalidate_read_cache()
+
+async def run_sync(mode: str = "auto", sources=SYNC_SOURCES):
+    """Entry point used by the sync coordinator"""
+    await update_events(mode, sources)
+    if not server_status["startup_complete"]:
+        server_status["startup_complete"] = True
+        print("✅ Initial sync complete!")
+
+async def close_sync_clients():
+    """Close the scraper's and syncer's HTTP pools (runs on the coordinator's loop at shutdown)"""
+    await scraper.close()
+    if syncer:
+        await syncer.close()
+
+# One sync at a time per server, and across servers via the lock file
+sync_coordinator = SyncCoordinator(run_sync, on_shutdown=close_sync_clients)
+
+# Fixr transfer links: plain HTTP first, then this warm headless browser (launched at
+# startup, lives for the app) for pages the fast paths can't read
+browser_pool = BrowserPool.from_env()
+fixr_extractor = FixrTransferExtractor(browser_pool)
+# fixr_events rows saved recently - other transfer links for the same event don't re-save it
+fixr_saved_events = TTLCache(EVENT_CACHE_TTL_SECONDS)
+
 # Server status tracking
 server_status = {
     "ready": False,
     "startup_complete": False,
     "last_sync": None,
+    "last_sync_mode": None,
     "is_syncing": False
 }
 
@@ -172,9 +450,21 @@ async def health_check():
 
 @app.get("/status")
 async def get_status(db: Session = Depends(get_db)):
-    """Get detailed server status"""
-    event_count = db.query(Event).count()
-    latest_event = db.query(Event).order_by(Event.updated_at.desc()).first()
+    """Get detailed server status
+
+    Sync/queue fields are live; the database counts are cached until the next sync writes.
+    """
+    database = response_cache.get("status:database") if response_cache else None
+    if database is None:
+        generation = response_cache.generation if response_cache else None
+        event_count = db.query(Event).count()
+        latest_event = db.query(Event).order_by(Event.updated_at.desc()).first()
+        database = {
+            "total_events": event_count,
+            "latest_update": latest_event.updated_at.isoformat() if latest_event else None
+        }
+        if response_cache:
+            response_cache.put("status:database", database, generation)
 
     return {
         "server": "running",
@@ -182,52 +472,142 @@ async def get_status(db: Session = Depends(get_db)):
         "startup_complete": server_status["startup_complete"],
         "is_syncing": server_status["is_syncing"],
         "last_sync": server_status["last_sync"],
-        "database": {
-            "total_events": event_count,
-            "latest_update": latest_event.updated_at.isoformat() if latest_event else None
+        "last_sync_mode": server_status["last_sync_mode"],
+        "sync_queue": sync_coordinator.get_status(),
+        "api_rate_limit": scraper.rate_limiter.get_status(),
+        "schedules": {
+            job.id: job.next_run_time.isoformat() if job.next_run_time else None
+            for job in scheduler.get_jobs()
         },
+        "database": database,
+        "response_cache": response_cache.get_stats() if response_cache else None,
+        "browser_pool": browser_pool.get_status(),
+        "fixr_extractor": fixr_extractor.get_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
 @app.get("/events", response_model=List[EventResponse])
 async def get_events(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     city: str = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all events from database"""
-    query = db.query(Event)
+    """Get all events from database, in date order
+
+    Pages with keyset pagination: pass the X-Next-Cursor response header
+    back as cursor to get the next page (the header is absent on the last
+    page). skip still works for older clients but has to walk every
+    skipped row.
+    """
+    query = db.query(Event).options(selectinload(Event.tickets))
 
     if city:
-        query = query.filter(Event.location.contains(city))
+        query = query.filter(Event.city_key == city.strip().lower())
+    if cursor:
+        query = query.filter(after_cursor(cursor))
+
+    query = query.order_by(Event.date, Event.id)
+    if skip and not cursor:
+        query = query.offset(skip)
 
-    events = query.offset(skip).limit(limit).all()
+    events = query.limit(limit).all()
+    if events and len(events) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(events[-1])
     return events
 
 @app.get("/events/{event_id}", response_model=EventResponse)
 async def get_event(event_id: str, db: Session = Depends(get_db)):
     """Get specific event by ID"""
-    event = db.query(Event).filter(Event.event_id == event_id).first()
+    event = db.query(Event).options(selectinload(Event.tickets)).filter(Event.event_id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     return event
 
 @app.post("/refresh")
-async def refresh_events(background_tasks: BackgroundTasks):
-    """Trigger manual event refresh"""
-    background_tasks.add_task(update_events)
-    return {"message": "Event refresh started"}
-
-@app.get("/events/search/{query}")
-async def search_events(query: str, db: Session = Depends(get_db)):
-    """Search events by name or location"""
-    events = db.query(Event).filter(
-        (Event.name.contains(query)) |
-        (Event.location.contains(query)) |
-        (Event.company.contains(query))
-    ).all()
-    return events
+async def refresh_events(mode: str = "auto", source: Optional[str] = None):
+    """Trigger manual event refresh (mode: auto, delta or full; source: catalog, manual or both)
+
+    If a sync is already running, the request is folded into the next run
+    instead of starting another one.
+    """
+    if mode not in SYNC_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of {', '.join(SYNC_MODES)}")
+    if source is not None and source not in SYNC_SOURCES:
+        raise HTTPException(status_code=400, detail=f"source must be one of {', '.join(SYNC_SOURCES)}")
+
+    sources = [source] if source else list(SYNC_SOURCES)
+    result = sync_coordinator.trigger(mode, sources, reason="api")
+    message = "Event refresh queued behind the running sync" if result["running"] else "Event refresh started"
+    return {"message": message, "mode": mode, "sources": sources, **result}
+
+@app.get("/events/search/{query}", response_model=List[EventResponse])
+async def search_events(query: str, skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+    """Search events by name, organizer or venue, best matches first
+
+    Every word in the query matches as a prefix ("ng one" and "NG-ONE"
+    both find "NG-ONE"), accents are ignored and results are ranked with
+    BM25 from the events_fts index. Page with skip/limit.
+    """
+    if not models.FTS_AVAILABLE:
+        return db.query(Event).options(selectinload(Event.tickets)).filter(
+            (Event.name.contains(query)) |
+            (Event.location.contains(query)) |
+            (Event.company.contains(query))
+        ).order_by(Event.date, Event.id).offset(skip).limit(limit).all()
+
+    match = fts_query(query)
+    if not match:
+        return []
+
+    ranked_ids = [row.rowid for row in db.execute(
+        text("SELECT rowid FROM events_fts WHERE events_fts MATCH :match "
+             "ORDER BY bm25(events_fts, :w_name, :w_location, :w_company) LIMIT :limit OFFSET :skip"),
+        dict(zip(("w_name", "w_location", "w_company"), FTS_WEIGHTS), match=match, limit=limit, skip=skip),
+    )]
+    events = {
+        event.id: event
+        for event in db.query(Event).options(selectinload(Event.tickets)).filter(Event.id.in_(ranked_ids)).all()
+    }
+    return [events[event_id] for event_id in ranked_ids if event_id in events]
+
+async def save_fixr_event(event_data: dict):
+    """Upsert an extracted transfer link's event into fixr_events (once per event per EVENT_CACHE_TTL_SECONDS)"""
+    # Generate event_id from URL
+    event_id = event_data['url'].replace('https://', '').replace('http://', '').replace('/', '-')
+    # Concurrent requests for the same event share one upsert
+    await fixr_saved_events.get_or_create(event_id, lambda: upsert_fixr_event(event_id, event_data))
+
+async def upsert_fixr_event(event_id: str, event_data: dict) -> bool:
+    # Prepare event for database
+    db_event = {
+        'event_id': event_id,
+        'name': event_data['name'],
+        'date': event_data['date'],
+        'location': event_data['location'],
+        'venue': event_data['venue'],
+        'address': event_data.get('address', ''),
+        'postcode': event_data.get('postcode', ''),
+        'description': event_data.get('description', ''),
+        'image_url': event_data.get('imageUrl', ''),
+        'url': event_data['url'],
+        'company': event_data.get('company', ''),
+        'last_entry': event_data.get('lastEntry', ''),
+        'last_entry_type': event_data.get('lastEntryType'),
+        'last_entry_label': event_data.get('lastEntryLabel'),
+        'source': 'fixr',
+        'tickets': event_data.get('tickets', [])
+    }
+
+    # Upsert to database (insert or update if exists)
+    fixr_syncer = get_syncer()
+    if fixr_syncer is None:
+        raise RuntimeError("Supabase unavailable")
+    await asyncio.to_thread(fixr_syncer.client.table('fixr_events').upsert(db_event, on_conflict='event_id').execute)
+    print(f"✅ Saved Fixr transfer event to database: {event_data['name']}")
+    return True
 
 @app.post("/fixr/extract-transfer")
 async def extract_fixr_transfer(transfer_url: str):
@@ -237,41 +617,14 @@ async def extract_fixr_transfer(transfer_url: str):
     Example: POST /fixr/extract-transfer?transfer_url=https://fixr.co/transfer-ticket/2156d6630b191850eb92a326
     """
     try:
-        extractor = FixrTransferExtractor()
-        event_data = await extractor.extract_from_transfer_link(transfer_url)
+        event_data = await fixr_extractor.extract_from_transfer_link(transfer_url)
 
         if not event_data:
             raise HTTPException(status_code=404, detail="Could not extract event data from transfer link")
 
         # Save event to fixr_events table as trusted source
         try:
-            # Generate event_id from URL
-            event_id = event_data['url'].replace('https://', '').replace('http://', '').replace('/', '-')
-
-            # Prepare event for database
-            db_event = {
-                'event_id': event_id,
-                'name': event_data['name'],
-                'date': event_data['date'],
-                'location': event_data['location'],
-                'venue': event_data['venue'],
-                'address': event_data.get('address', ''),
-                'postcode': event_data.get('postcode', ''),
-                'description': event_data.get('description', ''),
-                'image_url': event_data.get('imageUrl', ''),
-                'url': event_data['url'],
-                'company': event_data.get('company', ''),
-                'last_entry': event_data.get('lastEntry', ''),
-                'last_entry_type': event_data.get('lastEntryType'),
-                'last_entry_label': event_data.get('lastEntryLabel'),
-                'source': 'fixr',
-                'tickets': event_data.get('tickets', [])
-            }
-
-            # Upsert to database (insert or update if exists)
-            supabase.table('fixr_events').upsert(db_event, on_conflict='event_id').execute()
-            print(f"✅ Saved Fixr transfer event to database: {event_data['name']}")
-
+            await save_fixr_event(event_data)
         except Exception as db_error:
             print(f"⚠️  Warning: Could not save to database: {db_error}")
             # Continue anyway - we still have the event data to return
@@ -280,37 +633,69 @@ async def extract_fixr_transfer(transfer_url: str):
             "success": True,
             "event": event_data
         }
+    except HTTPException:
+        raise
+    except BrowserPoolTimeout:
+        raise HTTPException(status_code=503, detail="Too many transfer links being read right now, try again shortly")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error extracting transfer link: {str(e)}")
 
-# Scheduler for automatic updates
+# Scheduler for automatic updates - it only queues jobs, the coordinator runs them
+# one at a time (most urgent tier first)
 scheduler = BackgroundScheduler()
-scheduler.add_job(lambda: asyncio.run(update_events()), 'interval', hours=6)  # Update every 6 hours
+
+def schedule_tier_job(job_id: str, tier: dict, enqueue, **kwargs):
+    """Every tier interval (plus jitter), call enqueue(**kwargs) with the tier's priority"""
+    scheduler.add_job(
+        enqueue, 'interval', minutes=tier['interval_minutes'], jitter=SYNC_JITTER_SECONDS,
+        kwargs=dict(kwargs, priority=tier['priority'], reason=f"schedule ({tier['name']})"), id=job_id
+    )
+
+schedule_tier_job("sync_catalog", sync_tiers.for_source("catalog"), sync_coordinator.trigger, sources=["catalog"])
+schedule_tier_job("tickets:poll", dict(sync_tiers.ticket_poll, name="ticket_poll"), sync_coordinator.submit,
+                  key="tickets:poll", func=poll_tickets)
+
+for city in SYNC_LOCATIONS:
+    schedule_tier_job(f"city:{city}", sync_tiers.for_city(city), sync_coordinator.submit,
+                      key=f"city:{city}", func=partial(refresh_city, city))
+
+manual_config = scraper.load_manual_config()
+for organizer in manual_config.get('organizers', []):
+    organizer_key = organizer.get('vanity_url') or organizer.get('page_id') or organizer.get('name')
+    schedule_tier_job(f"organizer:{organizer_key}", sync_tiers.for_organizer(organizer), sync_coordinator.submit,
+                      key=f"organizer:{organizer_key}", func=partial(refresh_organizer, organizer))
+
+for manual_event in manual_config.get('manual_event_uuids', []):
+    event_id = manual_event.get('event_id')
+    if event_id:
+        schedule_tier_job(f"event:{event_id}", sync_tiers.for_manual_event(event_id), sync_coordinator.submit,
+                          key=f"event:{event_id}", func=partial(refresh_manual_event, event_id))
 
 @app.on_event("startup")
 async def startup_event():
     """Start scheduler and initial scrape"""
     print("🚀 Server starting up...")
+    sync_coordinator.start()
     scheduler.start()
     print("📅 Scheduler started")
     # Mark server as ready immediately - sync will happen in background
     server_status["ready"] = True
     print("✅ Server is ready to accept requests!")
     print("🔄 Running initial event sync in background...")
-    # Run initial scrape in background
-    import threading
-    def run_initial_sync():
-        import asyncio
-        asyncio.run(update_events())
-        server_status["startup_complete"] = True
-        print("✅ Initial sync complete!")
-
-    thread = threading.Thread(target=run_initial_sync, daemon=True)
-    thread.start()
+    sync_coordinator.trigger(reason="startup")
+    try:
+        await browser_pool.start()
+        print("🌐 Browser pool ready")
+    except Exception as e:
+        # Not fatal - the pool retries the launch on the first transfer link
+        print(f"⚠️  Could not launch browser for Fixr transfer links: {e}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     scheduler.shutdown()
+    sync_coordinator.stop(timeout=5)
+    await fixr_extractor.close()
+    await browser_pool.close()
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,9 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, DateTime, Float, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import relationship, sessionmaker
 from datetime import datetime
+import re
 
 Base = declarative_base()
 
@@ -13,11 +15,12 @@ class Event(Base):
     name = Column(String, nullable=False)
     company = Column(String)
     company_logo_url = Column(String)
-    date = Column(DateTime)
+    date = Column(DateTime, index=True)
     time = Column(String)
     last_entry = Column(String)
     location = Column(String)
     city = Column(String)
+    city_key = Column(String)  # lower-cased city, what /events?city= filters on
     age_restriction = Column(String)
     url = Column(String)
     image_url = Column(String)
@@ -26,11 +29,14 @@ class Event(Base):
 
     tickets = relationship("Ticket", back_populates="event", cascade="all, delete-orphan")
 
+    # City feed: filter on city_key, walk in date order (id is the rowid, so it rides along)
+    __table_args__ = (Index('ix_events_city_key_date', 'city_key', 'date'),)
+
 class Ticket(Base):
     __tablename__ = 'tickets'
 
     id = Column(Integer, primary_key=True)
-    event_id = Column(Integer, ForeignKey('events.id'))
+    event_id = Column(Integer, ForeignKey('events.id'), index=True)
     ticket_type = Column(String, nullable=False)
     price = Column(Float)
     currency = Column(String, default="GBP")
@@ -41,4 +47,64 @@ class Ticket(Base):
 # Database setup
 engine = create_engine('sqlite:///fatsoma_events.db')
 Base.metadata.create_all(engine)
+
+# Full-text index over events for /events/search. External content (rows live in
+# events), kept in step by triggers so every write path updates it. unicode61 with
+# remove_diacritics folds "Café" to "cafe" and splits "NG-ONE" into "ng" + "one";
+# the prefix indexes make 2-3 letter prefix queries cheap while typing.
+FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+        name, location, company,
+        content='events', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN
+        INSERT INTO events_fts(rowid, name, location, company) VALUES (new.id, new.name, new.location, new.company);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, name, location, company) VALUES ('delete', old.id, old.name, old.location, old.company);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS events_fts_update AFTER UPDATE OF name, location, company ON events BEGIN
+        INSERT INTO events_fts(events_fts, rowid, name, location, company) VALUES ('delete', old.id, old.name, old.location, old.company);
+        INSERT INTO events_fts(rowid, name, location, company) VALUES (new.id, new.name, new.location, new.company);
+    END""",
+]
+
+# bm25() column weights: a hit in the event name counts most, then organizer, then venue
+FTS_WEIGHTS = (10.0, 3.0, 5.0)
+
+# False when this SQLite build has no FTS5 - search falls back to LIKE
+FTS_AVAILABLE = False
+
+def fts_query(query: str) -> str:
+    """Turn user input into an FTS5 MATCH expression: every word, as a prefix (empty if no words)"""
+    return ' '.join(f'"{word}"*' for word in re.findall(r'\w+', query))
+
+def _migrate():
+    """Add read-model columns/indexes to databases created before they existed"""
+    columns = {column['name'] for column in inspect(engine).get_columns('events')}
+    if 'city_key' not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE events ADD COLUMN city_key VARCHAR"))
+            conn.execute(text("UPDATE events SET city_key = lower(trim(city))"))
+
+    # create_all only creates indexes along with new tables
+    for table in (Event.__table__, Ticket.__table__):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+    global FTS_AVAILABLE
+    try:
+        with engine.begin() as conn:
+            exists = conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'events_fts'")).first()
+            for statement in FTS_SCHEMA:
+                conn.execute(text(statement))
+            if not exists:
+                # Index the events that were there before the search index
+                conn.execute(text("INSERT INTO events_fts(events_fts) VALUES ('rebuild')"))
+        FTS_AVAILABLE = True
+    except OperationalError as e:
+        print(f"⚠️  SQLite FTS5 unavailable, search will use LIKE: {e}")
+
+_migrate()
 SessionLocal = sessionmaker(bind=engine)
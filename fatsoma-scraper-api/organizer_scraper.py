@@ -2,10 +2,8 @@
 Web scraper for Fatsoma organizer event pages
 Scrapes https://www.fatsoma.com/p/{vanity_url}/events to find all events
 """
-import aiohttp
 import asyncio
-import re
-from bs4 import BeautifulSoup
+from html_parsing import find_links, find_uuids, make_soup, strainer
 from typing import List, Dict, Optional
 from api_scraper import FatsomaAPIScraper
 
@@ -33,46 +31,39 @@ class OrganizerEventScraper:
         events_page_url = f"{self.base_url}/p/{vanity_url}/events"
         print(f"🔍 Scraping organizer events: {events_page_url}")
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(events_page_url, headers=self.headers) as response:
-                    if response.status != 200:
-                        print(f"❌ Failed to fetch organizer page: HTTP {response.status}")
-                        return []
-
-                    html = await response.text()
-                    soup = BeautifulSoup(html, 'html.parser')
-
-                    # Find all event links on the page
-                    event_links = []
-                    for link in soup.find_all('a', href=True):
-                        href = link['href']
-                        # Match event URLs: /e/{short_id}/{slug}
-                        if href.startswith('/e/'):
-                            event_url = f"{self.base_url}{href}"
-                            if event_url not in [e['url'] for e in event_links]:
-                                event_links.append({'url': event_url})
-
-                    print(f"   Found {len(event_links)} event links")
-
-                    # Get UUID for each event
-                    event_data = []
-                    for event in event_links:
-                        uuid = await self._extract_event_uuid(event['url'], session)
-                        if uuid:
-                            event_data.append({
-                                'event_url': event['url'],
-                                'event_uuid': uuid
-                            })
-                            print(f"   ✅ {event['url']} -> {uuid}")
-                        else:
-                            print(f"   ⚠️  Could not extract UUID from {event['url']}")
-
-                    return event_data
-
-            except Exception as e:
-                print(f"❌ Error scraping organizer page: {e}")
-                return []
+        session = await self.api_scraper.get_session()
+        try:
+            async with session.get(events_page_url, headers=self.headers) as response:
+                if response.status != 200:
+                    print(f"❌ Failed to fetch organizer page: HTTP {response.status}")
+                    return []
+
+                html = await response.text()
+
+                # Find all event links on the page
+                # Match event URLs: /e/{short_id}/{slug}
+                event_links = [{'url': f"{self.base_url}{href}"} for href in find_links(html, r'^/e/')]
+
+                print(f"   Found {len(event_links)} event links")
+
+                # Get UUID for each event
+                event_data = []
+                for event in event_links:
+                    uuid = await self._extract_event_uuid(event['url'], session)
+                    if uuid:
+                        event_data.append({
+                            'event_url': event['url'],
+                            'event_uuid': uuid
+                        })
+                        print(f"   ✅ {event['url']} -> {uuid}")
+                    else:
+                        print(f"   ⚠️  Could not extract UUID from {event['url']}")
+
+                return event_data
+
+        except Exception as e:
+            print(f"❌ Error scraping organizer page: {e}")
+            return []
 
     async def _extract_event_uuid(self, event_url: str, session) -> Optional[str]:
         """
@@ -90,29 +81,22 @@ class OrganizerEventScraper:
 
                 html = await response.text()
 
-                # Method 1: Look for UUID in meta tags
-                soup = BeautifulSoup(html, 'html.parser')
+                # Method 1: Look for UUID in meta tags (only the <meta> tags are parsed)
+                meta_soup = make_soup(html, parse_only=strainer('meta', property=True))
 
                 # Check meta property tags
-                for meta in soup.find_all('meta', property=True):
-                    content = meta.get('content', '')
+                for meta in meta_soup.find_all('meta'):
                     # UUID pattern: 8-4-4-4-12 hex characters
-                    uuid_match = re.search(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', content)
-                    if uuid_match:
-                        return uuid_match.group(1)
+                    uuids = find_uuids(meta.get('content', ''))
+                    if uuids:
+                        return uuids[0]
 
                 # Method 2: Look for UUID in JavaScript/JSON data
                 # Pattern: Look for API calls or data attributes with UUID
-                uuid_match = re.search(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', html)
-                if uuid_match:
-                    return uuid_match.group(1)
-
-                # Method 3: Look in data attributes
-                for elem in soup.find_all(attrs={'data-event-id': True}):
-                    event_id = elem.get('data-event-id', '')
-                    uuid_match = re.search(r'([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})', event_id)
-                    if uuid_match:
-                        return uuid_match.group(1)
+                # (this also covers data-event-id attributes, which are part of the HTML)
+                uuids = find_uuids(html)
+                if uuids:
+                    return uuids[0]
 
                 return None
 
@@ -141,15 +125,15 @@ class OrganizerEventScraper:
         print(f"\n📥 Fetching full event details for {len(event_uuids)} events...")
         all_events = []
 
-        async with aiohttp.ClientSession() as session:
-            for event_data in event_uuids:
-                uuid = event_data['event_uuid']
-                event = await self.api_scraper.fetch_event_by_uuid(uuid, session)
-                if event:
-                    all_events.append(event)
-                    print(f"   ✅ {event['name']}: {len(event.get('tickets', []))} ticket types")
-                else:
-                    print(f"   ❌ Failed to fetch event {uuid}")
+        session = await self.api_scraper.get_session()
+        for event_data in event_uuids:
+            uuid = event_data['event_uuid']
+            event = await self.api_scraper.fetch_event_by_uuid(uuid, session)
+            if event:
+                all_events.append(event)
+                print(f"   ✅ {event['name']}: {len(event.get('tickets', []))} ticket types")
+            else:
+                print(f"   ❌ Failed to fetch event {uuid}")
 
         return all_events
 
@@ -165,6 +149,7 @@ async def test_organizer_scraper():
     print(f"{'='*80}\n")
 
     events = await scraper.get_all_organizer_events(vanity_url)
+    await scraper.api_scraper.close()
 
     print(f"\n{'='*80}")
     print(f"✅ Found {len(events)} events for {vanity_url}")
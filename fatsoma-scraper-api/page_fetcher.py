@@ -0,0 +1,230 @@
+"""
+Concurrent page fetcher for paginated Fatsoma API feeds
+Issues page[number] requests in parallel under a semaphore and a per-host rate limit
+"""
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from http_cache import HTTPCache, cached_get_json
+
+
+class HostRateLimiter:
+    """
+    Spaces out request starts per host so we never exceed N requests/second
+
+    The rate adapts per host (additive increase, multiplicative decrease):
+    a 429 from a host halves its rate, down to min_requests_per_second, and
+    every successful response adds recovery_step requests/second back until
+    it's at requests_per_second again.
+    """
+
+    def __init__(self, requests_per_second: float = 10.0, min_requests_per_second: Optional[float] = None,
+                 recovery_step: Optional[float] = None):
+        self.requests_per_second = requests_per_second
+        self.min_requests_per_second = min_requests_per_second or (requests_per_second or 0) / 16
+        self.recovery_step = recovery_step or (requests_per_second or 0) / 20
+        self._rates: Dict[str, float] = {}
+        self._next_slot: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {"rate_limited": 0}
+
+    def current_rate(self, url: str) -> float:
+        """Requests/second currently allowed for the host of this URL"""
+        return self._rates.get(urlparse(url).netloc, self.requests_per_second)
+
+    async def acquire(self, url: str):
+        """Wait until the host for this URL has a free request slot"""
+        if not self.requests_per_second or self.requests_per_second <= 0:
+            return
+
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        interval = 1.0 / self._rates.get(host, self.requests_per_second)
+
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_rate_limited(self, url: str):
+        """The host answered 429: halve its rate"""
+        if not self.requests_per_second or self.requests_per_second <= 0:
+            return
+
+        host = urlparse(url).netloc
+        rate = self._rates.get(host, self.requests_per_second)
+        self._rates[host] = max(self.min_requests_per_second, rate / 2)
+        self.stats["rate_limited"] += 1
+
+    def on_success(self, url: str):
+        """The host answered normally: creep its rate back up towards the configured one"""
+        host = urlparse(url).netloc
+        rate = self._rates.get(host)
+        if rate is None:
+            return
+
+        rate += self.recovery_step
+        if rate >= self.requests_per_second:
+            del self._rates[host]
+        else:
+            self._rates[host] = rate
+
+    def get_status(self) -> Dict:
+        return dict(
+            self.stats,
+            requests_per_second=self.requests_per_second,
+            throttled_hosts={host: round(rate, 3) for host, rate in self._rates.items()},
+        )
+
+
+class ConcurrentPageFetcher:
+    """
+    Fetch a JSON:API paginated feed with bounded parallelism
+
+    Pages are requested ahead of time in a sliding window of `concurrency`
+    pages. Rate limits (429), server errors and network errors are retried
+    up to `retries` times with exponential backoff. As soon as a page comes
+    back empty, still fails after its retries, or has no `links.next`, no
+    further pages are scheduled and in-flight requests for later pages are
+    cancelled.
+    """
+
+    def __init__(self, session, headers: Dict, concurrency: int = 4,
+                 rate_limiter: Optional[HostRateLimiter] = None, max_pages: int = 50,
+                 cache: Optional[HTTPCache] = None, retries: int = 3, retry_backoff: float = 0.5):
+        self.session = session
+        self.headers = headers
+        self.concurrency = max(1, concurrency)
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.rate_limiter = rate_limiter or HostRateLimiter()
+        self.max_pages = max_pages
+        self.cache = cache
+        self.retries = max(1, retries)
+        self.retry_backoff = retry_backoff
+        # True once iter_pages has seen the real end of the feed (not max_pages or an error)
+        self.reached_end = False
+        # True if iter_pages stopped at max_pages with every page up to it fetched
+        self.hit_max_pages = False
+
+    async def fetch_json(self, url: str) -> Optional[Dict]:
+        """GET a URL under the semaphore and rate limit, returning parsed JSON or None
+
+        Conditional requests go through the HTTP cache when one is configured.
+        429s, 5xx responses and network errors are retried with backoff (the
+        semaphore is released while waiting); None means every attempt failed
+        or the response was another error.
+        """
+        for attempt in range(self.retries):
+            async with self.semaphore:
+                await self.rate_limiter.acquire(url)
+                try:
+                    status, data = await cached_get_json(self.session, url, self.headers, self.cache)
+                    if status == 200:
+                        self.rate_limiter.on_success(url)
+                        return data
+
+                    print(f"Error: API returned status {status} for {url} (attempt {attempt + 1}/{self.retries})")
+                    if status == 429:
+                        self.rate_limiter.on_rate_limited(url)
+                    elif status < 500:
+                        # Other client errors won't go away on retry
+                        return None
+                except Exception as e:
+                    print(f"Error fetching {url} (attempt {attempt + 1}/{self.retries}): {e}")
+
+            if attempt < self.retries - 1:
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+        return None
+
+    async def iter_pages(self, url_template: str, ordered: bool = True) -> AsyncIterator[Tuple[int, Dict]]:
+        """
+        Stream (page_number, data) tuples for a paginated feed
+
+        Args:
+            url_template: URL containing a `{page}` placeholder for page[number]
+            ordered: If True, pages are yielded in page order; otherwise as they arrive
+        """
+        next_page = 1
+        last_page = self.max_pages  # Lowered once we learn where the feed ends
+        end_page = None             # Page where the feed really ends (empty or no next link)
+        errored_page = None
+        next_to_yield = 1
+        buffered: Dict[int, Dict] = {}
+        in_flight: Dict[asyncio.Task, int] = {}
+
+        def schedule():
+            nonlocal next_page
+            while len(in_flight) < self.concurrency and next_page <= last_page:
+                url = url_template.format(page=next_page)
+                print(f"Fetching page {next_page} from: {url}")
+                task = asyncio.ensure_future(self.fetch_json(url))
+                in_flight[task] = next_page
+                next_page += 1
+
+        try:
+            schedule()
+
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight.keys(), return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    page = in_flight.pop(task)
+                    data = task.result()
+
+                    # Error or empty page: the feed ends before this page
+                    if not data or not data.get('data'):
+                        if data is None:
+                            errored_page = min(errored_page or page, page)
+                        else:
+                            end_page = min(end_page or page, page - 1)
+                            if page <= last_page:
+                                print(f"No more events found on page {page}")
+                        last_page = min(last_page, page - 1)
+                        continue
+
+                    # No next link: this is the last page
+                    if not data.get('links', {}).get('next'):
+                        if page <= last_page:
+                            print(f"Reached last page ({page})")
+                        end_page = min(end_page or page, page)
+                        last_page = min(last_page, page)
+
+                    if page > last_page:
+                        continue
+
+                    buffered[page] = data
+
+                # Cancel speculative requests beyond the end of the feed
+                for task, page in list(in_flight.items()):
+                    if page > last_page:
+                        task.cancel()
+                        in_flight.pop(task)
+
+                if ordered:
+                    while next_to_yield in buffered:
+                        yield next_to_yield, buffered.pop(next_to_yield)
+                        next_to_yield += 1
+                else:
+                    for page in sorted(buffered):
+                        yield page, buffered.pop(page)
+
+                schedule()
+
+            # Flush anything left behind a gap (e.g. an errored middle page)
+            for page in sorted(buffered):
+                if page <= last_page:
+                    yield page, buffered.pop(page)
+
+            self.reached_end = end_page is not None and (errored_page is None or errored_page > end_page)
+            self.hit_max_pages = end_page is None and errored_page is None
+
+        finally:
+            for task in in_flight:
+                task.cancel()
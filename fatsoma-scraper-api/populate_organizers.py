@@ -29,18 +29,24 @@ LOCATIONS = [
     "reading"
 ]
 
-async def populate_organizers_from_location(location: str, limit: int = 50):
-    """Fetch events from a specific location and sync to database"""
+async def populate_organizers_from_location(location: str, limit: int = 50, scraper: FatsomaAPIScraper = None):
+    """Fetch events from a specific location and sync to database
+
+    Pass a shared scraper so all locations reuse one catalog crawl.
+    """
     print(f"\n{'='*60}")
     print(f"📍 Fetching events from {location.upper()}")
     print(f"{'='*60}")
 
-    scraper = FatsomaAPIScraper()
-    events = await scraper.scrape_events(location=location, limit=limit)
+    if scraper is None:
+        async with FatsomaAPIScraper() as scraper:
+            events = await scraper.scrape_events(location=location, limit=limit)
+    else:
+        events = await scraper.scrape_events(location=location, limit=limit)
 
     if not events:
         print(f"⚠️  No events found for {location}")
-        return {"success": 0, "created": 0, "updated": 0, "errors": 0}
+        return {"success": 0, "created": 0, "updated": 0, "unchanged": 0, "errors": 0}
 
     print(f"📦 Scraped {len(events)} events from {location}")
 
@@ -51,6 +57,7 @@ async def populate_organizers_from_location(location: str, limit: int = 50):
     print(f"   Success: {results['success']}")
     print(f"   Created: {results['created']}")
     print(f"   Updated: {results['updated']}")
+    print(f"   Unchanged: {results['unchanged']}")
     print(f"   Errors: {results['errors']}")
 
     return results
@@ -64,25 +71,33 @@ async def populate_all_organizers(events_per_location: int = 50):
         "success": 0,
         "created": 0,
         "updated": 0,
+        "unchanged": 0,
         "errors": 0
     }
 
-    for location in LOCATIONS:
-        try:
-            results = await populate_organizers_from_location(location, events_per_location)
+    # One scraper = one catalog crawl shared by every location
+    scraper = FatsomaAPIScraper()
+    try:
 
-            # Aggregate results
-            total_results["success"] += results["success"]
-            total_results["created"] += results["created"]
-            total_results["updated"] += results["updated"]
-            total_results["errors"] += results["errors"]
+        for location in LOCATIONS:
+            try:
+                results = await populate_organizers_from_location(location, events_per_location, scraper)
 
-            # Small delay to avoid rate limiting
-            await asyncio.sleep(1)
+                # Aggregate results
+                total_results["success"] += results["success"]
+                total_results["created"] += results["created"]
+                total_results["updated"] += results["updated"]
+                total_results["unchanged"] += results["unchanged"]
+                total_results["errors"] += results["errors"]
 
-        except Exception as e:
-            print(f"❌ Error processing {location}: {e}")
-            continue
+                # Small delay to avoid rate limiting
+                await asyncio.sleep(1)
+
+            except Exception as e:
+                print(f"❌ Error processing {location}: {e}")
+                continue
+    finally:
+        await scraper.close()
 
     # Show final statistics
     print(f"\n{'='*60}")
@@ -91,6 +106,7 @@ async def populate_all_organizers(events_per_location: int = 50):
     print(f"✅ Total Events Synced: {total_results['success']}")
     print(f"📝 New Events Created: {total_results['created']}")
     print(f"🔄 Events Updated: {total_results['updated']}")
+    print(f"⏭️  Events Unchanged: {total_results['unchanged']}")
     print(f"❌ Errors: {total_results['errors']}")
 
     # Check organizer statistics
@@ -112,23 +128,30 @@ async def populate_specific_locations(locations: list, events_per_location: int
         "success": 0,
         "created": 0,
         "updated": 0,
+        "unchanged": 0,
         "errors": 0
     }
 
-    for location in locations:
-        try:
-            results = await populate_organizers_from_location(location, events_per_location)
+    scraper = FatsomaAPIScraper()
+    try:
+
+        for location in locations:
+            try:
+                results = await populate_organizers_from_location(location, events_per_location, scraper)
 
-            total_results["success"] += results["success"]
-            total_results["created"] += results["created"]
-            total_results["updated"] += results["updated"]
-            total_results["errors"] += results["errors"]
+                total_results["success"] += results["success"]
+                total_results["created"] += results["created"]
+                total_results["updated"] += results["updated"]
+                total_results["unchanged"] += results["unchanged"]
+                total_results["errors"] += results["errors"]
 
-            await asyncio.sleep(1)
+                await asyncio.sleep(1)
 
-        except Exception as e:
-            print(f"❌ Error processing {location}: {e}")
-            continue
+            except Exception as e:
+                print(f"❌ Error processing {location}: {e}")
+                continue
+    finally:
+        await scraper.close()
 
     print(f"\n✅ Completed! Total events synced: {total_results['success']}")
 
@@ -0,0 +1,34 @@
+-- Recompute organizers.event_count from fatsoma_events
+-- Called once at the end of each SupabaseSyncer.sync_events() run instead of
+-- incrementing event_count per synced event (which inflated on every resync)
+-- Run this in Supabase SQL Editor: https://supabase.com/dashboard/project/YOUR_PROJECT/sql/new
+
+CREATE OR REPLACE FUNCTION refresh_organizer_event_counts(organizer_ids UUID[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    updated_count INTEGER;
+BEGIN
+    WITH counts AS (
+        SELECT o.id, COUNT(e.id)::INTEGER AS event_count
+        FROM organizers o
+        LEFT JOIN fatsoma_events e ON e.organizer_id = o.id
+        WHERE organizer_ids IS NULL OR o.id = ANY(organizer_ids)
+        GROUP BY o.id
+    )
+    UPDATE organizers o
+    SET event_count = counts.event_count
+    FROM counts
+    WHERE o.id = counts.id
+    AND o.event_count IS DISTINCT FROM counts.event_count;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RETURN updated_count;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Only the backend (service role) should call this
+REVOKE EXECUTE ON FUNCTION refresh_organizer_event_counts(UUID[]) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_organizer_event_counts(UUID[]) TO service_role;
+
+-- One-off: fix counts that drifted under the old per-event increment
+SELECT refresh_organizer_event_counts();
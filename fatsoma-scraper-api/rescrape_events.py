@@ -8,17 +8,16 @@ from supabase_syncer import SupabaseSyncer
 async def rescrape_events():
     print("🚀 Re-scraping Fatsoma events to populate last_entry timestamps...")
 
-    scraper = FatsomaAPIScraper()
-
     # Scrape events from multiple cities
     cities = ["nottingham", "london"]
     all_events = []
 
-    for city in cities:
-        print(f"\n📍 Scraping {city}...")
-        events = await scraper.scrape_events(location=city, limit=50)
-        print(f"✅ Scraped {len(events)} events from {city}")
-        all_events.extend(events)
+    async with FatsomaAPIScraper() as scraper:
+        for city in cities:
+            print(f"\n📍 Scraping {city}...")
+            events = await scraper.scrape_events(location=city, limit=50)
+            print(f"✅ Scraped {len(events)} events from {city}")
+            all_events.extend(events)
 
     print(f"\n📦 Total events scraped: {len(all_events)}")
 
@@ -32,6 +31,7 @@ async def rescrape_events():
     print(f"   ✅ Success: {results['success']}")
     print(f"   🆕 Created: {results['created']}")
     print(f"   🔄 Updated: {results['updated']}")
+    print(f"   ⏭️  Unchanged: {results['unchanged']}")
     print(f"   ❌ Errors: {results['errors']}")
     print(f"{'='*60}")
 
@@ -0,0 +1,152 @@
+"""
+In-process cache for read API responses
+Serialized responses are kept in an LRU and invalidated all at once when a sync writes new data
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+class ResponseCache:
+    """
+    LRU of serialized responses, invalidated by a generation counter
+
+    Every entry remembers the generation it was built in; bump() (called
+    whenever a sync has written to the local database) moves to a new
+    generation, so older entries are never served again and age out of the
+    LRU. Safe to use from the event loop and the sync worker thread.
+
+    Other server processes share the database but not this memory: bump()
+    also writes a fresh token to generation_path, and every process moves
+    to a new generation when it sees the token change. The file is read at
+    most once every shared_check_seconds rather than on every lookup, so
+    another process's sync can be served stale for up to that long. Entries
+    also expire after ttl_seconds as a backstop.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0,
+                 generation_path: Optional[str] = None, shared_check_seconds: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.generation_path = Path(generation_path) if generation_path else None
+        self.shared_check_seconds = shared_check_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._shared_token = self._read_shared_token()
+        self._next_shared_check = time.monotonic() + shared_check_seconds
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """Build a cache from RESPONSE_CACHE* env vars (None if disabled)"""
+        if os.getenv('RESPONSE_CACHE', 'true').lower() != 'true':
+            return None
+
+        try:
+            return cls(
+                max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024')),
+                ttl_seconds=float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '300')),
+                generation_path=os.getenv('RESPONSE_CACHE_GENERATION_PATH')
+                or Path(__file__).parent / "response_cache.generation",
+                shared_check_seconds=float(os.getenv('RESPONSE_CACHE_SHARED_CHECK_SECONDS', '1')),
+            )
+        except Exception as e:
+            print(f"⚠️  Response cache disabled: {e}")
+            return None
+
+    def _read_shared_token(self) -> Optional[str]:
+        if self.generation_path is None:
+            return None
+        try:
+            return self.generation_path.read_text()
+        except OSError:
+            return None
+
+    def _follow_shared_generation(self):
+        """Start a new generation if another process bumped the shared token (call with _lock held)"""
+        now = time.monotonic()
+        if self.generation_path is None or now < self._next_shared_check:
+            return
+        self._next_shared_check = now + self.shared_check_seconds
+
+        token = self._read_shared_token()
+        if token != self._shared_token:
+            self._shared_token = token
+            self.generation += 1
+            self._entries.clear()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key from the current generation, or None"""
+        with self._lock:
+            self._follow_shared_generation()
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != self.generation or time.monotonic() >= entry[1]:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: str, value: Any, generation: int):
+        """
+        Store a value built while generation was current
+
+        Pass the generation read *before* building the value: if a sync
+        bumped it in the meantime, the value may already be stale and
+        isn't stored.
+        """
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (generation, time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def bump(self):
+        """Invalidate everything cached so far, in this process and the others (new data was written)"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+            if self.generation_path is not None:
+                token = f"{os.getpid()}-{time.time_ns()}"
+                try:
+                    tmp_path = self.generation_path.with_name(self.generation_path.name + f".{os.getpid()}.tmp")
+                    tmp_path.write_text(token)
+                    os.replace(tmp_path, self.generation_path)
+                    self._shared_token = token
+                except OSError as e:
+                    print(f"⚠️  Could not publish response cache generation: {e}")
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        return f'"{hashlib.sha1(body).hexdigest()}"'
+
+    @staticmethod
+    def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+        """Whether an If-None-Match header covers etag (weak comparison)"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        candidates = (tag.strip() for tag in if_none_match.split(','))
+        return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "generation": self.generation,
+                "entries": len(self._entries),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else None,
+            }
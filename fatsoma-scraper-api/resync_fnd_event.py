@@ -3,20 +3,17 @@ Re-sync FUNCTION NEXT DOOR event to update tickets with display_order
 Run this AFTER adding the display_order column to Supabase
 """
 import asyncio
-import aiohttp
 from api_scraper import FatsomaAPIScraper
 from supabase_syncer import SupabaseSyncer
 
 async def resync_fnd():
-    scraper = FatsomaAPIScraper()
-
     print("🔄 Fetching FUNCTION NEXT DOOR event from Fatsoma API...")
 
     # Fetch the specific event UUID
     event_id = "eccc2aaa-21cb-4f09-9114-a0681f4e87ff"
 
-    async with aiohttp.ClientSession() as session:
-        event = await scraper.fetch_event_by_uuid(event_id, session)
+    async with FatsomaAPIScraper() as scraper:
+        event = await scraper.fetch_event_by_uuid(event_id)
 
         if not event:
             print("❌ Failed to fetch event")
@@ -37,6 +34,7 @@ async def resync_fnd():
         print(f"   Success: {results['success']}")
         print(f"   Created: {results['created']}")
         print(f"   Updated: {results['updated']}")
+        print(f"   Unchanged: {results['unchanged']}")
         print(f"   Errors: {results['errors']}")
 
         if results['errors'] == 0:
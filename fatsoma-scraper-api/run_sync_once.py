@@ -10,8 +10,8 @@ async def main():
     print("🚀 Starting Fatsoma scrape...")
 
     # Scrape events
-    scraper = FatsomaAPIScraper()
-    events = await scraper.scrape_events(location="london", limit=500)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location="london", limit=500)
     print(f"✅ Scraped {len(events)} events")
 
     # Sync to Supabase (this will create organizers automatically)
@@ -22,6 +22,7 @@ async def main():
     print(f"\n✅ Sync complete!")
     print(f"   Events created: {results['created']}")
     print(f"   Events updated: {results['updated']}")
+    print(f"   Events unchanged: {results['unchanged']}")
     print(f"   Total synced: {results['success']}")
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+from html_parsing import make_soup, strainer
 import asyncio
 from datetime import datetime
 from typing import List, Dict
@@ -8,6 +8,7 @@ import random
 import logging
 from pathlib import Path
 from alerting import EmailAlerter
+from page_fetcher import HostRateLimiter
 
 # Configure logging
 logging.basicConfig(
@@ -28,6 +29,7 @@ class ScraperMetrics:
         self.events_scraped = 0
         self.rate_limit_hits = 0
         self.retry_count = 0
+        self.requests_per_second = None  # Detail page budget after any 429 backoff
         self.errors = []
 
     def log_success(self, event_count: int):
@@ -42,8 +44,10 @@ class ScraperMetrics:
         self.errors.append({'time': datetime.now(), 'error': error})
         logging.error(f"❌ Scrape failed: {error}")
 
-    def log_rate_limit(self):
+    def log_rate_limit(self, requests_per_second: float = None):
         self.rate_limit_hits += 1
+        if requests_per_second is not None:
+            self.requests_per_second = requests_per_second
         logging.warning(f"⚠️  Rate limit encountered (total: {self.rate_limit_hits})")
 
     def log_retry(self):
@@ -58,15 +62,33 @@ class ScraperMetrics:
             'total_events': self.events_scraped,
             'rate_limit_hits': self.rate_limit_hits,
             'total_retries': self.retry_count,
+            'requests_per_second': self.requests_per_second,
             'recent_errors': [str(e['error']) for e in self.errors[-5:]]
         }
 
 class FatsomaScraper:
-    def __init__(self, min_delay: float = 1.5, max_delay: float = 3.0, enable_alerts: bool = True, max_retries: int = 3):
+    def __init__(self, min_delay: float = 1.5, max_delay: float = 3.0, enable_alerts: bool = True, max_retries: int = 3,
+                 concurrency: int = 3, requests_per_second: float = 0.5):
+        """
+        Args:
+            min_delay/max_delay: Random pause after the listing page loads
+            max_retries: Attempts per page when rate limited
+            concurrency: Event detail pages scraped at once, each in its own browser context
+            requests_per_second: Page loads per second allowed against fatsoma.com across
+                all contexts; halved on every 429 and recovered gradually afterwards
+        """
         self.base_url = "https://www.fatsoma.com"
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'en-GB,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br'
+        }
         self.min_delay = min_delay
         self.max_delay = max_delay
         self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = HostRateLimiter(requests_per_second)
         self.metrics = ScraperMetrics()
         self.logger = logging.getLogger(__name__)
         self.alerter = EmailAlerter() if enable_alerts else None
@@ -76,7 +98,7 @@ class FatsomaScraper:
         elif self.alerter:
             self.logger.warning("⚠️  Email alerting disabled - missing configuration")
 
-        self.logger.info(f"⏱️  Rate limiting: {min_delay}-{max_delay}s delay between requests")
+        self.logger.info(f"⏱️  Rate limiting: {requests_per_second} requests/s across {self.concurrency} browser contexts")
 
     async def _random_delay(self):
         """Add random human-like delay between requests"""
@@ -94,7 +116,9 @@ class FatsomaScraper:
 
                 # Check for rate limiting errors (HTTP 429 or similar)
                 if '429' in error_str or 'rate limit' in error_str or 'too many requests' in error_str:
-                    self.metrics.log_rate_limit()
+                    # Slow every worker down, not just this retry
+                    self.rate_limiter.on_rate_limited(self.base_url)
+                    self.metrics.log_rate_limit(self.rate_limiter.current_rate(self.base_url))
 
                     if attempt < self.max_retries - 1:
                         self.metrics.log_retry()
@@ -122,23 +146,21 @@ class FatsomaScraper:
                 page = await browser.new_page()
 
                 # Set realistic user agent with browser version
-                await page.set_extra_http_headers({
-                    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Language': 'en-GB,en;q=0.9',
-                    'Accept-Encoding': 'gzip, deflate, br'
-                })
+                await page.set_extra_http_headers(self.headers)
 
                 # Navigate to events page with retry logic
                 url = f"{self.base_url}/e/{city}"
                 self.logger.info(f"📡 Fetching: {url}")
 
                 async def navigate_to_page():
+                    await self.rate_limiter.acquire(url)
                     response = await page.goto(url, wait_until="networkidle", timeout=30000)
                     if response and response.status == 429:
                         raise Exception(f"HTTP 429: Rate limited by server")
                     elif response and response.status >= 400:
                         self.logger.warning(f"⚠️  HTTP {response.status} received for {url}")
+                    else:
+                        self.rate_limiter.on_success(url)
                     return response
 
                 await self._retry_with_backoff(navigate_to_page)
@@ -152,10 +174,11 @@ class FatsomaScraper:
                     await asyncio.sleep(1)  # Keep scroll delay short
 
                 content = await page.content()
-                soup = BeautifulSoup(content, 'html.parser')
+                # Only the event cards are needed from the listing page
+                card_class = re.compile(r'event-card|EventCard')
+                soup = make_soup(content, parse_only=strainer('div', class_=card_class))
 
-                events = []
-                event_cards = soup.find_all('div', class_=re.compile(r'event-card|EventCard'))[:limit]
+                event_cards = soup.find_all('div', class_=card_class)[:limit]
 
                 # Validation: Check if we found event cards
                 if not event_cards:
@@ -172,20 +195,7 @@ class FatsomaScraper:
 
                 self.logger.info(f"📋 Found {len(event_cards)} event cards")
 
-                for idx, card in enumerate(event_cards, 1):
-                    try:
-                        self.logger.info(f"🎫 Scraping event {idx}/{len(event_cards)}")
-                        event_data = await self._extract_event_data(page, card)
-                        if event_data:
-                            events.append(event_data)
-
-                        # Rate limiting between event detail pages
-                        if idx < len(event_cards):  # Don't delay after last event
-                            await self._random_delay()
-
-                    except Exception as e:
-                        self.logger.error(f"❌ Error extracting event {idx}: {str(e)}")
-                        continue
+                events = await self._scrape_detail_pages(browser, event_cards)
 
                 await browser.close()
 
@@ -201,7 +211,10 @@ class FatsomaScraper:
                 else:
                     self.metrics.log_success(len(events))
 
-                self.logger.info(f"✅ Scrape complete: {len(events)} events scraped")
+                self.logger.info(
+                    f"✅ Scrape complete: {len(events)} events scraped "
+                    f"({self.rate_limiter.current_rate(self.base_url):.2f} requests/s budget)"
+                )
                 return events
 
         except Exception as e:
@@ -215,7 +228,35 @@ class FatsomaScraper:
 
             return []
 
-    async def _extract_event_data(self, page, card) -> Dict:
+    async def _scrape_detail_pages(self, browser, event_cards) -> List[Dict]:
+        """
+        Scrape every card's detail page, `concurrency` at a time, in card order
+
+        Each worker has its own browser context; page loads from all of them
+        share the rate limiter's budget, so throughput follows the budget
+        instead of the slowest page.
+        """
+        cards = enumerate(event_cards, 1)  # Shared iterator: each card goes to one worker
+        results: Dict[int, Dict] = {}
+
+        async def worker():
+            context = await browser.new_context(extra_http_headers=self.headers)
+            try:
+                for idx, card in cards:
+                    try:
+                        self.logger.info(f"🎫 Scraping event {idx}/{len(event_cards)}")
+                        event_data = await self._extract_event_data(context, card)
+                        if event_data:
+                            results[idx] = event_data
+                    except Exception as e:
+                        self.logger.error(f"❌ Error extracting event {idx}: {str(e)}")
+            finally:
+                await context.close()
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(event_cards)))))
+        return [results[idx] for idx in sorted(results)]
+
+    async def _extract_event_data(self, context, card) -> Dict:
         """Extract detailed event information with error handling"""
         detail_page = None
         try:
@@ -228,20 +269,23 @@ class FatsomaScraper:
             event_url = self.base_url + event_link['href'] if event_link['href'].startswith('/') else event_link['href']
 
             # Navigate to event detail page with retry logic
-            detail_page = await page.context.new_page()
+            detail_page = await context.new_page()
 
             async def navigate_to_detail():
+                await self.rate_limiter.acquire(event_url)
                 response = await detail_page.goto(event_url, wait_until="networkidle", timeout=30000)
                 if response and response.status == 429:
                     raise Exception(f"HTTP 429: Rate limited by server on detail page")
                 elif response and response.status >= 400:
                     self.logger.warning(f"⚠️  HTTP {response.status} received for detail page {event_url}")
+                else:
+                    self.rate_limiter.on_success(event_url)
                 return response
 
             await self._retry_with_backoff(navigate_to_detail)
 
             detail_content = await detail_page.content()
-            detail_soup = BeautifulSoup(detail_content, 'html.parser')
+            detail_soup = make_soup(detail_content)
 
             # Extract event details with fallback selectors
             event_data = {
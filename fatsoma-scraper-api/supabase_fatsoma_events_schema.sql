@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS fatsoma_events (
     price_min DECIMAL(10,2),
     price_max DECIMAL(10,2),
     currency TEXT DEFAULT 'GBP',
+    content_hash TEXT, -- Fingerprint of event + tickets, used to skip unchanged rows on sync
     created_at TIMESTAMPTZ DEFAULT NOW(),
     updated_at TIMESTAMPTZ DEFAULT NOW()
 );
@@ -2,26 +2,75 @@
 Supabase Syncer - Syncs Fatsoma events to Supabase database
 """
 import os
-from typing import List, Dict, Optional
+import json
+import hashlib
+import asyncio
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-from supabase import create_client, Client
+from supabase import create_client, acreate_client, Client, AsyncClient
 from dotenv import load_dotenv
 from organizer_matcher import OrganizerMatcher
 
 load_dotenv()
 
 class SupabaseSyncer:
-    def __init__(self):
+    def __init__(self, chunk_size: int = 200, write_concurrency: int = 4):
+        """
+        Args:
+            chunk_size: Events per bulk upsert request in sync_events(bulk=True)
+            write_concurrency: How many chunk writes sync_events may have in flight at once
+        """
+        self.chunk_size = chunk_size
+        self.write_concurrency = write_concurrency
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
 
         if not supabase_url or not supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_KEY must be set in .env file")
 
+        # Sync client for scripts and one-off queries; sync_events uses the async client
         self.client: Client = create_client(supabase_url, supabase_key)
+        self._supabase_url = supabase_url
+        self._supabase_key = supabase_key
+        self._async_client: Optional[AsyncClient] = None
         self.matcher = OrganizerMatcher()
+        # Flipped off if fatsoma_events has no content_hash column yet (see add_content_hash_column.sql)
+        self.has_content_hash = True
+
+        # Organizer cache: normalized name -> {'id', 'name', 'logo_url'}, loaded once per syncer
+        self._organizers: Optional[Dict[str, Dict]] = None
+        # Serializes the cache load and organizer creation between concurrent batch writers
+        self._organizers_lock: Optional[asyncio.Lock] = None
+        self._touched_organizer_ids = set()
         print(f"✅ Connected to Supabase: {supabase_url}")
 
+    async def get_async_client(self) -> AsyncClient:
+        """The async client (pooled keep-alive HTTP) used by sync_events, created on first use
+
+        It belongs to the event loop that first used it - keep a syncer on one loop.
+        """
+        if self._async_client is None:
+            self._async_client = await acreate_client(self._supabase_url, self._supabase_key)
+        return self._async_client
+
+    async def close(self):
+        """Close the async client's connection pools (from the loop that used it)
+
+        The next get_async_client() call opens a new client.
+        """
+        client, self._async_client = self._async_client, None
+        if client is None:
+            return
+        try:
+            await client.postgrest.aclose()
+            await client.auth.close()
+        except Exception as e:
+            print(f"⚠️  Error closing Supabase client: {e}")
+
+    def clear_organizer_cache(self):
+        """Reload organizers from Supabase on next use (call between syncs, not during one)"""
+        self._organizers = None
+
     def _parse_last_entry_time(self, event_date_str: Optional[str], last_entry_time_str: Optional[str]) -> Optional[str]:
         """
         Combine event date with last entry time to create a proper timestamp
@@ -72,10 +121,121 @@ class SupabaseSyncer:
             print(f"  ⚠️  Error parsing last entry time '{last_entry_time_str}': {e}")
             return None
 
-    def _get_or_create_organizer(self, company: str, location: str, logo_url: str = "") -> Optional[str]:
+    @staticmethod
+    def _organizer_key(name: str) -> str:
+        """Normalize an organizer name for cache lookups ("  The  Cell " -> "the cell")"""
+        return ' '.join((name or '').split()).lower()
+
+    async def _load_organizers(self, page_size: int = 1000):
+        """Preload every organizer with one paged query
+
+        The cache is only published once every page is in, so a failed or
+        in-progress load never looks like a complete one.
+        """
+        client = await self.get_async_client()
+        organizers = {}
+        start = 0
+
+        while True:
+            response = await client.table('organizers').select('id, name, logo_url').range(start, start + page_size - 1).execute()
+            for row in response.data:
+                organizers.setdefault(self._organizer_key(row['name']), row)
+
+            if len(response.data) < page_size:
+                break
+            start += page_size
+
+        self._organizers = organizers
+        print(f"📇 Loaded {len(self._organizers)} organizers into cache")
+
+    async def _fetch_organizers_by_name(self, names: List[str], chunk_size: int = 200):
+        """Add existing organizers with these names to the cache"""
+        client = await self.get_async_client()
+        for i in range(0, len(names), chunk_size):
+            response = await client.table('organizers').select('id, name, logo_url').in_('name', names[i:i + chunk_size]).execute()
+            for row in response.data:
+                self._organizers.setdefault(self._organizer_key(row['name']), row)
+
+    async def _prepare_organizers(self, events: List[Dict], chunk_size: int = 200):
+        """
+        Make sure every organizer referenced by these events exists
+
+        Unknown organizers are created in batched inserts and missing logos
+        are filled in, so later lookups are purely local. Creation is
+        insert-only: an organizer that already exists (created by another
+        writer or process since the cache was loaded) is read back, never
+        overwritten.
+        """
+        if self._organizers_lock is None:
+            self._organizers_lock = asyncio.Lock()
+
+        async with self._organizers_lock:
+            if self._organizers is None:
+                await self._load_organizers()
+            await self._create_organizers(events, chunk_size)
+
+    async def _create_organizers(self, events: List[Dict], chunk_size: int):
+        client = await self.get_async_client()
+        new_organizers = {}
+        logo_updates = {}
+
+        for event_data in events:
+            company = event_data.get('company', '')
+            key = self._organizer_key(company)
+            if not key:
+                continue
+
+            logo_url = event_data.get('company_logo_url', '')
+            cached = self._organizers.get(key)
+
+            if cached:
+                # Update logo_url if not already set and we have one
+                if logo_url and not cached.get('logo_url'):
+                    logo_updates[cached['id']] = logo_url
+                    cached['logo_url'] = logo_url
+            elif key not in new_organizers:
+                # Categorize the organizer
+                org_info = self.matcher.get_organizer_info(company, event_data.get('location', ''))
+                new_organizers[key] = {
+                    'name': org_info['name'],
+                    'type': org_info['type'],
+                    'location': org_info['location'],
+                    'logo_url': logo_url if logo_url else None,
+                    'event_count': 0  # Recomputed in flush_organizer_counts
+                }
+                print(f"  📝 Creating organizer: {company} ({org_info['type']}) - {org_info['confidence']:.0%} confidence")
+
+        rows = list(new_organizers.values())
+        for i in range(0, len(rows), chunk_size):
+            try:
+                response = await client.table('organizers').upsert(
+                    rows[i:i + chunk_size], on_conflict='name', ignore_duplicates=True).execute()
+                for row in response.data:
+                    self._organizers[self._organizer_key(row['name'])] = row
+            except Exception as e:
+                print(f"  ⚠️  Error creating organizers: {e}")
+
+        # Duplicates aren't returned by the insert - look up the rows that already existed
+        existing_names = [row['name'] for row in rows if self._organizer_key(row['name']) not in self._organizers]
+        if existing_names:
+            try:
+                await self._fetch_organizers_by_name(existing_names)
+            except Exception as e:
+                print(f"  ⚠️  Error looking up existing organizers: {e}")
+
+        for organizer_id, logo_url in logo_updates.items():
+            try:
+                await client.table('organizers').update({'logo_url': logo_url}).eq('id', organizer_id).execute()
+            except Exception as e:
+                print(f"  ⚠️  Error updating logo for organizer {organizer_id}: {e}")
+
+    async def _get_or_create_organizer(self, company: str, location: str, logo_url: str = "") -> Optional[str]:
         """
         Get or create an organizer and return its UUID
 
+        Resolved from the in-memory organizer cache; event_count is not
+        touched here but recomputed once per sync by flush_organizer_counts.
+
         Args:
             company: Organizer/brand name
             location: Venue name
@@ -88,168 +248,409 @@ class SupabaseSyncer:
             return None
 
         try:
-            # Check if organizer exists
-            existing = self.client.table('organizers').select('id, event_count, logo_url').eq('name', company).execute()
+            key = self._organizer_key(company)
+            if self._organizers is None or key not in self._organizers:
+                await self._prepare_organizers([{'company': company, 'location': location, 'company_logo_url': logo_url}])
 
-            if existing.data:
-                # Update event count and logo if not set
-                organizer_id = existing.data[0]['id']
-                current_count = existing.data[0].get('event_count', 0)
-                update_data = {'event_count': current_count + 1}
+            organizer = self._organizers.get(key)
+            if organizer:
+                self._touched_organizer_ids.add(organizer['id'])
+                return organizer['id']
 
-                # Update logo_url if not already set and we have one
-                if logo_url and not existing.data[0].get('logo_url'):
-                    update_data['logo_url'] = logo_url
+        except Exception as e:
+            print(f"  ⚠️  Error with organizer {company}: {e}")
 
-                self.client.table('organizers').update(update_data).eq('id', organizer_id).execute()
+        return None
 
-                return organizer_id
-            else:
-                # Categorize the organizer
-                org_info = self.matcher.get_organizer_info(company, location)
+    async def flush_organizer_counts(self):
+        """Recompute event_count for organizers touched by this sync"""
+        client = await self.get_async_client()
+        organizer_ids = list(self._touched_organizer_ids)
+        if not organizer_ids:
+            return
 
-                # Create new organizer
-                organizer_data = {
-                    'name': org_info['name'],
-                    'type': org_info['type'],
-                    'location': org_info['location'],
-                    'logo_url': logo_url if logo_url else None,
-                    'event_count': 1
-                }
+        try:
+            await client.rpc('refresh_organizer_event_counts', {'organizer_ids': organizer_ids}).execute()
+            self._touched_organizer_ids.clear()
+            return
+        except Exception as e:
+            print(f"  ⚠️  refresh_organizer_event_counts unavailable ({e}), counting client-side")
 
-                response = self.client.table('organizers').insert(organizer_data).execute()
+        # Fallback: count events per organizer here and write only the ones that differ
+        try:
+            counts = {organizer_id: 0 for organizer_id in organizer_ids}
+            for i in range(0, len(organizer_ids), 200):
+                chunk = organizer_ids[i:i + 200]
+                start = 0
+                while True:
+                    response = await client.table('fatsoma_events').select('organizer_id').in_('organizer_id', chunk).range(start, start + 999).execute()
+                    for row in response.data:
+                        counts[row['organizer_id']] += 1
+                    if len(response.data) < 1000:
+                        break
+                    start += 1000
+
+                current = await client.table('organizers').select('id, event_count').in_('id', chunk).execute()
+                for row in current.data:
+                    if row.get('event_count') != counts[row['id']]:
+                        await client.table('organizers').update({'event_count': counts[row['id']]}).eq('id', row['id']).execute()
+
+            self._touched_organizer_ids.clear()
+        except Exception as e:
+            print(f"  ⚠️  Error refreshing organizer event counts: {e}")
 
-                if response.data:
-                    print(f"  📝 Created organizer: {company} ({org_info['type']}) - {org_info['confidence']:.0%} confidence")
-                    return response.data[0]['id']
+    def _build_supabase_event(self, event_data: Dict) -> Tuple[Dict, List[Dict]]:
+        """
+        Normalize a scraped event into a fatsoma_events row plus its ticket rows
 
-        except Exception as e:
-            print(f"  ⚠️  Error with organizer {company}: {e}")
+        The input dict is not modified. organizer_id is left out because it's
+        resolved separately (and only for events that actually changed).
+        """
+        # Convert datetime to ISO string for Supabase
+        event_date = event_data.get('date')
+        if isinstance(event_date, datetime):
+            event_date = event_date.isoformat()
+
+        # Build full location with city (e.g., "The Cell, Nottingham")
+        venue = event_data.get('location', '')
+        city = event_data.get('city', '')
+        full_location = f"{venue}, {city}" if venue and city else (venue or city or '')
+
+        # Parse last entry time and combine with event date to create timestamp
+        last_entry_timestamp = self._parse_last_entry_time(event_date, event_data.get('last_entry'))
+
+        supabase_event = {
+            'event_id': event_data.get('event_id'),
+            'name': event_data.get('name'),
+            'company': event_data.get('company'),
+            'event_date': event_date,
+            'event_time': event_data.get('time'),
+            'last_entry': last_entry_timestamp,
+            'location': full_location,  # Now stores "Venue, City"
+            'age_restriction': event_data.get('age_restriction'),
+            'url': event_data.get('url'),
+            'image_url': event_data.get('image_url'),
+        }
 
-        return None
+        # display_order will be added later when column exists
+        tickets = [{
+            'ticket_type': ticket.get('ticket_type'),
+            'price': ticket.get('price'),
+            'currency': ticket.get('currency', 'GBP'),
+            'availability': ticket.get('availability'),
+            # 'display_order': position  # TODO: Uncomment after adding column to Supabase
+        } for ticket in event_data.get('tickets', [])]
+
+        return supabase_event, tickets
+
+    def _content_hash(self, supabase_event: Dict, tickets: List[Dict], company_logo_url: str = "") -> str:
+        """Stable fingerprint of an event row and its tickets (ticket order matters)"""
+        payload = {
+            'event': supabase_event,
+            'tickets': tickets,
+            'company_logo_url': company_logo_url or '',
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str, separators=(',', ':'))
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    async def _fetch_existing_hashes(self, event_ids: List[str], chunk_size: int = 200) -> Dict[str, Dict]:
+        """Map event_id -> {'id', 'content_hash'} for events already in Supabase"""
+        client = await self.get_async_client()
+        existing = {}
+        columns = 'id, event_id, content_hash' if self.has_content_hash else 'id, event_id'
+
+        for i in range(0, len(event_ids), chunk_size):
+            chunk = event_ids[i:i + chunk_size]
+            try:
+                response = await client.table('fatsoma_events').select(columns).in_('event_id', chunk).execute()
+            except Exception as e:
+                if self.has_content_hash and 'content_hash' in str(e):
+                    print("⚠️  fatsoma_events.content_hash missing - run add_content_hash_column.sql. Change detection disabled.")
+                    self.has_content_hash = False
+                    return await self._fetch_existing_hashes(event_ids, chunk_size)
+                raise
+
+            for row in response.data:
+                existing[row['event_id']] = row
 
-    async def sync_events(self, events: List[Dict]) -> Dict:
+        return existing
+
+    async def sync_events(self, events: List[Dict], bulk: bool = True, refresh_organizer_counts: bool = True) -> Dict:
         """
         Sync events from Fatsoma API to Supabase
+
+        Each event is fingerprinted; events whose fingerprint matches the
+        stored content_hash are counted as "unchanged" and not written.
+
+        Args:
+            events: Scraped events (not modified)
+            bulk: If True, changed events are upserted in chunks of chunk_size
+                with one batched ticket replace per chunk. If False, each event
+                is written with its own requests.
+            refresh_organizer_counts: Recompute organizer event counts at the end.
+                Streaming callers that sync many batches pass False and call
+                flush_organizer_counts() once when they're done.
+
+        All writes go through the async client, at most write_concurrency at a
+        time, so a sync never blocks the event loop it runs on.
+
         Returns: Dict with success count and errors
         """
         results = {
             "success": 0,
             "errors": 0,
             "updated": 0,
-            "created": 0
+            "created": 0,
+            "unchanged": 0
         }
 
+        # Last occurrence wins - an upsert can't touch the same event_id twice
+        deduped = {}
         for event_data in events:
-            try:
-                # Extract tickets data
-                tickets_data = event_data.pop('tickets', [])
-
-                # Get or create organizer
-                organizer_id = self._get_or_create_organizer(
-                    event_data.get('company', ''),
-                    event_data.get('location', ''),
-                    event_data.get('company_logo_url', '')
-                )
-
-                # Convert datetime to ISO string for Supabase
-                if isinstance(event_data.get('date'), datetime):
-                    event_data['event_date'] = event_data.pop('date').isoformat()
-                elif 'date' in event_data:
-                    event_data['event_date'] = event_data.pop('date')
-
-                # Build full location with city (e.g., "The Cell, Nottingham")
-                venue = event_data.get('location', '')
-                city = event_data.get('city', '')
-                full_location = f"{venue}, {city}" if venue and city else (venue or city or '')
-
-                # Parse last entry time and combine with event date to create timestamp
-                last_entry_timestamp = self._parse_last_entry_time(
-                    event_data.get('event_date'),
-                    event_data.get('last_entry')
-                )
-
-                # Prepare event data for Supabase
-                supabase_event = {
-                    'event_id': event_data.get('event_id'),
-                    'name': event_data.get('name'),
-                    'company': event_data.get('company'),
-                    'event_date': event_data.get('event_date'),
-                    'event_time': event_data.get('time'),
-                    'last_entry': last_entry_timestamp,
-                    'location': full_location,  # Now stores "Venue, City"
-                    'age_restriction': event_data.get('age_restriction'),
-                    'url': event_data.get('url'),
-                    'image_url': event_data.get('image_url'),
-                    'organizer_id': organizer_id,
-                }
+            deduped[event_data.get('event_id')] = event_data
+        events = list(deduped.values())
 
-                # Check if event exists
-                existing = self.client.table('fatsoma_events').select('id, event_id').eq('event_id', supabase_event['event_id']).execute()
+        event_ids = [event_id for event_id in deduped if event_id]
+        try:
+            existing_rows = await self._fetch_existing_hashes(event_ids)
+        except Exception as e:
+            print(f"⚠️  Could not prefetch existing events, syncing all: {e}")
+            existing_rows = {}
 
-                if existing.data:
-                    # Update existing event
-                    event_uuid = existing.data[0]['id']
-                    self.client.table('fatsoma_events').update(supabase_event).eq('id', event_uuid).execute()
+        changed = []
+        for event_data in events:
+            try:
+                supabase_event, tickets_data = self._build_supabase_event(event_data)
+                content_hash = self._content_hash(supabase_event, tickets_data, event_data.get('company_logo_url', ''))
+                existing = existing_rows.get(supabase_event['event_id'])
 
-                    # Delete old tickets
-                    self.client.table('fatsoma_tickets').delete().eq('event_id', event_uuid).execute()
+                if existing and existing.get('content_hash') == content_hash:
+                    results["unchanged"] += 1
+                    results["success"] += 1
+                    continue
 
-                    results["updated"] += 1
-                else:
-                    # Insert new event
-                    response = self.client.table('fatsoma_events').insert(supabase_event).execute()
-                    event_uuid = response.data[0]['id']
-
-                    results["created"] += 1
-
-                # Insert tickets (display_order will be added later when column exists)
-                for position, ticket in enumerate(tickets_data):
-                    ticket_data = {
-                        'event_id': event_uuid,
-                        'ticket_type': ticket.get('ticket_type'),
-                        'price': ticket.get('price'),
-                        'currency': ticket.get('currency', 'GBP'),
-                        'availability': ticket.get('availability'),
-                        # 'display_order': position  # TODO: Uncomment after adding column to Supabase
-                    }
-                    self.client.table('fatsoma_tickets').insert(ticket_data).execute()
-
-                results["success"] += 1
+                if self.has_content_hash:
+                    supabase_event['content_hash'] = content_hash
+                changed.append((event_data, supabase_event, tickets_data, existing))
 
             except Exception as e:
-                print(f"❌ Error syncing event {event_data.get('name', 'Unknown')}: {e}")
+                print(f"❌ Error preparing event {event_data.get('name', 'Unknown')}: {e}")
                 results["errors"] += 1
 
+        # Resolve all organizers up front: one preload query plus batched creates
+        try:
+            await self._prepare_organizers([event_data for event_data, _, _, _ in changed])
+        except Exception as e:
+            print(f"⚠️  Could not preload organizers: {e}")
+
+        semaphore = asyncio.Semaphore(self.write_concurrency)
+
+        async def write_chunk(number: int, chunk):
+            async with semaphore:
+                try:
+                    await self._sync_chunk(chunk, results)
+                except Exception as e:
+                    # One bad row fails the whole request - retry this chunk row by row
+                    print(f"⚠️  Bulk upsert failed for chunk {number}, retrying row by row: {e}")
+                    for item in chunk:
+                        await self._sync_event_row(*item, results)
+
+        async def write_row(item):
+            async with semaphore:
+                await self._sync_event_row(*item, results)
+
+        if bulk:
+            chunks = [changed[i:i + self.chunk_size] for i in range(0, len(changed), self.chunk_size)]
+            await asyncio.gather(*(write_chunk(n, chunk) for n, chunk in enumerate(chunks, 1)))
+        else:
+            await asyncio.gather(*(write_row(item) for item in changed))
+
+        if refresh_organizer_counts:
+            await self.flush_organizer_counts()
+
         return results
 
-    def get_all_events(self) -> List[Dict]:
-        """Get all events from Supabase"""
+    async def prune_missing(self, seen_event_ids, max_fraction: float = 0.2,
+                            page_size: int = 1000, chunk_size: int = 200) -> List[str]:
+        """
+        Delete upcoming events that no longer appear upstream
+
+        Meant for the periodic full reconcile: seen_event_ids must cover a
+        complete crawl of the feed (plus manual events), otherwise live
+        events would be removed. As a guard against a truncated crawl,
+        nothing is deleted if more than max_fraction of the upcoming events
+        would go. Tickets are removed by the ON DELETE CASCADE.
+
+        Returns: event_ids that were deleted
+        """
+        client = await self.get_async_client()
+        today = datetime.now().strftime('%Y-%m-%d')
+        seen_event_ids = set(seen_event_ids)
+
+        upcoming = []
+        start = 0
+        while True:
+            response = await client.table('fatsoma_events').select('id, event_id, organizer_id').gte(
+                'event_date', today).range(start, start + page_size - 1).execute()
+            upcoming.extend(response.data)
+            if len(response.data) < page_size:
+                break
+            start += page_size
+
+        missing = [row for row in upcoming if row['event_id'] not in seen_event_ids]
+        if not missing:
+            return []
+
+        if len(missing) > len(upcoming) * max_fraction:
+            print(f"⚠️  Reconcile would delete {len(missing)} of {len(upcoming)} upcoming events - skipping (crawl incomplete?)")
+            return []
+
+        for i in range(0, len(missing), chunk_size):
+            chunk = missing[i:i + chunk_size]
+            await client.table('fatsoma_events').delete().in_('id', [row['id'] for row in chunk]).execute()
+
+        self._touched_organizer_ids.update(row['organizer_id'] for row in missing if row.get('organizer_id'))
+        print(f"🗑️  Removed {len(missing)} events no longer listed upstream")
+        return [row['event_id'] for row in missing]
+
+    async def _resolve_organizer(self, event_data: Dict) -> Optional[str]:
+        """Get or create the organizer for a scraped event"""
+        return await self._get_or_create_organizer(
+            event_data.get('company', ''),
+            event_data.get('location', ''),
+            event_data.get('company_logo_url', '')
+        )
+
+    @staticmethod
+    def _without_hash(supabase_event: Dict) -> Dict:
+        """
+        The event row with content_hash cleared
+
+        Events are first written without their fingerprint, which is only
+        stored once their tickets are written too. If a ticket write fails,
+        the next sync still sees the event as changed and repairs it.
+        """
+        if 'content_hash' not in supabase_event:
+            return supabase_event
+        return dict(supabase_event, content_hash=None)
+
+    async def _sync_chunk(self, chunk: List[Tuple[Dict, Dict, List[Dict], Optional[Dict]]], results: Dict):
+        """Upsert a chunk of changed events and replace their tickets in bulk"""
+        client = await self.get_async_client()
+        rows = []
+        for event_data, supabase_event, _, _ in chunk:
+            supabase_event['organizer_id'] = await self._resolve_organizer(event_data)
+            rows.append(self._without_hash(supabase_event))
+
+        response = await client.table('fatsoma_events').upsert(rows, on_conflict='event_id').execute()
+        uuid_by_event_id = {row['event_id']: row['id'] for row in response.data}
+
+        # Clear tickets for every upserted event, not just the ones the prefetch found -
+        # the prefetch may have failed, or an earlier attempt may have written tickets already
+        await client.table('fatsoma_tickets').delete().in_('event_id', list(uuid_by_event_id.values())).execute()
+
+        ticket_rows = []
+        for _, supabase_event, tickets_data, _ in chunk:
+            event_uuid = uuid_by_event_id[supabase_event['event_id']]
+            ticket_rows.extend(dict(ticket, event_id=event_uuid) for ticket in tickets_data)
+
+        if ticket_rows:
+            await client.table('fatsoma_tickets').insert(ticket_rows).execute()
+
+        if self.has_content_hash:
+            hashed = [supabase_event for _, supabase_event, _, _ in chunk]
+            await client.table('fatsoma_events').upsert(hashed, on_conflict='event_id').execute()
+
+        for _, _, _, existing in chunk:
+            results["updated" if existing else "created"] += 1
+            results["success"] += 1
+
+    async def _sync_event_row(self, event_data: Dict, supabase_event: Dict, tickets_data: List[Dict],
+                        existing: Optional[Dict], results: Dict):
+        """Write a single changed event and its tickets with individual requests"""
+        client = await self.get_async_client()
         try:
-            response = self.client.table('fatsoma_events').select('*, fatsoma_tickets(*)').execute()
+            if 'organizer_id' not in supabase_event:
+                supabase_event['organizer_id'] = await self._resolve_organizer(event_data)
+
+            if existing:
+                # Update existing event
+                event_uuid = existing['id']
+                await client.table('fatsoma_events').update(self._without_hash(supabase_event)).eq('id', event_uuid).execute()
+
+                results["updated"] += 1
+            else:
+                # Insert new event (upsert in case a failed bulk chunk already wrote it)
+                response = await client.table('fatsoma_events').upsert(
+                    self._without_hash(supabase_event), on_conflict='event_id').execute()
+                event_uuid = response.data[0]['id']
+
+                results["created"] += 1
+
+            # Delete old tickets (a failed bulk chunk may have inserted some for a "new" event too)
+            await client.table('fatsoma_tickets').delete().eq('event_id', event_uuid).execute()
+
+            # Insert tickets
+            for ticket_data in tickets_data:
+                await client.table('fatsoma_tickets').insert(dict(ticket_data, event_id=event_uuid)).execute()
+
+            if supabase_event.get('content_hash'):
+                await client.table('fatsoma_events').update(
+                    {'content_hash': supabase_event['content_hash']}).eq('id', event_uuid).execute()
+
+            results["success"] += 1
+
+        except Exception as e:
+            print(f"❌ Error syncing event {event_data.get('name', 'Unknown')}: {e}")
+            results["errors"] += 1
+
+    def _select_events(self, table: str, apply_filter) -> List[Dict]:
+        """Run a filtered select with tickets on the hot or archive tier
+
+        Archive rows come back with their tickets under 'fatsoma_tickets' too,
+        plus an 'archived' flag, so callers can treat both tiers the same.
+        """
+        if table == 'fatsoma_events':
+            response = apply_filter(self.client.table(table).select('*, fatsoma_tickets(*)')).execute()
             return response.data
+
+        response = apply_filter(self.client.table(table).select('*, fatsoma_tickets_archive(*)')).execute()
+        return [
+            dict(row, fatsoma_tickets=row.pop('fatsoma_tickets_archive', None) or [], archived=True)
+            for row in response.data
+        ]
+
+    def _select_tiers(self, apply_filter, include_archived: bool) -> List[Dict]:
+        events = self._select_events('fatsoma_events', apply_filter)
+        if include_archived:
+            events.extend(self._select_events('fatsoma_events_archive', apply_filter))
+        return events
+
+    def get_all_events(self, include_archived: bool = False) -> List[Dict]:
+        """Get all events from Supabase (upcoming only unless include_archived)"""
+        try:
+            return self._select_tiers(lambda query: query, include_archived)
         except Exception as e:
             print(f"❌ Error fetching events from Supabase: {e}")
             return []
 
-    def get_event_by_id(self, event_id: str) -> Dict:
-        """Get a specific event by Fatsoma event_id"""
+    def get_event_by_id(self, event_id: str, include_archived: bool = False) -> Dict:
+        """Get a specific event by Fatsoma event_id (checks the archive too if include_archived)"""
         try:
-            response = self.client.table('fatsoma_events').select('*, fatsoma_tickets(*)').eq('event_id', event_id).execute()
-            if response.data:
-                return response.data[0]
+            events = self._select_tiers(lambda query: query.eq('event_id', event_id), include_archived)
+            if events:
+                return events[0]
             return None
         except Exception as e:
             print(f"❌ Error fetching event from Supabase: {e}")
             return None
 
-    def search_events(self, query: str) -> List[Dict]:
-        """Search events by name or location"""
+    def search_events(self, query: str, include_archived: bool = False) -> List[Dict]:
+        """Search events by name or location (upcoming only unless include_archived)"""
         try:
-            response = self.client.table('fatsoma_events').select('*, fatsoma_tickets(*)').or_(
+            return self._select_tiers(lambda q: q.or_(
                 f"name.ilike.%{query}%,location.ilike.%{query}%,company.ilike.%{query}%"
-            ).execute()
-            return response.data
+            ), include_archived)
         except Exception as e:
             print(f"❌ Error searching events in Supabase: {e}")
             return []
@@ -262,8 +663,8 @@ async def test_syncer():
     print("🔄 Testing Supabase Syncer...")
 
     # Scrape events
-    scraper = FatsomaAPIScraper()
-    events = await scraper.scrape_events(location="london", limit=5)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location="london", limit=5)
 
     print(f"\n📦 Scraped {len(events)} events")
 
@@ -275,6 +676,7 @@ async def test_syncer():
     print(f"   Success: {results['success']}")
     print(f"   Created: {results['created']}")
     print(f"   Updated: {results['updated']}")
+    print(f"   Unchanged: {results['unchanged']}")
     print(f"   Errors: {results['errors']}")
 
     # Test fetch
@@ -0,0 +1,286 @@
+"""
+Sync Coordinator - Runs sync jobs one at a time from a shared priority queue,
+coalescing overlapping requests. Shared by the scheduler, the startup hook and /refresh
+"""
+import asyncio
+import itertools
+import os
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows - no cross-process lock, single-flight still applies in-process
+    fcntl = None
+
+# "full" beats "auto" beats "delta" when requests are merged
+MODE_PRIORITY = {"delta": 0, "auto": 1, "full": 2}
+
+
+class SyncFileLock:
+    """Advisory lock file so several server processes never sync at the same time"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv('SYNC_LOCK_PATH') or Path(__file__).parent / "sync.lock")
+        self._file = None
+
+    def acquire(self, key: str = "") -> bool:
+        """Try to take the lock for job `key` without waiting; False if another process holds it"""
+        if fcntl is None:
+            return True
+
+        self._file = open(self.path, 'a+')
+        try:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._file.close()
+            self._file = None
+            return False
+
+        self._file.seek(0)
+        self._file.truncate()
+        self._file.write(f"{os.getpid()} {datetime.now().isoformat()} {key}\n")
+        self._file.flush()
+        return True
+
+    def holder_key(self) -> Optional[str]:
+        """Key of the job the current holder is running, as it wrote it (None if unknown)"""
+        try:
+            fields = self.path.read_text().split(maxsplit=2)
+        except OSError:
+            return None
+        return fields[2].strip() if len(fields) == 3 else None
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class SyncCoordinator:
+    """
+    Single-flight runner for sync jobs, fed from one shared priority queue
+
+    Every job has a key and a priority (lower runs first). Submitting a key
+    that is already queued doesn't add a second job: the request is merged
+    into the pending one, which keeps the more urgent priority. The main
+    event sync (trigger()) merges sources and keeps the strongest mode.
+    Only one job runs at a time, on a worker thread with its own long-lived
+    event loop, under a file lock shared with other processes - so however
+    many tiers are configured, upstream load stays that of one sync.
+
+    If another process holds the lock, a job is only dropped when that
+    process is running the same job key (its run covers this request);
+    otherwise it goes back in the queue and is retried after
+    lock_retry_seconds.
+    """
+
+    EVENTS_KEY = "events"
+
+    def __init__(self, sync_func: Callable, lock: Optional[SyncFileLock] = None,
+                 on_shutdown: Optional[Callable] = None, lock_retry_seconds: float = 30.0):
+        """
+        Args:
+            sync_func: async callable(mode=..., sources=...) that performs one event sync
+            lock: Cross-process lock (defaults to SYNC_LOCK_PATH / sync.lock)
+            on_shutdown: async callable run on the worker's loop before it closes
+                (e.g. closing HTTP sessions the jobs created on that loop)
+            lock_retry_seconds: How long a job waits before retrying when another
+                process holds the lock for a different job
+        """
+        self.sync_func = sync_func
+        self.lock = lock or SyncFileLock()
+        self.on_shutdown = on_shutdown
+        self.lock_retry_seconds = lock_retry_seconds
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._sequence = itertools.count()
+
+        self._running: Optional[Dict] = None
+        self._pending: Dict[str, Dict] = {}
+        self._last_run: Optional[Dict] = None
+        self._stats = {"runs": 0, "coalesced": 0, "skipped_locked": 0, "deferred_locked": 0, "failed": 0}
+
+    def start(self):
+        """Start the worker thread (idempotent)"""
+        with self._condition:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._worker, name="sync-coordinator", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop after the current run; pending requests are dropped"""
+        with self._condition:
+            self._stopping = True
+            self._pending.clear()
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def submit(self, key: str, func: Optional[Callable] = None, priority: int = 1,
+               reason: str = "manual", **details) -> Dict:
+        """
+        Queue a job unless one with the same key is already waiting
+
+        Args:
+            key: Identifies the job for coalescing (e.g. "city:nottingham")
+            func: async callable with no arguments that does the work
+            priority: Lower numbers run first; ties run in submission order
+            reason: Why the job was requested (shown on /status)
+
+        Returns a dict saying whether the request was coalesced into a
+        pending job and whether a job is currently running.
+        """
+        with self._condition:
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = dict(
+                    details,
+                    key=key,
+                    func=func,
+                    priority=priority,
+                    reasons=[reason],
+                    requested_at=datetime.now().isoformat(),
+                    sequence=next(self._sequence),
+                )
+                coalesced = False
+            else:
+                pending["priority"] = min(pending["priority"], priority)
+                pending["reasons"].append(reason)
+                # A fresh request shouldn't wait out an earlier lock retry delay
+                pending.pop("not_before", None)
+                self._stats["coalesced"] += 1
+                coalesced = True
+
+            self._condition.notify_all()
+            return {
+                "queued": True,
+                "coalesced": coalesced,
+                "running": self._running is not None,
+            }
+
+    def trigger(self, mode: str = "auto", sources: Iterable[str] = ("catalog", "manual"),
+                reason: str = "manual", priority: int = 1) -> Dict:
+        """Request an event sync (see update_events), merged with any queued one"""
+        with self._condition:
+            pending = self._pending.get(self.EVENTS_KEY)
+            if pending is not None:
+                pending["sources"] |= set(sources)
+                if MODE_PRIORITY[mode] > MODE_PRIORITY[pending["mode"]]:
+                    pending["mode"] = mode
+
+            return self.submit(self.EVENTS_KEY, priority=priority, reason=reason,
+                               mode=mode, sources=set(sources))
+
+    def _worker(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            while True:
+                with self._condition:
+                    while True:
+                        if self._stopping:
+                            return
+                        now = time.monotonic()
+                        ready = [k for k, r in self._pending.items() if r.get("not_before", 0) <= now]
+                        if ready:
+                            break
+                        # Sleep until the earliest deferred job is due (or a new one arrives)
+                        due = [r["not_before"] for r in self._pending.values()]
+                        self._condition.wait(timeout=min(due) - now if due else None)
+                    key = min(ready, key=lambda k: (self._pending[k]["priority"], self._pending[k]["sequence"]))
+                    request = self._pending.pop(key)
+
+                self._run(request)
+        finally:
+            if self.on_shutdown is not None:
+                try:
+                    self.loop.run_until_complete(self.on_shutdown())
+                except Exception as e:
+                    print(f"⚠️  Sync coordinator shutdown hook failed: {e}")
+            self.loop.close()
+
+    @staticmethod
+    def _describe(request: Dict) -> Dict:
+        """JSON-friendly view of a queued or running job"""
+        view = {k: v for k, v in request.items() if k not in ("func", "sequence", "not_before")}
+        if "sources" in view:
+            view["sources"] = sorted(view["sources"])
+        return view
+
+    def _run(self, request: Dict):
+        run = dict(self._describe(request), started_at=datetime.now().isoformat())
+
+        if not self.lock.acquire(request["key"]):
+            if self.lock.holder_key() == request["key"]:
+                # Another process is running this same job - its run covers this request
+                print(f"⏭️  Sync job {request['key']} skipped: another process is running it")
+                with self._condition:
+                    self._stats["skipped_locked"] += 1
+                    self._last_run = dict(run, finished_at=datetime.now().isoformat(), outcome="skipped_locked")
+                return
+
+            print(f"⏳ Sync job {request['key']} deferred {self.lock_retry_seconds:.0f}s: another process holds {self.lock.path}")
+            self._defer(request)
+            return
+
+        with self._condition:
+            self._running = run
+
+        outcome = "ok"
+        try:
+            if request["func"] is not None:
+                coroutine = request["func"]()
+            else:
+                coroutine = self.sync_func(mode=request["mode"], sources=sorted(request["sources"]))
+            self.loop.run_until_complete(coroutine)
+        except Exception as e:
+            print(f"❌ Sync job {request['key']} failed: {e}")
+            outcome = f"error: {e}"
+        finally:
+            self.lock.release()
+
+        with self._condition:
+            self._running = None
+            self._stats["runs"] += 1
+            if outcome != "ok":
+                self._stats["failed"] += 1
+            self._last_run = dict(run, finished_at=datetime.now().isoformat(), outcome=outcome)
+
+    def _defer(self, request: Dict):
+        """Put a job that couldn't get the lock back in the queue, to retry later"""
+        with self._condition:
+            self._stats["deferred_locked"] += 1
+            pending = self._pending.get(request["key"])
+            if pending is None:
+                request["not_before"] = time.monotonic() + self.lock_retry_seconds
+                self._pending[request["key"]] = request
+                return
+
+            # Requested again meanwhile: fold this one into the newer request
+            pending["priority"] = min(pending["priority"], request["priority"])
+            pending["reasons"] = request["reasons"] + pending["reasons"]
+            if "sources" in pending:
+                pending["sources"] |= request["sources"]
+                if MODE_PRIORITY[request["mode"]] > MODE_PRIORITY[pending["mode"]]:
+                    pending["mode"] = request["mode"]
+
+    def get_status(self) -> Dict:
+        """Snapshot of the queue for /status"""
+        with self._condition:
+            pending = sorted(self._pending.values(), key=lambda r: (r["priority"], r["sequence"]))
+            return {
+                "running": dict(self._running) if self._running else None,
+                "pending": [self._describe(request) for request in pending],
+                "last_run": dict(self._last_run) if self._last_run else None,
+                "stats": dict(self._stats),
+                "lock_path": str(self.lock.path),
+            }
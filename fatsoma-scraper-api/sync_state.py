@@ -0,0 +1,70 @@
+"""
+Sync State - Small JSON file that persists sync bookkeeping between runs
+(high-water marks per source, last full reconcile time, organizer page IDs)
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+
+class SyncState:
+    """Thread-safe key/value store backed by a JSON file"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv('SYNC_STATE_PATH') or Path(__file__).parent / "sync_state.json")
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️  Could not read sync state {self.path}, starting fresh: {e}")
+            return {}
+
+    def _save(self):
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._save()
+
+    def _get_datetime(self, key: str) -> Optional[datetime]:
+        value = self.get(key)
+        return datetime.fromisoformat(value) if value else None
+
+    def get_high_water_mark(self, source: str) -> Optional[datetime]:
+        """Latest upstream updated-at seen for a source on its last complete crawl"""
+        return self._get_datetime(f"high_water_mark:{source}")
+
+    def set_high_water_mark(self, source: str, value: datetime):
+        self.set(f"high_water_mark:{source}", value.isoformat())
+
+    def get_last_full_reconcile(self) -> Optional[datetime]:
+        return self._get_datetime("last_full_reconcile")
+
+    def mark_full_reconcile(self, when: datetime):
+        self.set("last_full_reconcile", when.isoformat())
+
+    def get_page_id(self, vanity_url: str) -> Optional[str]:
+        """Cached Fatsoma page ID for an organizer vanity URL"""
+        return self.get("page_ids", {}).get(vanity_url)
+
+    def set_page_id(self, vanity_url: str, page_id: str):
+        with self._lock:
+            self._data.setdefault("page_ids", {})[vanity_url] = page_id
+            self._save()
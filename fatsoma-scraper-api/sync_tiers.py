@@ -0,0 +1,63 @@
+"""
+Sync Tiers - Per-city / per-organizer / per-event refresh schedules from sync_tiers.json
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_TIERS = {
+    "hot": {"interval_minutes": 5, "priority": 0},
+    "warm": {"interval_minutes": 15, "priority": 1},
+    "cold": {"interval_minutes": 120, "priority": 2},
+}
+
+DEFAULT_TICKET_POLL = {"window_hours": 12, "grace_hours": 2, "interval_minutes": 2, "priority": -1}
+
+
+class SyncTiers:
+    """
+    Maps every sync target to a tier (refresh interval + queue priority)
+
+    Targets are the catalog feed ("sources"), SYNC_LOCATIONS cities, the
+    organizers and manual_event_uuids in manual_organizers.json. Each
+    section can name a "default" tier; organizers are keyed by vanity_url,
+    page_id or name, manual events by event_id. Lower priority numbers are
+    served first from the shared sync queue.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path or os.getenv('SYNC_TIERS_PATH') or Path(__file__).parent / "sync_tiers.json")
+        config = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                config = json.load(f)
+        else:
+            print(f"No {self.path.name} found, using default sync tiers")
+
+        self.tiers: Dict[str, Dict] = config.get('tiers') or DEFAULT_TIERS
+        self.sources: Dict[str, str] = config.get('sources', {})
+        self.cities: Dict[str, str] = config.get('cities', {})
+        self.organizers: Dict[str, str] = config.get('organizers', {})
+        self.manual_event_uuids: Dict[str, str] = config.get('manual_event_uuids', {})
+        # Fast ticket-availability polling for events about to start (see ticket_poller.py)
+        self.ticket_poll: Dict = dict(DEFAULT_TICKET_POLL, **config.get('ticket_poll', {}))
+
+    def _tier(self, section: Dict[str, str], keys: List[Optional[str]]) -> Dict:
+        name = next((section[key] for key in keys if key and key in section), section.get('default'))
+        if name not in self.tiers:
+            # Unknown or missing tier - fall back to the least frequent one
+            name = max(self.tiers, key=lambda tier: self.tiers[tier]['interval_minutes'])
+        return dict(self.tiers[name], name=name)
+
+    def for_source(self, source: str) -> Dict:
+        return self._tier(self.sources, [source])
+
+    def for_city(self, city: str) -> Dict:
+        return self._tier(self.cities, [city.lower()])
+
+    def for_organizer(self, organizer: Dict) -> Dict:
+        return self._tier(self.organizers, [organizer.get('vanity_url'), organizer.get('page_id'), organizer.get('name')])
+
+    def for_manual_event(self, event_id: str) -> Dict:
+        return self._tier(self.manual_event_uuids, [event_id])
@@ -34,12 +34,12 @@ async def find_all_venue_organizers(venues: list[str], location: str = "nottingh
     print(f"   Looking at events for the next {days_ahead} days")
     print("=" * 70)
 
-    scraper = FatsomaAPIScraper()
     syncer = SupabaseSyncer()
 
     # Scrape all events from location
     print(f"\n📥 Scraping all events in {location}...")
-    events = await scraper.scrape_events(location=location, limit=200)
+    async with FatsomaAPIScraper() as scraper:
+        events = await scraper.scrape_events(location=location, limit=200)
     print(f"   ✅ Found {len(events)} total events")
 
     # Find events at each venue
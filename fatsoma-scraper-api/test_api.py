@@ -2,8 +2,8 @@
 Test script to explore Fatsoma's API
 """
 import asyncio
-import aiohttp
 import json
+from api_scraper import FatsomaAPIScraper
 
 async def test_fatsoma_api():
     print("🔍 Testing Fatsoma API...")
@@ -13,12 +13,8 @@ async def test_fatsoma_api():
     # API key from the HTML
     api_key = "fk_ui_cust_aff50532-bbb5-45ed-9d0a-4ad144814b9f"
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-        "Accept": "application/json",
-    }
-
-    async with aiohttp.ClientSession() as session:
+    async with FatsomaAPIScraper() as scraper:
+        session = await scraper.get_session()
 
         # Test 1: Try to get events for London
         print("\n" + "="*60)
@@ -37,7 +33,7 @@ async def test_fatsoma_api():
         for endpoint in endpoints:
             print(f"\n📍 Trying: {endpoint}")
             try:
-                async with session.get(endpoint, headers=headers) as response:
+                async with session.get(endpoint, headers=scraper.headers) as response:
                     print(f"   Status: {response.status}")
 
                     if response.status == 200:
@@ -75,7 +71,7 @@ async def test_fatsoma_api():
             endpoint = f"{base_url}/categories"
             print(f"\n📍 Trying: {endpoint}")
 
-            async with session.get(endpoint, headers=headers) as response:
+            async with session.get(endpoint, headers=scraper.headers) as response:
                 print(f"   Status: {response.status}")
 
                 if response.status == 200:
@@ -3,8 +3,10 @@ import asyncio
 from api_scraper import FatsomaAPIScraper
 
 async def test():
-    scraper = FatsomaAPIScraper()
+    async with FatsomaAPIScraper() as scraper:
+        await run_checks(scraper)
 
+async def run_checks(scraper: FatsomaAPIScraper):
     print("=" * 80)
     print("TESTING UPDATED SCRAPER - FUTURE EVENTS ONLY")
     print("=" * 80)
@@ -0,0 +1,29 @@
+"""
+Shared setup for the unit tests
+
+The app modules keep their state next to the code or in the working
+directory (models.py opens ./fatsoma_events.db on import), so every run
+gets a scratch directory for those before any test module is imported.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+SCRATCH_DIR = Path(tempfile.mkdtemp(prefix="fatsoma-tests-"))
+os.environ.update({
+    "SYNC_STATE_PATH": str(SCRATCH_DIR / "sync_state.json"),
+    "SYNC_LOCK_PATH": str(SCRATCH_DIR / "sync.lock"),
+    "RESPONSE_CACHE_GENERATION_PATH": str(SCRATCH_DIR / "response_cache.generation"),
+    "FATSOMA_HTTP_CACHE": "false",
+    "SUPABASE_URL": os.environ.get("SUPABASE_URL", "http://localhost"),
+    "SUPABASE_SERVICE_KEY": os.environ.get("SUPABASE_SERVICE_KEY", "test-key"),
+})
+
+
+def pytest_configure(config):
+    # After pytest has resolved testpaths against the invocation directory
+    os.chdir(SCRATCH_DIR)
@@ -0,0 +1,130 @@
+"""
+In-memory stand-in for the async Supabase client (just the query builder calls the syncer uses)
+
+Rows live in plain lists per table; upserts match on on_conflict, inserts get
+a generated id. fail_on lets a test make the next matching request raise.
+"""
+import uuid
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.op = "select"
+        self.payload = None
+        self.options = {}
+        self.filters = []
+        self.row_range = None
+
+    def select(self, columns="*", **kwargs):
+        self.op = "select"
+        return self
+
+    def insert(self, payload):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict=None, ignore_duplicates=False):
+        self.op, self.payload = "upsert", payload
+        self.options = {"on_conflict": on_conflict, "ignore_duplicates": ignore_duplicates}
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        values = set(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def range(self, start, end):
+        self.row_range = (start, end)
+        return self
+
+    async def execute(self):
+        self.client.requests.append((self.table, self.op))
+        for failure in self.client.failures:
+            if failure["table"] == self.table and failure["op"] == self.op:
+                if failure["skip"]:
+                    failure["skip"] -= 1
+                    break
+                self.client.failures.remove(failure)
+                raise failure["error"]
+
+        rows = self.client.tables.setdefault(self.table, [])
+        matching = [row for row in rows if all(match(row) for match in self.filters)]
+
+        if self.op == "select":
+            if self.row_range:
+                matching = matching[self.row_range[0]:self.row_range[1] + 1]
+            return FakeResponse([dict(row) for row in matching])
+
+        if self.op == "update":
+            for row in matching:
+                row.update(self.payload)
+            return FakeResponse([dict(row) for row in matching])
+
+        if self.op == "delete":
+            for row in matching:
+                rows.remove(row)
+            return FakeResponse([dict(row) for row in matching])
+
+        written = []
+        for new_row in self.payload if isinstance(self.payload, list) else [self.payload]:
+            conflict = self.options.get("on_conflict")
+            current = next((row for row in rows if conflict and row.get(conflict) == new_row.get(conflict)), None)
+            if current is not None:
+                if self.options.get("ignore_duplicates"):
+                    continue
+                current.update(new_row)
+                written.append(dict(current))
+            else:
+                row = dict(new_row)
+                row.setdefault("id", str(uuid.uuid4()))
+                rows.append(row)
+                written.append(dict(row))
+        return FakeResponse(written)
+
+
+class FakeRpc:
+    def __init__(self, name):
+        self.name = name
+
+    async def execute(self):
+        raise Exception(f"function {self.name} does not exist")
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = {}
+        self.requests = []
+        self.failures = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params=None):
+        return FakeRpc(name)
+
+    def fail_on(self, table, op, skip=0, error=None):
+        """Make an `op` request on `table` raise, after letting `skip` of them through"""
+        self.failures.append({"table": table, "op": op, "skip": skip,
+                              "error": error or Exception(f"{op} on {table} failed")})
+
+    def rows(self, table):
+        return self.tables.get(table, [])
@@ -0,0 +1,288 @@
+import asyncio
+import json
+
+import pytest
+
+import api_scraper
+import page_fetcher
+from api_scraper import FatsomaAPIScraper
+
+
+def ticket_options(*names):
+    return {"data": [{"attributes": {"name": name, "price": 500, "on-sale": True}} for name in names]}
+
+
+def parsed_event(event_id, price_min=0.0, price_max=0.0):
+    return {"event_id": event_id, "tickets": []}, price_min, price_max
+
+
+@pytest.fixture
+def scraper():
+    return FatsomaAPIScraper(ticket_concurrency=3, requests_per_second=0, http_cache=None)
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay, *args: sleep(0, *args))
+
+
+def test_enrichment_is_bounded_by_ticket_concurrency(scraper, monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.005)
+        in_flight -= 1
+        return 200, ticket_options("GA")
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+    parsed = [parsed_event(f"e{i}") for i in range(10)]
+
+    asyncio.run(scraper._enrich_tickets(parsed, None))
+
+    assert peak == 3
+    assert all(event["tickets"][0]["ticket_type"] == "GA" for event, _, _ in parsed)
+
+
+def test_ticket_options_are_retried_on_rate_limits_and_server_errors(scraper, monkeypatch, no_backoff):
+    statuses = [429, 502, 200]
+
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        status = statuses.pop(0)
+        return status, ticket_options("Early Bird") if status == 200 else None
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+
+    tickets = asyncio.run(scraper._get_tickets("e1", 5.0, 10.0, None))
+
+    assert [ticket["ticket_type"] for ticket in tickets] == ["Early Bird"]
+    assert statuses == []
+
+
+def test_client_errors_are_not_retried(scraper, monkeypatch, no_backoff):
+    calls = []
+
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        calls.append(url)
+        return 404, None
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+
+    assert asyncio.run(scraper._fetch_ticket_options("e1", None)) is None
+    assert len(calls) == 1
+
+
+def test_failed_events_fall_back_without_failing_the_batch(scraper, monkeypatch, no_backoff):
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        if "/broken/" in url:
+            raise asyncio.TimeoutError()
+        return 200, ticket_options("GA", "VIP")
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+    parsed = [parsed_event("ok"), parsed_event("broken", 4.0, 8.0), parsed_event("broken", 0, 0)]
+
+    asyncio.run(scraper._enrich_tickets(parsed, None))
+
+    assert [ticket["ticket_type"] for ticket in parsed[0][0]["tickets"]] == ["GA", "VIP"]
+    assert parsed[1][0]["tickets"] == [
+        {"ticket_type": "General Admission", "price": 4.0, "currency": "GBP", "availability": "Available"}
+    ]
+    assert parsed[2][0]["tickets"] == []
+
+
+def feed_page(*events, last=False):
+    """A /events feed page; events are (event_id, city) pairs"""
+    return {
+        "data": [{
+            "id": event_id,
+            "attributes": {"name": event_id, "starts-at": "2030-01-01T22:00:00Z", "price-min": 500},
+            "relationships": {"location": {"data": {"id": f"loc-{city}"}}},
+        } for event_id, city in events],
+        "included": [{"id": f"loc-{city}", "attributes": {"name": "Venue", "city": city}} for _, city in events],
+        "links": {} if last else {"next": "more"},
+    }
+
+
+class FakeFetcher:
+    def __init__(self, pages, fail_after=None):
+        self.pages = pages
+        self.fail_after = fail_after
+        self.reached_end = False
+        self.hit_max_pages = False
+
+    async def iter_pages(self, url_template, ordered=True):
+        for number, page in enumerate(self.pages, 1):
+            if number == self.fail_after:
+                raise RuntimeError("connection reset")
+            yield number, page
+        self.reached_end = True
+
+
+@pytest.fixture
+def feed(scraper, monkeypatch):
+    """Serve scraper.stream_catalog from fake pages, recording ticket-options requests"""
+    requested = []
+
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        requested.append(url.split("/events/")[1].split("/")[0])
+        return 200, ticket_options("GA")
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+
+    def serve(pages, fail_after=None):
+        monkeypatch.setattr(scraper, "_page_fetcher", lambda session, max_pages: FakeFetcher(pages, fail_after))
+        return requested
+
+    return serve
+
+
+def collect(scraper, **kwargs):
+    async def run():
+        async with scraper:
+            return [event["event_id"] async for batch in scraper.stream_catalog(**kwargs) for event in batch]
+
+    return asyncio.run(run())
+
+
+PAGES = [
+    feed_page(("a", "London"), ("b", "Leeds"), ("c", "London")),
+    feed_page(("d", "London"), ("e", "Paris"), last=True),
+]
+
+
+def test_only_selected_events_are_enriched_and_yielded(scraper, feed):
+    requested = feed(PAGES)
+    seen = []
+    budget = {"London": 2}
+
+    def select(event):
+        seen.append(event["event_id"])
+        if not budget.get(event["city"]):
+            return False
+        budget[event["city"]] -= 1
+        return True
+
+    events = collect(scraper, select=select)
+
+    assert seen == ["a", "b", "c", "d", "e"]  # Feed order
+    assert sorted(events) == ["a", "c"]
+    assert sorted(requested) == ["a", "c"]
+    assert scraper.last_crawl["event_ids"] == {"a", "b", "c", "d", "e"}
+    assert scraper.last_crawl["complete"] and scraper.last_crawl["reached_end"]
+    assert scraper._catalog is None  # A filtered crawl isn't a catalog snapshot
+
+
+def test_complete_crawl_replaces_the_snapshot(scraper, feed):
+    requested = feed(PAGES)
+
+    assert sorted(collect(scraper)) == ["a", "b", "c", "d", "e"]
+    assert len(requested) == 5
+    assert sorted(e["event_id"] for e in scraper._catalog_view("london")) == ["a", "c", "d"]
+
+
+def test_failed_crawl_keeps_the_previous_snapshot(scraper, feed):
+    feed(PAGES)
+    collect(scraper)
+    feed(PAGES, fail_after=2)
+
+    assert set(collect(scraper)) <= {"a", "b", "c"}
+    assert not scraper.last_crawl["complete"]
+    assert len(scraper._catalog) == 5
+
+
+@pytest.fixture
+def manual_config(scraper, tmp_path):
+    def write(config):
+        scraper.manual_config_path = tmp_path / "manual_organizers.json"
+        scraper.manual_config_path.write_text(json.dumps(config))
+    return write
+
+
+@pytest.fixture
+def api(scraper, monkeypatch, no_backoff):
+    """Answer the scraper's requests from {url fragment: status}; events/pages default to 200"""
+    statuses = {}
+
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        for fragment, status in statuses.items():
+            if fragment in url:
+                if isinstance(status, Exception):
+                    raise status
+                if status != 200:
+                    return status, None
+        if "/ticket-options" in url:
+            return 200, ticket_options("GA")
+        if "/pages/" in url and "/events" in url:
+            return 200, {"data": [], "links": {}}
+        if "/pages/" in url:
+            return 200, {"data": {"id": "page-" + url.rsplit("/", 1)[1]}}
+        event_id = url.split("/events/")[1].split("?")[0]
+        return 200, {"data": feed_page((event_id, "London"))["data"][0],
+                     "included": feed_page((event_id, "London"))["included"]}
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+    monkeypatch.setattr(page_fetcher, "cached_get_json", cached_get_json)
+    return statuses
+
+
+def fetch_manual(scraper):
+    async def run():
+        async with scraper:
+            return sorted(event["event_id"] for event in await scraper.fetch_manual_events())
+
+    return asyncio.run(run())
+
+
+CONFIG = {
+    "manual_event_uuids": [{"event_id": "m1"}, {"event_id": "m2"}],
+    "organizers": [{"name": "Ink", "vanity_url": "ink"}],
+}
+
+
+def test_manual_fetch_is_complete_when_every_entry_answered(scraper, manual_config, api):
+    manual_config(CONFIG)
+    api["/events/m2?"] = 404  # Deleted upstream - nothing to fetch, not a failure
+
+    assert fetch_manual(scraper) == ["m1"]
+    assert scraper.last_manual_fetch == {"complete": True, "failed": 0}
+
+
+@pytest.mark.parametrize("fragment, failure", [
+    ("/events/m2?", 503),
+    ("/events/m2?", asyncio.TimeoutError()),
+    ("/pages/ink", 500),
+    ("/pages/page-ink/events", 502),
+])
+def test_failed_manual_entries_make_the_fetch_incomplete(scraper, manual_config, api, fragment, failure):
+    manual_config(CONFIG)
+    api[fragment] = failure
+
+    assert "m1" in fetch_manual(scraper)
+    assert scraper.last_manual_fetch == {"complete": False, "failed": 1}
+
+
+def test_refresh_leaves_out_events_whose_tickets_could_not_be_fetched(scraper, monkeypatch, no_backoff):
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        if "/broken/" in url:
+            return 503, None
+        if "/empty/" in url:
+            return 200, {"data": []}
+        return 200, ticket_options("GA")
+
+    monkeypatch.setattr(api_scraper, "cached_get_json", cached_get_json)
+    stored = [{"ticket_type": "Early Bird", "price": 5.0, "currency": "GBP", "availability": "Available"}]
+    events = [{"event_id": event_id, "tickets": list(stored)} for event_id in ("ok", "broken", "empty")]
+
+    async def run():
+        async with scraper:
+            return await scraper.refresh_tickets(events)
+
+    refreshed = asyncio.run(run())
+
+    assert [event["event_id"] for event in refreshed] == ["ok"]
+    assert refreshed[0]["tickets"][0]["ticket_type"] == "GA"
+    assert events[1]["tickets"] == stored and events[2]["tickets"] == stored
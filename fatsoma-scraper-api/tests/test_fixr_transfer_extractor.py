@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from fixr_transfer_extractor import FixrTransferExtractor
+
+URL = "https://fixr.co/transfer-ticket/2156d6630b191850eb92a326"
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    """An extractor whose tiers answer from `answers` ({tier: result}) instead of the network"""
+    extractor = FixrTransferExtractor()
+    extractor.answers = {}
+    extractor.calls = []
+
+    def tier(name):
+        async def fetch(transfer_url):
+            extractor.calls.append(name)
+            return extractor.answers.get(name)
+        return fetch
+
+    monkeypatch.setattr(extractor, "_extract_via_http", tier("http"))
+    monkeypatch.setattr(extractor, "_extract_via_data_route", tier("next_data_route"))
+    monkeypatch.setattr(extractor, "_extract_via_browser", tier("browser"))
+    return extractor
+
+
+def attempts(extractor):
+    return {tier: stats["attempts"] for tier, stats in extractor.tier_stats.items()}
+
+
+def test_data_route_is_not_attempted_without_a_build_id(extractor):
+    extractor.answers["browser"] = {"name": "Event"}
+
+    assert asyncio.run(extractor._extract(URL)) == {"name": "Event"}
+    assert extractor.calls == ["http", "browser"]
+    assert attempts(extractor) == {"http": 1, "next_data_route": 0, "browser": 1}
+
+
+def test_data_route_is_attempted_once_a_build_id_is_known(extractor):
+    extractor.build_id = "build-1"
+    extractor.answers["next_data_route"] = {"name": "Event"}
+
+    assert asyncio.run(extractor._extract(URL)) == {"name": "Event"}
+    assert extractor.calls == ["http", "next_data_route"]
+    assert attempts(extractor) == {"http": 1, "next_data_route": 1, "browser": 0}
+    assert extractor.get_stats()["tiers"]["next_data_route"]["hit_rate"] == 1.0
+
+
+def test_concurrent_extractions_of_one_transfer_code_share_a_result(extractor):
+    extractor.answers["http"] = {"name": "Event"}
+
+    async def run():
+        return await asyncio.gather(
+            extractor.extract_from_transfer_link(URL),
+            extractor.extract_from_transfer_link(URL + "/"),
+            extractor.extract_from_transfer_link(URL + "?utm_source=share"),
+        )
+
+    assert asyncio.run(run()) == [{"name": "Event"}] * 3
+    assert extractor.calls == ["http"]
+    assert asyncio.run(extractor.extract_from_transfer_link(URL)) == {"name": "Event"}
+    assert extractor.calls == ["http"]
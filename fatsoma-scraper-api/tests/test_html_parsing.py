@@ -0,0 +1,36 @@
+import importlib
+import logging
+import sys
+
+import pytest
+
+import html_parsing
+
+
+@pytest.fixture
+def reload_html_parsing():
+    yield lambda: importlib.reload(html_parsing)
+    importlib.reload(html_parsing)
+
+
+def test_missing_lxml_falls_back_with_a_warning(monkeypatch, caplog, reload_html_parsing):
+    monkeypatch.setitem(sys.modules, "lxml", None)  # Makes `import lxml` raise ImportError
+
+    with caplog.at_level(logging.WARNING, logger="html_parsing"):
+        module = reload_html_parsing()
+
+    assert module.PARSER == "html.parser"
+    assert "lxml is not installed" in caplog.text
+    assert module.make_soup("<p>ok</p>").p.string == "ok"
+
+
+def test_zero_dom_extractors():
+    html = (
+        '<a href="/e/1">One</a><a href="/about">About</a><a href="/e/1">Again</a>'
+        '<script id="__NEXT_DATA__" type="application/json">{"buildId": "b1"}</script>'
+        '<p>2156d663-0b19-1850-eb92-a3262156d663</p>'
+    )
+
+    assert html_parsing.find_links(html, r"^/e/") == ["/e/1"]
+    assert html_parsing.extract_next_data(html) == {"buildId": "b1"}
+    assert html_parsing.find_uuids(html + html) == ["2156d663-0b19-1850-eb92-a3262156d663"]
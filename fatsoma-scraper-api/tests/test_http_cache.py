@@ -0,0 +1,119 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from http_cache import HTTPCache, cached_get_json
+
+URL = "https://api.fatsoma.com/v1/events?page[number]=1"
+
+
+class FakeResponse:
+    def __init__(self, status, body=None, headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+    async def text(self):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeSession:
+    """Replies from a list of FakeResponses, recording the request headers"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(cache_dir=str(tmp_path / "http_cache"))
+
+
+def fetch(session, cache):
+    return asyncio.run(cached_get_json(session, URL, {"Accept": "application/json"}, cache))
+
+
+def test_304_is_served_from_the_cached_body(cache):
+    body = json.dumps({"data": [{"id": "e1"}]})
+    session = FakeSession(
+        FakeResponse(200, body, {"ETag": '"v1"', "Last-Modified": "Sat, 01 Nov 2025 10:00:00 GMT"}),
+        FakeResponse(304),
+    )
+
+    assert fetch(session, cache) == (200, {"data": [{"id": "e1"}]})
+    assert fetch(session, cache) == (200, {"data": [{"id": "e1"}]})
+
+    assert "If-None-Match" not in session.requests[0]
+    assert session.requests[1]["If-None-Match"] == '"v1"'
+    assert session.requests[1]["If-Modified-Since"] == "Sat, 01 Nov 2025 10:00:00 GMT"
+    assert session.requests[1]["Accept"] == "application/json"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_response_replaces_the_entry(cache):
+    session = FakeSession(
+        FakeResponse(200, '{"v": 1}', {"ETag": '"v1"'}),
+        FakeResponse(200, '{"v": 2}', {"ETag": '"v2"'}),
+        FakeResponse(304),
+    )
+
+    fetch(session, cache)
+    assert fetch(session, cache) == (200, {"v": 2})
+    assert fetch(session, cache) == (200, {"v": 2})
+    assert session.requests[2]["If-None-Match"] == '"v2"'
+
+
+def test_responses_without_validators_are_not_cached(cache):
+    session = FakeSession(FakeResponse(200, '{"v": 1}'), FakeResponse(200, '{"v": 1}'))
+
+    fetch(session, cache)
+    fetch(session, cache)
+
+    assert cache.get(URL) is None
+    assert "If-None-Match" not in session.requests[1]
+
+
+def test_errors_are_passed_through_and_keep_the_entry(cache):
+    session = FakeSession(FakeResponse(200, '{"v": 1}', {"ETag": '"v1"'}), FakeResponse(503))
+
+    fetch(session, cache)
+
+    assert fetch(session, cache) == (503, None)
+    assert cache.get(URL)["etag"] == '"v1"'
+
+
+def test_expired_entries_are_not_revalidated(cache):
+    cache.store(URL, '"v1"', None, '{"v": 1}')
+    old = time.time() - cache.ttl_seconds - 60
+    os.utime(cache._path(URL), (old, old))
+
+    assert cache.get(URL) is None
+    assert not cache._path(URL).exists()
+
+
+def test_prune_drops_oldest_entries_over_the_size_limit(tmp_path):
+    cache = HTTPCache(cache_dir=str(tmp_path), max_bytes=10 ** 6)
+    for i in range(3):
+        cache.store(f"{URL}&n={i}", f'"v{i}"', None, "x" * 1000)
+        stamp = time.time() - 100 + i
+        os.utime(cache._path(f"{URL}&n={i}"), (stamp, stamp))
+
+    cache.max_bytes = 2500
+    cache.prune()
+
+    assert cache.get(f"{URL}&n=0") is None
+    assert cache.get(f"{URL}&n=2") is not None
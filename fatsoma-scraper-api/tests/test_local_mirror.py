@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from local_mirror import LocalMirror
+from models import Event, SessionLocal, Ticket
+
+
+@pytest.fixture
+def mirror():
+    def clear():
+        session = SessionLocal()
+        session.query(Ticket).delete()
+        session.query(Event).delete()
+        session.commit()
+        session.close()
+
+    clear()
+    yield LocalMirror()
+    clear()
+
+
+def scraped(event_id, city="London", days=1, *ticket_types, **fields):
+    return dict({
+        "event_id": event_id,
+        "name": f"Event {event_id}",
+        "city": city,
+        "date": datetime.utcnow() + timedelta(days=days),
+        "end_datetime": "scraper-only",
+        "tickets": [{"ticket_type": name, "price": 5.0, "currency": "GBP", "availability": "Available"}
+                    for name in ticket_types],
+    }, **fields)
+
+
+def stored_tickets(event_id):
+    session = SessionLocal()
+    try:
+        event = session.query(Event).filter(Event.event_id == event_id).one()
+        return sorted(ticket.ticket_type for ticket in event.tickets)
+    finally:
+        session.close()
+
+
+def test_save_events_upserts_and_replaces_tickets(mirror):
+    mirror.save_events([scraped("a", "London", 1, "GA", "VIP"), scraped("b", " Leeds ", 2, "GA")])
+    written = mirror.save_events([scraped("a", "London", 1, "Early Bird", name="Renamed")])
+
+    session = SessionLocal()
+    events = {event.event_id: event for event in session.query(Event)}
+    ticket_count = session.query(Ticket).count()
+    session.close()
+    assert written == 1
+    assert sorted(events) == ["a", "b"]
+    assert events["a"].name == "Renamed"
+    assert events["b"].city_key == "leeds"
+    assert stored_tickets("a") == ["Early Bird"]
+    assert stored_tickets("b") == ["GA"]
+    assert ticket_count == 2
+
+
+def test_replace_tickets_only_touches_known_events(mirror):
+    mirror.save_events([scraped("a", "London", 1, "GA")])
+
+    assert mirror.replace_tickets("a", [{"ticket_type": "Final Release", "price": 9.0, "sold_out": True}])
+    assert not mirror.replace_tickets("missing", [{"ticket_type": "GA"}])
+    assert stored_tickets("a") == ["Final Release"]
+
+
+def test_upcoming_events_are_per_city_in_date_order(mirror):
+    mirror.save_events([
+        scraped("later", "London", 3, "GA"),
+        scraped("past", "London", -2),
+        scraped("soon", "LONDON", 1),
+        scraped("elsewhere", "Leeds", 1),
+    ])
+
+    events = mirror.get_upcoming_events("london ")
+
+    assert [event["event_id"] for event in events] == ["soon", "later"]
+    assert events[1]["tickets"][0]["ticket_type"] == "GA"
+    assert "end_datetime" not in events[0]
+    assert [event["event_id"] for event in mirror.get_upcoming_events("London", limit=1)] == ["soon"]
+
+
+def test_delete_events_removes_their_tickets(mirror):
+    mirror.save_events([scraped("a", "London", 1, "GA"), scraped("b", "London", 1, "GA")])
+
+    assert mirror.delete_events(["a", "unknown"]) == 1
+    assert mirror.delete_events([]) == 0
+
+    session = SessionLocal()
+    assert [event.event_id for event in session.query(Event)] == ["b"]
+    assert session.query(Ticket).count() == 1
+    session.close()
@@ -0,0 +1,17 @@
+from models import fts_query
+
+
+def test_every_word_becomes_a_quoted_prefix():
+    assert fts_query("ministry of sound") == '"ministry"* "of"* "sound"*'
+
+
+def test_fts_syntax_in_user_input_is_neutralised():
+    assert fts_query('NG-ONE "late" OR name:*') == '"NG"* "ONE"* "late"* "OR"* "name"*'
+
+
+def test_no_words_gives_an_empty_query():
+    assert fts_query("  -- ** ") == ""
+
+
+def test_unicode_words_are_kept():
+    assert fts_query("Café") == '"Café"*'
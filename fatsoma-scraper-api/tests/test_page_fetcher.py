@@ -0,0 +1,165 @@
+import asyncio
+
+import page_fetcher
+from page_fetcher import ConcurrentPageFetcher, HostRateLimiter
+
+URL_TEMPLATE = "https://api.example.com/events?page[number]={page}"
+
+
+def page(number, has_next=True, events=1):
+    return {"data": [{"id": f"{number}-{i}"} for i in range(events)],
+            "links": {"next": "more"} if has_next else {}}
+
+
+def crawl(responses, max_pages=50, concurrency=3, ordered=True):
+    """Run iter_pages over {page_number: response} (missing pages are empty)"""
+    fetcher = ConcurrentPageFetcher(None, {}, concurrency=concurrency,
+                                    rate_limiter=HostRateLimiter(0), max_pages=max_pages)
+    requested = []
+
+    async def fetch_json(url):
+        number = int(url.rsplit("=", 1)[1])
+        requested.append(number)
+        await asyncio.sleep(0.001 * (number % 3))  # Finish out of order
+        return responses.get(number, {"data": []})
+
+    fetcher.fetch_json = fetch_json
+
+    async def run():
+        return [number async for number, _ in fetcher.iter_pages(URL_TEMPLATE, ordered=ordered)]
+
+    return asyncio.run(run()), fetcher, requested
+
+
+def test_stops_at_page_without_next_link():
+    pages, fetcher, requested = crawl({1: page(1), 2: page(2), 3: page(3, has_next=False), 4: page(4)})
+
+    assert pages == [1, 2, 3]
+    assert fetcher.reached_end
+
+
+def test_stops_at_empty_page():
+    pages, fetcher, _ = crawl({1: page(1), 2: page(2)})
+
+    assert pages == [1, 2]
+    assert fetcher.reached_end
+
+
+def test_unordered_yields_every_page():
+    pages, fetcher, _ = crawl({n: page(n, has_next=n < 6) for n in range(1, 7)}, ordered=False)
+
+    assert sorted(pages) == [1, 2, 3, 4, 5, 6]
+    assert fetcher.reached_end
+
+
+def test_max_pages_is_not_the_end_of_the_feed():
+    pages, fetcher, requested = crawl({n: page(n) for n in range(1, 20)}, max_pages=4)
+
+    assert pages == [1, 2, 3, 4]
+    assert max(requested) == 4
+    assert not fetcher.reached_end
+    assert fetcher.hit_max_pages
+
+
+def test_ending_or_failing_before_the_cap_is_not_hitting_it():
+    _, ended, _ = crawl({1: page(1), 2: page(2, has_next=False)}, max_pages=4)
+    _, failed, _ = crawl({1: page(1), 2: None, 3: page(3), 4: page(4)}, max_pages=4)
+
+    assert not ended.hit_max_pages
+    assert not failed.hit_max_pages
+
+
+def test_failed_page_truncates_crawl_without_reaching_end():
+    responses = {1: page(1), 2: None, 3: page(3), 4: page(4, has_next=False)}
+    pages, fetcher, _ = crawl(responses)
+
+    assert pages == [1]
+    assert not fetcher.reached_end
+
+
+def test_failure_after_the_end_still_counts_as_reached():
+    responses = {1: page(1), 2: page(2, has_next=False), 3: None, 4: None}
+    pages, fetcher, _ = crawl(responses, concurrency=4)
+
+    assert pages == [1, 2]
+    assert fetcher.reached_end
+
+
+def test_fetch_json_retries_rate_limits(monkeypatch):
+    statuses = [429, 503, 200]
+    limiter = HostRateLimiter(100)
+
+    async def cached_get_json(session, url, headers, cache):
+        status = statuses.pop(0)
+        return status, page(1) if status == 200 else None
+
+    monkeypatch.setattr(page_fetcher, "cached_get_json", cached_get_json)
+    fetcher = ConcurrentPageFetcher(None, {}, rate_limiter=limiter, retry_backoff=0)
+
+    assert asyncio.run(fetcher.fetch_json(URL_TEMPLATE.format(page=1))) == page(1)
+    assert statuses == []
+    assert limiter.stats["rate_limited"] == 1
+
+
+def test_fetch_json_gives_up_on_client_errors(monkeypatch):
+    calls = []
+
+    async def cached_get_json(session, url, headers, cache):
+        calls.append(url)
+        return 404, None
+
+    monkeypatch.setattr(page_fetcher, "cached_get_json", cached_get_json)
+    fetcher = ConcurrentPageFetcher(None, {}, rate_limiter=HostRateLimiter(0), retry_backoff=0)
+
+    assert asyncio.run(fetcher.fetch_json(URL_TEMPLATE.format(page=1))) is None
+    assert len(calls) == 1
+
+
+def test_rate_limiter_halves_on_429_down_to_the_floor():
+    limiter = HostRateLimiter(16, min_requests_per_second=1)
+    url = "https://api.example.com/events"
+
+    limiter.on_rate_limited(url)
+    assert limiter.current_rate(url) == 8
+    for _ in range(10):
+        limiter.on_rate_limited(url)
+    assert limiter.current_rate(url) == 1
+
+
+def test_rate_limiter_recovers_additively_per_host():
+    limiter = HostRateLimiter(10, recovery_step=2)
+    url = "https://api.example.com/events"
+    other = "https://www.example.com/"
+
+    limiter.on_rate_limited(url)
+    limiter.on_success(url)
+    assert limiter.current_rate(url) == 7
+    assert limiter.current_rate(other) == 10
+
+    for _ in range(5):
+        limiter.on_success(url)
+    assert limiter.current_rate(url) == 10
+    assert limiter.get_status()["throttled_hosts"] == {}
+
+
+def test_rate_limiter_spaces_out_requests_at_the_reduced_rate():
+    limiter = HostRateLimiter(100)
+    url = "https://api.example.com/events"
+    limiter.on_rate_limited(url)
+    limiter.on_rate_limited(url)  # 25 requests/second -> 40ms apart
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await limiter.acquire(url)
+        return loop.time() - start
+
+    assert asyncio.run(run()) >= 0.11
+
+
+def test_disabled_rate_limiter_ignores_429s():
+    limiter = HostRateLimiter(0)
+    limiter.on_rate_limited("https://api.example.com/events")
+
+    assert limiter.get_status()["throttled_hosts"] == {}
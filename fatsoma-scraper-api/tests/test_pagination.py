@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from main import after_cursor, encode_cursor
+from models import Event, SessionLocal
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    session.query(Event).delete()
+    start = datetime(2030, 1, 1, 22)
+    # Several events share a date, a few have none
+    for i in range(12):
+        date = None if i % 5 == 0 else start + timedelta(days=i // 3)
+        session.add(Event(event_id=f"e{i}", name=f"Event {i}", date=date))
+    session.commit()
+    yield session
+    session.query(Event).delete()
+    session.commit()
+    session.close()
+
+
+def walk(db, page_size):
+    seen = []
+    cursor = None
+    while True:
+        query = db.query(Event).order_by(Event.date, Event.id)
+        if cursor:
+            query = query.filter(after_cursor(cursor))
+        page = query.limit(page_size).all()
+        seen.extend(event.event_id for event in page)
+        if len(page) < page_size:
+            return seen
+        cursor = encode_cursor(page[-1])
+
+
+@pytest.mark.parametrize("page_size", [1, 2, 5, 12, 50])
+def test_keyset_pages_cover_every_event_once_in_order(db, page_size):
+    expected = [event.event_id for event in db.query(Event).order_by(Event.date, Event.id)]
+
+    assert walk(db, page_size) == expected
+
+
+def test_invalid_cursor_is_a_400():
+    with pytest.raises(HTTPException) as error:
+        after_cursor("not-a-cursor")
+    assert error.value.status_code == 400
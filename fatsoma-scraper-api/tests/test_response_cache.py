@@ -0,0 +1,84 @@
+import time
+
+from response_cache import ResponseCache
+
+
+def test_bump_invalidates_entries():
+    cache = ResponseCache()
+    cache.put("/events", "body", cache.generation)
+    assert cache.get("/events") == "body"
+
+    cache.bump()
+    assert cache.get("/events") is None
+
+
+def test_value_built_across_a_bump_is_not_stored():
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.bump()  # A sync finished while the response was being built
+    cache.put("/events", "stale body", generation)
+
+    assert cache.get("/events") is None
+
+
+def test_bump_in_another_process_invalidates_via_shared_file(tmp_path):
+    path = tmp_path / "response_cache.generation"
+    reader = ResponseCache(generation_path=str(path), shared_check_seconds=0)
+    writer = ResponseCache(generation_path=str(path))
+    reader.put("/events", "body", reader.generation)
+
+    writer.bump()
+
+    assert reader.get("/events") is None
+    reader.put("/events", "fresh body", reader.generation)
+    assert reader.get("/events") == "fresh body"
+
+
+def test_shared_file_is_only_checked_on_an_interval(tmp_path, monkeypatch):
+    path = tmp_path / "response_cache.generation"
+    reader = ResponseCache(generation_path=str(path), shared_check_seconds=0.05)
+    reads = []
+    read_shared_token = reader._read_shared_token
+    monkeypatch.setattr(reader, "_read_shared_token", lambda: reads.append(1) or read_shared_token())
+    reader.put("/events", "body", reader.generation)
+
+    ResponseCache(generation_path=str(path)).bump()
+
+    assert [reader.get("/events") for _ in range(100)] == ["body"] * 100
+    assert reads == []
+    time.sleep(0.06)
+    assert reader.get("/events") is None
+    assert reader.get("/events") is None
+    assert len(reads) == 1
+
+
+def test_entries_expire_after_ttl():
+    cache = ResponseCache(ttl_seconds=0.01)
+    cache.put("/events", "body", cache.generation)
+    time.sleep(0.02)
+
+    assert cache.get("/events") is None
+
+
+def test_lru_is_bounded():
+    cache = ResponseCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key, cache.generation)
+
+    assert cache.get("a") is None
+    assert cache.get("c") == "c"
+
+
+def test_etag_is_stable_and_content_based():
+    assert ResponseCache.make_etag(b"body") == ResponseCache.make_etag(b"body")
+    assert ResponseCache.make_etag(b"body") != ResponseCache.make_etag(b"other")
+
+
+def test_etag_matching():
+    etag = ResponseCache.make_etag(b"body")
+
+    assert ResponseCache.etag_matches(etag, etag)
+    assert ResponseCache.etag_matches(etag, f'"other", W/{etag}')
+    assert ResponseCache.etag_matches(etag, "*")
+    assert not ResponseCache.etag_matches(etag, '"other"')
+    assert not ResponseCache.etag_matches(etag, None)
@@ -0,0 +1,169 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from fake_supabase import FakeSupabase
+from supabase_syncer import SupabaseSyncer
+
+
+@pytest.fixture
+def syncer():
+    # _build_supabase_event/_content_hash don't touch the clients
+    return SupabaseSyncer.__new__(SupabaseSyncer)
+
+
+def scraped_event(**overrides):
+    event = {
+        'event_id': 'abc',
+        'name': 'Freshers Launch',
+        'company': 'Ink',
+        'date': datetime(2030, 9, 20),
+        'time': '22:00',
+        'last_entry': '23:30',
+        'location': 'The Cell',
+        'city': 'Nottingham',
+        'age_restriction': '18+',
+        'url': 'https://www.fatsoma.com/e/abc',
+        'image_url': 'https://media.fatsoma.com/abc.jpg',
+        'tickets': [
+            {'ticket_type': 'Early Bird', 'price': 5.0, 'currency': 'GBP', 'availability': 'Sold Out'},
+            {'ticket_type': 'GA', 'price': 8.0, 'currency': 'GBP', 'availability': 'Available'},
+        ],
+    }
+    event.update(overrides)
+    return event
+
+
+def fingerprint(syncer, event, logo=""):
+    row, tickets = syncer._build_supabase_event(event)
+    return syncer._content_hash(row, tickets, logo)
+
+
+def test_hash_is_stable_across_calls_and_key_order(syncer):
+    event = scraped_event()
+    reordered = dict(reversed(list(event.items())))
+    reordered['tickets'] = [dict(reversed(list(t.items()))) for t in event['tickets']]
+
+    assert fingerprint(syncer, event) == fingerprint(syncer, scraped_event())
+    assert fingerprint(syncer, event) == fingerprint(syncer, reordered)
+
+
+def test_hash_ignores_fields_that_are_not_synced(syncer):
+    assert fingerprint(syncer, scraped_event()) == fingerprint(syncer, scraped_event(source_updated_at='x'))
+
+
+@pytest.mark.parametrize("change", [
+    {'name': 'Freshers Launch II'},
+    {'last_entry': '23:45'},
+    {'tickets': [{'ticket_type': 'Early Bird', 'price': 5.0, 'currency': 'GBP', 'availability': 'Available'},
+                 {'ticket_type': 'GA', 'price': 8.0, 'currency': 'GBP', 'availability': 'Available'}]},
+])
+def test_hash_changes_with_synced_content(syncer, change):
+    assert fingerprint(syncer, scraped_event()) != fingerprint(syncer, scraped_event(**change))
+
+
+def test_hash_depends_on_ticket_order_and_logo(syncer):
+    event = scraped_event()
+    swapped = scraped_event(tickets=list(reversed(event['tickets'])))
+
+    assert fingerprint(syncer, event) != fingerprint(syncer, swapped)
+    assert fingerprint(syncer, event) != fingerprint(syncer, event, logo="https://logo")
+
+
+def test_building_the_row_does_not_modify_the_scraped_event(syncer):
+    event = scraped_event()
+    before = repr(event)
+    fingerprint(syncer, event)
+
+    assert repr(event) == before
+
+
+@pytest.fixture
+def db():
+    return FakeSupabase()
+
+
+@pytest.fixture
+def live_syncer(db):
+    syncer = SupabaseSyncer()
+    syncer._async_client = db
+    return syncer
+
+
+def sync(syncer, events, **kwargs):
+    return asyncio.run(syncer.sync_events(events, **kwargs))
+
+
+def tickets_by_event(db):
+    uuid_to_event_id = {row['id']: row['event_id'] for row in db.rows('fatsoma_events')}
+    tickets = {}
+    for ticket in db.rows('fatsoma_tickets'):
+        tickets.setdefault(uuid_to_event_id[ticket['event_id']], []).append(ticket['ticket_type'])
+    return tickets
+
+
+def renamed_tickets(*names):
+    return [{'ticket_type': name, 'price': 6.0, 'currency': 'GBP', 'availability': 'Available'} for name in names]
+
+
+def test_bulk_sync_replaces_tickets_and_skips_unchanged_events(live_syncer, db):
+    first = sync(live_syncer, [scraped_event(), scraped_event(event_id='def')])
+    again = sync(live_syncer, [scraped_event(), scraped_event(event_id='def', tickets=renamed_tickets('Final Release'))])
+
+    assert first['created'] == 2
+    assert (again['unchanged'], again['updated']) == (1, 1)
+    assert tickets_by_event(db) == {'abc': ['Early Bird', 'GA'], 'def': ['Final Release']}
+    assert all(row['content_hash'] for row in db.rows('fatsoma_events'))
+
+
+def test_failed_prefetch_does_not_duplicate_tickets(live_syncer, db, monkeypatch):
+    sync(live_syncer, [scraped_event()])
+
+    async def unavailable(event_ids):
+        raise Exception("timed out")
+
+    monkeypatch.setattr(live_syncer, '_fetch_existing_hashes', unavailable)
+    results = sync(live_syncer, [scraped_event(tickets=renamed_tickets('GA', 'VIP'))])
+
+    assert results['errors'] == 0
+    assert len(db.rows('fatsoma_events')) == 1
+    assert tickets_by_event(db) == {'abc': ['GA', 'VIP']}
+
+
+def test_row_by_row_retry_after_tickets_were_written_does_not_duplicate_them(live_syncer, db):
+    # The hash upsert (second fatsoma_events upsert) fails after the chunk's tickets went in
+    db.fail_on('fatsoma_events', 'upsert', skip=1)
+
+    results = sync(live_syncer, [scraped_event(), scraped_event(event_id='def')])
+
+    assert (results['success'], results['errors']) == (2, 0)
+    assert tickets_by_event(db) == {'abc': ['Early Bird', 'GA'], 'def': ['Early Bird', 'GA']}
+    assert all(row['content_hash'] for row in db.rows('fatsoma_events'))
+
+
+def test_failed_ticket_write_leaves_the_event_to_be_retried(live_syncer, db):
+    db.fail_on('fatsoma_tickets', 'insert')
+    db.fail_on('fatsoma_tickets', 'insert')
+
+    results = sync(live_syncer, [scraped_event()])
+    retry = sync(live_syncer, [scraped_event()])
+
+    assert results['errors'] == 1
+    assert retry['updated'] == 1
+    assert tickets_by_event(db) == {'abc': ['Early Bird', 'GA']}
+
+
+def test_close_releases_the_async_client_and_a_new_one_is_opened_on_demand():
+    syncer = SupabaseSyncer()
+
+    async def run():
+        client = await syncer.get_async_client()
+        session = client.postgrest.session
+        await syncer.close()
+        return client, session, await syncer.get_async_client()
+
+    client, session, reopened = asyncio.run(run())
+
+    assert session.is_closed
+    assert reopened is not client
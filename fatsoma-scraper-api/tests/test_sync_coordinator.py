@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from sync_coordinator import SyncCoordinator, SyncFileLock
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out waiting for the coordinator")
+        time.sleep(0.005)
+
+
+class Recorder:
+    """Sync jobs that record their runs and can be held open"""
+
+    def __init__(self):
+        self.runs = []
+        self.active = 0
+        self.peak = 0
+        self.gate = threading.Event()
+        self.gate.set()
+
+    async def run(self, name, **details):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            while not self.gate.is_set():
+                await asyncio.sleep(0.005)
+            self.runs.append(dict(details, name=name))
+        finally:
+            self.active -= 1
+
+    async def sync(self, mode, sources):
+        await self.run("events", mode=mode, sources=sources)
+
+    def job(self, name):
+        return lambda: self.run(name)
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def coordinator(recorder, tmp_path):
+    coordinator = SyncCoordinator(recorder.sync, lock=SyncFileLock(str(tmp_path / "sync.lock")))
+    yield coordinator
+    recorder.gate.set()
+    coordinator.stop(timeout=5)
+
+
+def hold_worker(coordinator, recorder):
+    """Start the worker busy on a blocker job, so later requests queue up behind it"""
+    recorder.gate.clear()
+    coordinator.submit("blocker", recorder.job("blocker"))
+    coordinator.start()
+    wait_for(lambda: coordinator.get_status()["running"] is not None)
+
+
+def test_requests_during_a_run_are_coalesced_into_one_pending_sync(coordinator, recorder):
+    hold_worker(coordinator, recorder)
+
+    first = coordinator.trigger("delta", ["catalog"], reason="schedule")
+    second = coordinator.trigger("full", ["manual"], reason="api")
+    coordinator.trigger("auto", ["catalog"], reason="startup")
+
+    assert first == {"queued": True, "coalesced": False, "running": True}
+    assert second["coalesced"]
+    [pending] = coordinator.get_status()["pending"]
+    assert pending["mode"] == "full"
+    assert pending["sources"] == ["catalog", "manual"]
+    assert pending["reasons"] == ["schedule", "api", "startup"]
+
+    recorder.gate.set()
+    wait_for(lambda: len(recorder.runs) == 2)
+
+    assert recorder.runs[1] == {"name": "events", "mode": "full", "sources": ["catalog", "manual"]}
+    assert recorder.peak == 1
+    assert coordinator.get_status()["stats"]["coalesced"] == 2
+
+
+def test_jobs_run_one_at_a_time_in_priority_order(coordinator, recorder):
+    hold_worker(coordinator, recorder)
+
+    coordinator.submit("city:leeds", recorder.job("city:leeds"), priority=3)
+    coordinator.submit("tickets:poll", recorder.job("tickets:poll"), priority=0)
+    coordinator.submit("city:london", recorder.job("city:london"), priority=3)
+    coordinator.submit("city:leeds", recorder.job("city:leeds"), priority=1)  # Coalesced, more urgent now
+
+    recorder.gate.set()
+    wait_for(lambda: len(recorder.runs) == 4)
+
+    assert [run["name"] for run in recorder.runs] == ["blocker", "tickets:poll", "city:leeds", "city:london"]
+    assert recorder.peak == 1
+
+
+def test_a_failed_job_does_not_stop_the_worker(coordinator, recorder):
+    async def broken():
+        raise RuntimeError("boom")
+
+    coordinator.submit("broken", broken, priority=0)
+    coordinator.submit("after", recorder.job("after"), priority=1)
+    coordinator.start()
+    wait_for(lambda: coordinator.get_status()["stats"]["runs"] == 2)
+
+    status = coordinator.get_status()
+    assert status["stats"]["failed"] == 1
+    assert status["last_run"]["key"] == "after"
+
+
+def test_jobs_share_one_event_loop(coordinator):
+    loops = []
+
+    async def record_loop():
+        loops.append(asyncio.get_running_loop())
+
+    coordinator.start()
+    coordinator.submit("one", record_loop)
+    wait_for(lambda: len(loops) == 1)
+    coordinator.submit("two", record_loop)
+    wait_for(lambda: len(loops) == 2)
+
+    assert loops[0] is loops[1]
+
+
+@pytest.fixture
+def other_process(tmp_path):
+    """A second lock on the coordinator's lock file, standing in for another server process"""
+    lock = SyncFileLock(str(tmp_path / "sync.lock"))
+    yield lock
+    lock.release()
+
+
+def test_job_blocked_by_another_process_is_retried_later(recorder, tmp_path, other_process):
+    coordinator = SyncCoordinator(recorder.sync, lock=SyncFileLock(str(tmp_path / "sync.lock")),
+                                  lock_retry_seconds=0.05)
+    other_process.acquire("city:leeds")
+    coordinator.submit("city:london", recorder.job("city:london"))
+    coordinator.start()
+    try:
+        wait_for(lambda: coordinator.get_status()["stats"]["deferred_locked"] >= 2)
+        assert recorder.runs == []
+        assert [job["key"] for job in coordinator.get_status()["pending"]] == ["city:london"]
+
+        other_process.release()
+        wait_for(lambda: recorder.runs)
+        assert recorder.runs == [{"name": "city:london"}]
+    finally:
+        coordinator.stop(timeout=5)
+
+
+def test_job_is_skipped_when_another_process_runs_the_same_key(coordinator, recorder, other_process):
+    other_process.acquire("city:london")
+    coordinator.submit("city:london", recorder.job("city:london"))
+    coordinator.start()
+
+    wait_for(lambda: coordinator.get_status()["stats"]["skipped_locked"] == 1)
+    assert coordinator.get_status()["pending"] == []
+    assert recorder.runs == []
+
+
+def test_deferred_sync_merges_with_a_newer_request(recorder, tmp_path, other_process):
+    coordinator = SyncCoordinator(recorder.sync, lock=SyncFileLock(str(tmp_path / "sync.lock")),
+                                  lock_retry_seconds=60)
+    other_process.acquire("city:leeds")
+    coordinator.trigger("full", ["catalog"], reason="schedule")
+    coordinator.start()
+    try:
+        wait_for(lambda: coordinator.get_status()["stats"]["deferred_locked"] == 1)
+        other_process.release()
+        time.sleep(0.05)
+        assert recorder.runs == []  # Still waiting out the retry delay
+
+        coordinator.trigger("delta", ["manual"], reason="api")  # A fresh request clears it
+        wait_for(lambda: recorder.runs)
+        assert recorder.runs == [{"name": "events", "mode": "full", "sources": ["catalog", "manual"]}]
+    finally:
+        coordinator.stop(timeout=5)
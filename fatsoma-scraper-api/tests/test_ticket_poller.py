@@ -0,0 +1,95 @@
+import asyncio
+
+import api_scraper
+from api_scraper import FatsomaAPIScraper
+from fake_supabase import FakeSupabase
+from supabase_syncer import SupabaseSyncer
+from ticket_poller import TicketPoller, diff_tickets
+
+
+def test_unchanged_tickets_produce_no_writes():
+    existing = [{"id": 1, "ticket_type": "Early Bird", "price": "5.00", "currency": "GBP", "availability": "Available"}]
+    fresh = [{"ticket_type": "Early Bird", "price": 5.0, "currency": "GBP", "availability": "Available"}]
+
+    assert diff_tickets(existing, fresh) == ([], [], [])
+
+
+def test_changed_fields_are_applied_to_the_stored_row():
+    existing = [{"id": 1, "ticket_type": "GA", "price": 10.0, "currency": "GBP", "availability": "Available"}]
+    fresh = [{"ticket_type": "GA", "price": 12.5, "currency": "GBP", "availability": "Sold Out"}]
+
+    updates, inserts, deletes = diff_tickets(existing, fresh)
+
+    assert updates == [{"id": 1, "ticket_type": "GA", "price": 12.5, "currency": "GBP", "availability": "Sold Out"}]
+    assert inserts == [] and deletes == []
+
+
+def test_new_and_removed_ticket_types():
+    existing = [{"id": 1, "ticket_type": "Old", "price": 5.0}]
+    fresh = [{"ticket_type": "New", "price": 3.0, "availability": "Available"}]
+
+    updates, inserts, deletes = diff_tickets(existing, fresh)
+
+    assert updates == []
+    assert inserts == fresh
+    assert deletes == existing
+
+
+def test_duplicate_ticket_types_match_in_order():
+    existing = [
+        {"id": 1, "ticket_type": "GA", "price": 5.0},
+        {"id": 2, "ticket_type": "GA", "price": 8.0},
+        {"id": 3, "ticket_type": "GA", "price": 10.0},
+    ]
+    fresh = [{"ticket_type": "GA", "price": 5.0}, {"ticket_type": "GA", "price": 9.0}]
+
+    updates, inserts, deletes = diff_tickets(existing, fresh)
+
+    assert updates == [{"id": 2, "ticket_type": "GA", "price": 9.0}]
+    assert inserts == []
+    assert deletes == [existing[2]]
+
+
+def test_missing_fresh_values_keep_stored_ones():
+    existing = [{"id": 1, "ticket_type": "GA", "price": 5.0, "availability": "Available"}]
+    fresh = [{"ticket_type": "GA", "price": None, "availability": "Available"}]
+
+    assert diff_tickets(existing, fresh) == ([], [], [])
+
+
+def test_poll_writes_changed_tickets_and_clears_the_content_hash(monkeypatch):
+    db = FakeSupabase()
+    db.tables['fatsoma_events'] = [
+        {'id': 'u1', 'event_id': 'e1', 'name': 'Changed', 'content_hash': 'h1'},
+        {'id': 'u2', 'event_id': 'e2', 'name': 'Unreachable', 'content_hash': 'h2'},
+    ]
+    db.tables['fatsoma_tickets'] = [
+        {'id': 't1', 'event_id': 'u1', 'ticket_type': 'GA', 'price': 5.0, 'currency': 'GBP', 'availability': 'Available'},
+        {'id': 't2', 'event_id': 'u2', 'ticket_type': 'GA', 'price': 5.0, 'currency': 'GBP', 'availability': 'Available'},
+    ]
+    syncer = SupabaseSyncer()
+    syncer._async_client = db
+    scraper = FatsomaAPIScraper(requests_per_second=0, http_cache=None, ticket_retries=1)
+    poller = TicketPoller(scraper, syncer)
+
+    async def events_to_poll():
+        return [dict(event, fatsoma_tickets=[t for t in db.rows('fatsoma_tickets') if t['event_id'] == event['id']])
+                for event in db.rows('fatsoma_events')]
+
+    async def cached_get_json(session, url, headers, cache, timeout=None):
+        if '/e2/' in url:
+            return 503, None
+        return 200, {'data': [{'attributes': {'name': 'GA', 'price': 500, 'sold-out': True}}]}
+
+    monkeypatch.setattr(poller, 'get_events_to_poll', events_to_poll)
+    monkeypatch.setattr(api_scraper, 'cached_get_json', cached_get_json)
+
+    async def run():
+        async with scraper:
+            return await poller.poll()
+
+    results = asyncio.run(run())
+
+    assert (results['changed_events'], results['updated']) == (1, 1)
+    assert [t['availability'] for t in db.rows('fatsoma_tickets')] == ['Sold Out', 'Available']
+    assert [e['content_hash'] for e in db.rows('fatsoma_events')] == [None, 'h2']
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from ttl_cache import TTLCache
+
+
+def test_get_or_create_is_single_flight():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_create("key", factory) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["value"] * 5
+    assert len(calls) == 1
+    assert cache.get_stats()["coalesced"] == 4
+    assert cache.get("key") == "value"
+
+
+def test_none_results_are_not_cached():
+    cache = TTLCache(ttl_seconds=60)
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        return None
+
+    async def run():
+        await cache.get_or_create("key", factory)
+        await cache.get_or_create("key", factory)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_a_failed_load_is_shared_and_not_cached():
+    cache = TTLCache(ttl_seconds=60)
+
+    async def factory():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_create("key", factory) for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.get_stats()["in_flight"] == 0
+    assert cache.get("key") is None
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_load():
+    cache = TTLCache(ttl_seconds=60)
+
+    async def factory():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    async def run():
+        impatient = asyncio.ensure_future(cache.get_or_create("key", factory))
+        patient = asyncio.ensure_future(cache.get_or_create("key", factory))
+        await asyncio.sleep(0.005)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(run()) == "value"
+
+
+def test_entries_expire_and_lru_is_bounded():
+    cache = TTLCache(ttl_seconds=0.01, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)  # Evicts b, the least recently used
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    time.sleep(0.02)
+    assert cache.get("a") is None
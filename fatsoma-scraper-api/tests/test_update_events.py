@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+import main
+from fake_supabase import FakeSupabase
+from supabase_syncer import SupabaseSyncer
+
+
+@pytest.fixture
+def full_sync(monkeypatch):
+    """Run a full update_events over a stubbed crawl; returns the prune and reconcile calls"""
+    calls = {"pruned": [], "marked": []}
+    syncer = SupabaseSyncer()
+    syncer._async_client = FakeSupabase()
+    monkeypatch.setattr(main, "syncer", syncer)
+
+    async def prune_missing(seen_event_ids):
+        calls["pruned"].append(set(seen_event_ids))
+        return []
+
+    class NoCleanup:
+        def __init__(self, syncer=None):
+            pass
+
+        def archive_past_events(self, dry_run=False):
+            return []
+
+    monkeypatch.setattr(syncer, "prune_missing", prune_missing)
+    monkeypatch.setattr(main.sync_state, "mark_full_reconcile", calls["marked"].append)
+    monkeypatch.setattr(main, "EventCleanup", NoCleanup)
+
+    def run(crawl, manual):
+        async def stream_catalog(modified_since=None, select=None):
+            main.scraper.last_crawl = dict(
+                {"event_ids": {"a", "b"}, "max_updated_at": None, "complete": True,
+                 "reached_end": False, "capped": False}, **crawl)
+            return
+            yield
+
+        async def fetch_manual_events(skip_event_ids=None):
+            main.scraper.last_manual_fetch = manual
+            return []
+
+        monkeypatch.setattr(main.scraper, "stream_catalog", stream_catalog)
+        monkeypatch.setattr(main.scraper, "fetch_manual_events", fetch_manual_events)
+        asyncio.run(main.update_events("full"))
+        return calls
+
+    return run
+
+
+COMPLETE = {"complete": True, "failed": 0}
+
+
+@pytest.mark.parametrize("crawl", [{"reached_end": True}, {"capped": True}])
+def test_full_crawl_prunes_and_records_the_reconcile(full_sync, crawl):
+    calls = full_sync(crawl, COMPLETE)
+
+    assert calls["pruned"] == [{"a", "b"}]
+    assert len(calls["marked"]) == 1
+
+
+@pytest.mark.parametrize("crawl, manual", [
+    ({"reached_end": False, "capped": False}, COMPLETE),  # A page failed
+    ({"reached_end": True, "complete": False}, COMPLETE),
+    ({"reached_end": True}, {"complete": False, "failed": 1}),
+])
+def test_partial_fetch_does_not_prune(full_sync, crawl, manual):
+    calls = full_sync(crawl, manual)
+
+    assert calls["pruned"] == []
+    assert calls["marked"] == []
+
+
+def test_each_written_batch_invalidates_the_read_cache(monkeypatch):
+    bumps = []
+    saved = []
+
+    def save_events(batch):
+        saved.append(len(bumps))
+        return len(batch)
+
+    monkeypatch.setattr(main.local_mirror, "save_events", save_events)
+    monkeypatch.setattr(main, "invalidate_read_cache", lambda: bumps.append(1))
+
+    async def write_batches():
+        for _ in range(2):
+            await main.write_batch([{"event_id": "a"}], None)
+
+    asyncio.run(write_batches())
+
+    assert saved == [0, 1]
+    assert len(bumps) == 2
@@ -0,0 +1,194 @@
+"""
+Ticket Poller - Fast refresh of ticket availability/price for events about to start
+Only calls /events/{id}/ticket-options and only writes ticket rows that changed
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from api_scraper import FatsomaAPIScraper
+from supabase_syncer import SupabaseSyncer
+from local_mirror import LocalMirror
+
+
+def diff_tickets(existing: List[Dict], fresh: List[Dict]) -> Tuple[List[Dict], List[Dict], List[Dict]]:
+    """
+    Compare stored ticket rows with freshly fetched tickets
+
+    Tickets are matched by ticket_type (the nth row with a name matches the
+    nth fresh ticket with that name). Returns (updates, inserts, deletes):
+    updates are existing rows with the changed fields applied, inserts are
+    fresh tickets with no stored row, deletes are stored rows that no longer
+    exist upstream.
+    """
+    by_type: Dict[str, List[Dict]] = {}
+    for row in existing:
+        by_type.setdefault(row.get('ticket_type'), []).append(row)
+
+    updates, inserts = [], []
+    for ticket in fresh:
+        rows = by_type.get(ticket.get('ticket_type'))
+        if not rows:
+            inserts.append(ticket)
+            continue
+
+        row = rows.pop(0)
+        changes = {
+            field: ticket.get(field)
+            for field in ('price', 'availability', 'currency')
+            if ticket.get(field) is not None and not _same(row.get(field), ticket.get(field))
+        }
+        if changes:
+            updates.append(dict(row, **changes))
+
+    deletes = [row for rows in by_type.values() for row in rows]
+    return updates, inserts, deletes
+
+
+def _same(stored, fresh) -> bool:
+    # Supabase returns DECIMAL prices as numbers or strings depending on the client
+    if isinstance(fresh, float):
+        try:
+            return abs(float(stored) - fresh) < 0.005
+        except (TypeError, ValueError):
+            return False
+    return stored == fresh
+
+
+class TicketPoller:
+    """
+    Re-polls ticket options for events starting within window_hours
+
+    Resale demand peaks just before an event, so these events get their
+    Sold Out / Available state refreshed far more often than the catalog
+    sync does. Events that started less than grace_hours ago are still
+    polled (late entry tickets).
+    """
+
+    def __init__(self, scraper: FatsomaAPIScraper, syncer: Optional[SupabaseSyncer],
+                 local_mirror: Optional[LocalMirror] = None, window_hours: float = 12, grace_hours: float = 2):
+        self.scraper = scraper
+        self.syncer = syncer
+        self.local_mirror = local_mirror
+        self.window_hours = window_hours
+        self.grace_hours = grace_hours
+
+    @staticmethod
+    def _starts_at(event: Dict) -> Optional[datetime]:
+        """Event start (naive UTC, like the rest of the sync) from event_date + event_time"""
+        if not event.get('event_date'):
+            return None
+        start = datetime.fromisoformat(event['event_date'].replace('Z', '+00:00')).replace(tzinfo=None)
+        try:
+            start_time = datetime.strptime((event.get('event_time') or '')[:5], '%H:%M').time()
+            start = datetime.combine(start.date(), start_time)
+        except ValueError:
+            pass
+        return start
+
+    async def get_events_to_poll(self) -> List[Dict]:
+        """Events (with their ticket rows) starting within the window"""
+        client = await self.syncer.get_async_client()
+        now = datetime.utcnow()
+        window_end = now + timedelta(hours=self.window_hours)
+
+        # event_date is the day at midnight, so fetch whole days and narrow by start time below
+        response = await client.table('fatsoma_events').select(
+            'id, event_id, name, event_date, event_time, fatsoma_tickets(id, ticket_type, price, currency, availability)'
+        ).gte('event_date', (now - timedelta(hours=self.grace_hours)).strftime('%Y-%m-%d')).lte(
+            'event_date', window_end.isoformat()
+        ).execute()
+
+        events = []
+        for event in response.data:
+            starts_at = self._starts_at(event)
+            if starts_at and now - timedelta(hours=self.grace_hours) <= starts_at <= window_end:
+                events.append(event)
+        return events
+
+    async def _poll_event(self, event: Dict, session) -> Tuple[Dict, List[Dict]]:
+        """Fetch an event's current ticket options ([] if the request failed)"""
+        tickets = await self.scraper.fetch_current_tickets(event['event_id'], event.get('fatsoma_tickets') or [], session)
+        return event, tickets or []
+
+    async def poll(self) -> Dict:
+        """
+        Poll every event in the window once
+
+        Returns: Dict with events polled and ticket rows updated/inserted/deleted
+        """
+        results = {"events": 0, "changed_events": 0, "updated": 0, "inserted": 0, "deleted": 0, "errors": 0}
+        if not self.syncer:
+            return results
+
+        events = await self.get_events_to_poll()
+        results["events"] = len(events)
+        if not events:
+            return results
+
+        client = await self.syncer.get_async_client()
+
+        # Shares the scraper's pooled session, ticket semaphore, rate limiter and HTTP cache
+        session = await self.scraper.get_session()
+        polled = await asyncio.gather(*(self._poll_event(event, session) for event in events), return_exceptions=True)
+
+        changes = []
+        for item in polled:
+            if isinstance(item, Exception):
+                print(f"⚠️  Ticket poll failed: {item}")
+                results["errors"] += 1
+                continue
+
+            event, fresh = item
+            if not fresh:
+                # Fetch failed or returned nothing - keep what we have
+                continue
+
+            updates, inserts, deletes = diff_tickets(event.get('fatsoma_tickets') or [], fresh)
+            if updates or inserts or deletes:
+                changes.append((event, fresh, updates, inserts, deletes))
+
+        if changes and self.syncer.has_content_hash:
+            # The stored content hashes no longer describe these events' tickets. Cleared
+            # first, so the next full sync rewrites them even if the tickets later revert
+            # upstream to what was last synced (or a write below fails halfway)
+            try:
+                await client.table('fatsoma_events').update({'content_hash': None}).in_(
+                    'id', [event['id'] for event, *_ in changes]
+                ).execute()
+            except Exception as e:
+                print(f"⚠️  Could not clear content hashes, skipping ticket writes: {e}")
+                results["errors"] += len(changes)
+                changes = []
+
+        for event, fresh, updates, inserts, deletes in changes:
+            try:
+                if updates:
+                    await client.table('fatsoma_tickets').upsert(
+                        [dict(row, event_id=event['id']) for row in updates], on_conflict='id'
+                    ).execute()
+                if inserts:
+                    await client.table('fatsoma_tickets').insert(
+                        [dict(ticket, event_id=event['id']) for ticket in inserts]
+                    ).execute()
+                if deletes:
+                    await client.table('fatsoma_tickets').delete().in_('id', [row['id'] for row in deletes]).execute()
+            except Exception as e:
+                print(f"⚠️  Could not write ticket changes for {event.get('name', event['event_id'])}: {e}")
+                results["errors"] += 1
+                continue
+
+            results["changed_events"] += 1
+            results["updated"] += len(updates)
+            results["inserted"] += len(inserts)
+            results["deleted"] += len(deletes)
+
+            if self.local_mirror:
+                try:
+                    await asyncio.to_thread(self.local_mirror.replace_tickets, event['event_id'], fresh)
+                except Exception as e:
+                    print(f"⚠️  Local SQLite ticket update failed for {event['event_id']}: {e}")
+
+        print(f"🎟️  Ticket poll: {results['events']} events, {results['changed_events']} changed "
+              f"({results['updated']} updated, {results['inserted']} new, {results['deleted']} removed)")
+        return results
@@ -0,0 +1,72 @@
+"""
+TTL Cache - Small in-memory LRU with per-entry expiry and single-flight loading
+Used for Fixr transfer extraction results, which are expensive to produce and requested in bursts
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class TTLCache:
+    """
+    LRU of up to max_entries values, each expiring ttl_seconds after it was stored
+
+    get_or_create() is single-flight: while a value is being produced for a
+    key, other callers asking for the same key wait for that result instead
+    of producing it again. None results are not cached. Meant for use from
+    one event loop (not thread-safe).
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() >= entry[0]:
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[1]
+
+    def put(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key, or the result of factory() (shared with concurrent callers)"""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._create(key, factory))
+            self._inflight[key] = task
+        else:
+            self.stats["coalesced"] += 1
+
+        # Shielded so one caller going away doesn't cancel the others' result
+        return await asyncio.shield(task)
+
+    async def _create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            value = await factory()
+            if value is not None:
+                self.put(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, entries=len(self._entries), in_flight=len(self._inflight))